@@ -4,7 +4,13 @@ import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
-from src.utils import load_forestfires, calcular_kpis_incendios, agregar_por_mes, agregar_por_grid, MONTH_MAP
+from src.particoes import selecionar_dados, obter_agregados, obter_anomalias, obter_piramide
+from src.graficos import gerar_graficos_resumo, adicionar_destaques_anomalias, criar_mapa_calor_piramide
+from src.piramide import selecionar_janela
+from src.anomalias import exibir_alertas
+from src.diagnostico import exibir_grafico, exibir_diagnostico
+from src.memoria import exibir_memoria
+from src.aquecimento import iniciar_aquecimento, status_aquecimento
 
 # Configuração da página
 st.set_page_config(
@@ -29,8 +35,21 @@ with st.sidebar:
     st.page_link("app.py", label="Resumo", icon="📊")
     st.page_link("pages/sessao_01_contexto.py", label="Contexto", icon="🌲")
     st.page_link("pages/sessao_02_perguntas.py", label="Perguntas", icon="❓")
+    st.page_link("pages/sessao_03_ferramentas.py", label="Ferramentas", icon="🧰")
     st.page_link("pages/sobre.py", label="Sobre", icon="ℹ️")
 
+# Aquecer em segundo plano os caches das demais páginas (uma vez por processo)
+iniciar_aquecimento()
+
+with st.sidebar:
+    aquecimento = status_aquecimento()
+    if aquecimento['erro']:
+        st.caption("⚠️ Falha no aquecimento de cache")
+    elif aquecimento['concluido']:
+        st.caption(f"✅ Cache aquecido em {aquecimento['duracao_s']:.1f} s")
+    else:
+        st.caption("⏳ Aquecendo cache das páginas...")
+
 # CSS customizado para tema florestal
 st.markdown("""
 <style>
@@ -69,8 +88,11 @@ Análise de incêndios florestais com dados de índices de perigo climático (FW
 """)
 
 # Carregar dados
-df = load_forestfires()
-kpis = calcular_kpis_incendios(df)
+df, versao, selecao = selecionar_dados()
+agregados = obter_agregados(df, versao, selecao)
+kpis = agregados['kpis']
+graficos = gerar_graficos_resumo(agregados, versao)
+anomalias = obter_anomalias(df, versao, selecao)
 
 # ========== KPIs PRINCIPAIS ==========
 st.header("📊 Indicadores Principais")
@@ -95,7 +117,7 @@ with col3:
     st.metric(
         label="📅 Mês Crítico",
         value=kpis['mes_critico_nome'],
-        delta=f"{len(df[df['month'] == kpis['mes_critico']])} incêndios"
+        delta=f"{kpis['incendios_mes_critico']} incêndios"
     )
 
 with col4:
@@ -114,76 +136,30 @@ col1, col2 = st.columns(2)
 
 # Gráfico 1: Área queimada por mês
 with col1:
-    monthly_data = agregar_por_mes(df)
-    monthly_data['month_nome'] = monthly_data['month'].map(MONTH_MAP)
-    # Flatten MultiIndex columns from aggregation
-    monthly_data.columns = [
-        '_'.join([c for c in col if c]).strip('_') if isinstance(col, tuple) else col
-        for col in monthly_data.columns
-    ]
-    
-    fig_monthly = px.line(
-        monthly_data,
-        x='month_nome',
-        y='area_sum',
-        markers=True,
-        title="Área Queimada por Mês",
-        labels={'month_nome': 'Mês', 'area_sum': 'Área (ha)'},
-        color_discrete_sequence=['#E63946']
-    )
-    fig_monthly.update_layout(
-        height=400,
-        showlegend=False,
-        hovermode='x unified'
-    )
-    fig_monthly.update_xaxes(tickangle=45)
-    st.plotly_chart(fig_monthly, use_container_width=True)
+    exibir_grafico(graficos['area_mensal'], "Área mensal")
 
 # Gráfico 2: Frequência de incêndios por mês
 with col2:
-    fig_freq = px.bar(
-        monthly_data,
-        x='month_nome',
-        y='area_count',
-        title="Frequência de Incêndios por Mês",
-        labels={'month_nome': 'Mês', 'area_count': 'Quantidade'},
-        color_discrete_sequence=['#F77F00']
-    )
-    fig_freq.update_layout(
-        height=400,
-        showlegend=False,
-        hovermode='x unified'
-    )
-    fig_freq.update_xaxes(tickangle=45)
-    st.plotly_chart(fig_freq, use_container_width=True)
+    exibir_grafico(graficos['frequencia_mensal'], "Frequência mensal")
 
 st.markdown("---")
 
 # ========== DISTRIBUIÇÃO GEOGRÁFICA ==========
 st.header("🗺️ Distribuição Geográfica")
 
-grid_data = agregar_por_grid(df)
-
-# Mapa de calor das coordenadas
-heatmap_data = df.groupby(['x', 'y'])['area'].sum().reset_index()
-heatmap_pivot = heatmap_data.pivot_table(index='y', columns='x', values='area', fill_value=0)
-
-fig_heatmap = go.Figure(data=go.Heatmap(
-    x=heatmap_pivot.columns,
-    y=heatmap_pivot.index,
-    z=heatmap_pivot.values,
-    colorscale='Reds',
-    colorbar=dict(title="Área (ha)")
-))
-
-fig_heatmap.update_layout(
-    title="Mapa de Calor: Área Queimada por Coordenadas",
-    xaxis_title="Coordenada X",
-    yaxis_title="Coordenada Y",
-    height=500
-)
+# Mapa de calor das coordenadas (só o nível e a janela do zoom atual), com as
+# células em alerta destacadas
+piramide = obter_piramide(df, versao, selecao)
+x0, x1, y0, y1 = selecionar_janela(piramide, chave="zoom_resumo")
+alertas = anomalias['alertas']
+alertas = alertas[alertas['x'].between(x0, x1) & alertas['y'].between(y0, y1)]
+fig_mapa = criar_mapa_calor_piramide(piramide.janela(x0, x1, y0, y1))
+exibir_grafico(adicionar_destaques_anomalias(fig_mapa, alertas), "Mapa de calor")
 
-st.plotly_chart(fig_heatmap, use_container_width=True)
+st.markdown("---")
+
+# ========== ALERTAS DE ANOMALIA ==========
+exibir_alertas(anomalias)
 
 st.markdown("---")
 
@@ -223,3 +199,6 @@ st.markdown(
     """,
     unsafe_allow_html=True
 )
+
+exibir_diagnostico("Resumo")
+exibir_memoria(df)
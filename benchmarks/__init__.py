@@ -0,0 +1,3 @@
+"""
+Benchmarks das funções do projeto
+"""
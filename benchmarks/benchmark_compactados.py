@@ -0,0 +1,131 @@
+"""
+Vazão da leitura de arquivos CSV comprimidos, sequencial x paralela
+
+Gera registros sintéticos, grava um arquivo por mês em cada compressão
+(gzip, bz2, xz) e compara três formas de carregar o conjunto:
+
+    pandas        pd.read_csv arquivo a arquivo + pd.concat (leitura atual)
+    sequencial    ler_forestfires_arquivos com 1 thread
+    paralelo      ler_forestfires_arquivos com o pool de threads
+
+Uso:
+    python -m benchmarks.benchmark_compactados --linhas 1000000 --threads 4
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import pandas as pd
+
+from src.utils import ler_forestfires_arquivos, MONTH_ORDER
+from src.sintetico import salvar_incendios_sinteticos
+
+
+COMPRESSOES = ['gzip', 'bz2', 'xz']
+EXTENSOES = {'gzip': '.gz', 'bz2': '.bz2', 'xz': '.xz'}
+
+
+def gravar_arquivos_mensais(df: pd.DataFrame, diretorio: Path, compressao: str) -> List[Path]:
+    """Grava um CSV comprimido por mês, como nos arquivos históricos"""
+    caminhos = []
+    for mes in [m for m in MONTH_ORDER if m in set(df['month'])]:
+        caminho = diretorio / f"forestfires_{mes}.csv{EXTENSOES[compressao]}"
+        df[df['month'] == mes].to_csv(caminho, index=False, compression=compressao)
+        caminhos.append(caminho)
+    return caminhos
+
+
+def _ler_com_pandas(caminhos: List[Path]) -> pd.DataFrame:
+    """Leitura atual: um pd.read_csv por arquivo, em sequência"""
+    return pd.concat([pd.read_csv(c) for c in caminhos], ignore_index=True)
+
+
+def cronometrar(funcao: Callable[[], pd.DataFrame], repeticoes: int) -> float:
+    """Melhor tempo entre as repetições"""
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return min(tempos)
+
+
+def executar(n_linhas: int, n_threads: int, repeticoes: int) -> List[Dict]:
+    """
+    Mede a leitura do conjunto mensal em cada compressão
+
+    Args:
+        n_linhas: Total de registros sintéticos
+        n_threads: Threads da leitura paralela
+        repeticoes: Execuções cronometradas por medição (vale a melhor)
+
+    Returns:
+        Lista de resultados, um por (compressão, modo)
+    """
+    resultados = []
+    with tempfile.TemporaryDirectory() as diretorio:
+        diretorio = Path(diretorio)
+        origem = salvar_incendios_sinteticos(diretorio / "forestfires.csv", n_linhas, seed=42)
+        df = pd.read_csv(origem)
+
+        for compressao in COMPRESSOES:
+            pasta = diretorio / compressao
+            pasta.mkdir()
+            caminhos = gravar_arquivos_mensais(df, pasta, compressao)
+            tamanho_mb = sum(c.stat().st_size for c in caminhos) / 1024 ** 2
+
+            modos = {
+                'pandas': lambda: _ler_com_pandas(caminhos),
+                'sequencial': lambda: ler_forestfires_arquivos(caminhos, n_threads=1),
+                'paralelo': lambda: ler_forestfires_arquivos(caminhos, n_threads=n_threads),
+            }
+            for modo, funcao in modos.items():
+                tempo = cronometrar(funcao, repeticoes)
+                resultado = {
+                    'compressao': compressao,
+                    'modo': modo,
+                    'arquivos': len(caminhos),
+                    'linhas': n_linhas,
+                    'tamanho_mb': tamanho_mb,
+                    'tempo_s': tempo,
+                    'mb_por_s': tamanho_mb / tempo,
+                    'linhas_por_s': n_linhas / tempo
+                }
+                resultados.append(resultado)
+                print(f"{compressao:<6} {modo:<11} {len(caminhos):>3} arquivos  {tamanho_mb:>8.1f} MB  "
+                      f"{tempo:>8.3f} s  {resultado['mb_por_s']:>8.1f} MB/s  "
+                      f"{resultado['linhas_por_s']:>12,.0f} linhas/s")
+
+    return resultados
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Vazão da leitura de CSVs comprimidos")
+    parser.add_argument('--linhas', type=int, default=1_000_000,
+                        help="Total de registros sintéticos")
+    parser.add_argument('--threads', type=int, default=os.cpu_count() or 1,
+                        help="Threads da leitura paralela")
+    parser.add_argument('--repeticoes', type=int, default=3,
+                        help="Execuções cronometradas por medição (vale a melhor)")
+    parser.add_argument('--saida', type=Path,
+                        help="Arquivo JSON de saída (opcional)")
+    args = parser.parse_args(argv)
+
+    print(f"{args.linhas:,} linhas, {args.threads} thread(s) na leitura paralela "
+          f"({os.cpu_count()} CPU(s) disponíveis)\n")
+    resultados = executar(args.linhas, args.threads, args.repeticoes)
+
+    if args.saida:
+        args.saida.write_text(json.dumps({'resultados': resultados}, indent=2), encoding='utf-8')
+        print(f"\nResultados salvos em {args.saida}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
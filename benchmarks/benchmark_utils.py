@@ -0,0 +1,185 @@
+"""
+Micro-benchmarks das funções de src.utils em tamanhos crescentes de dados
+
+Mede tempo de execução, pico de memória e vazão (linhas/s) de cada função,
+salva os resultados em JSON e compara com uma execução de referência.
+
+Uso:
+    python -m benchmarks.benchmark_utils --saida resultados.json
+    python -m benchmarks.benchmark_utils --tamanhos 1000 100000 --comparar base.json --limite 0.2
+"""
+
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.utils import (
+    load_forestfires, obter_versao_dados, calcular_kpis_incendios, agregar_por_grid, agregar_por_mes
+)
+from src.sintetico import salvar_incendios_sinteticos
+
+
+TAMANHOS_PADRAO = [1_000, 100_000, 1_000_000, 10_000_000]
+
+
+def medir(funcao: Callable[[], object], repeticoes: int) -> Dict:
+    """
+    Mede o melhor tempo entre as repetições e o pico de memória de uma execução
+
+    O pico de memória é medido numa execução separada, pois o tracemalloc
+    distorce o tempo.
+
+    Args:
+        funcao: Função sem argumentos a medir
+        repeticoes: Número de execuções cronometradas
+
+    Returns:
+        Dicionário com 'tempo_s' e 'memoria_pico_mb'
+    """
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+
+    tracemalloc.start()
+    funcao()
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {'tempo_s': min(tempos), 'memoria_pico_mb': pico / 1024 ** 2}
+
+
+def _carregar_sem_cache(caminho: Path) -> pd.DataFrame:
+    """Executa load_forestfires ignorando o cache do Streamlit"""
+    load_forestfires.clear()
+    return load_forestfires(caminho, obter_versao_dados(caminho))
+
+
+def executar_benchmarks(tamanhos: List[int], repeticoes: int = 3) -> List[Dict]:
+    """
+    Executa os benchmarks de cada função em cada tamanho de dados
+
+    Args:
+        tamanhos: Números de linhas a testar
+        repeticoes: Número de execuções cronometradas por medição
+
+    Returns:
+        Lista de resultados, um por (função, tamanho)
+    """
+    resultados = []
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        for n_linhas in tamanhos:
+            caminho = salvar_incendios_sinteticos(
+                Path(diretorio) / f"forestfires_{n_linhas}.csv", n_linhas, seed=42
+            )
+            df = load_forestfires(caminho, obter_versao_dados(caminho))
+
+            casos = {
+                'load_forestfires': lambda: _carregar_sem_cache(caminho),
+                'calcular_kpis_incendios': lambda: calcular_kpis_incendios(df),
+                'agregar_por_grid': lambda: agregar_por_grid(df),
+                'agregar_por_mes': lambda: agregar_por_mes(df),
+            }
+
+            for nome, funcao in casos.items():
+                medicao = medir(funcao, repeticoes)
+                resultado = {
+                    'funcao': nome,
+                    'linhas': n_linhas,
+                    **medicao,
+                    'linhas_por_s': n_linhas / medicao['tempo_s'] if medicao['tempo_s'] > 0 else float('inf')
+                }
+                resultados.append(resultado)
+                print(f"{nome:<26} {n_linhas:>11,} linhas  {resultado['tempo_s']:>9.4f} s  "
+                      f"{resultado['memoria_pico_mb']:>9.1f} MB  {resultado['linhas_por_s']:>14,.0f} linhas/s")
+
+            caminho.unlink()
+            load_forestfires.clear()
+
+    return resultados
+
+
+def comparar_resultados(atuais: List[Dict], referencia: List[Dict], limite: float) -> List[str]:
+    """
+    Compara com uma execução de referência e lista as regressões
+
+    Args:
+        atuais: Resultados da execução atual
+        referencia: Resultados da execução de referência
+        limite: Aumento relativo máximo tolerado (0.2 = 20%)
+
+    Returns:
+        Lista de mensagens, uma por regressão de tempo ou memória
+    """
+    base = {(r['funcao'], r['linhas']): r for r in referencia}
+    regressoes = []
+
+    for atual in atuais:
+        anterior = base.get((atual['funcao'], atual['linhas']))
+        if anterior is None:
+            continue
+        for metrica in ('tempo_s', 'memoria_pico_mb'):
+            if anterior[metrica] > 0 and atual[metrica] > anterior[metrica] * (1 + limite):
+                variacao = atual[metrica] / anterior[metrica] - 1
+                regressoes.append(
+                    f"{atual['funcao']} ({atual['linhas']:,} linhas): {metrica} "
+                    f"{anterior[metrica]:.4f} -> {atual[metrica]:.4f} (+{variacao:.0%})"
+                )
+
+    return regressoes
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks das funções de src.utils")
+    parser.add_argument('--tamanhos', type=int, nargs='+', default=TAMANHOS_PADRAO,
+                        help="Números de linhas a testar")
+    parser.add_argument('--repeticoes', type=int, default=3,
+                        help="Execuções cronometradas por medição (vale a melhor)")
+    parser.add_argument('--saida', type=Path, default=Path('benchmark_resultados.json'),
+                        help="Arquivo JSON de saída")
+    parser.add_argument('--comparar', type=Path,
+                        help="JSON de uma execução de referência")
+    parser.add_argument('--limite', type=float, default=0.2,
+                        help="Aumento relativo máximo tolerado antes de falhar (0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    resultados = executar_benchmarks(args.tamanhos, args.repeticoes)
+
+    args.saida.write_text(json.dumps({
+        'meta': {
+            'data': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'numpy': np.__version__,
+            'plataforma': platform.platform()
+        },
+        'resultados': resultados
+    }, indent=2), encoding='utf-8')
+    print(f"\nResultados salvos em {args.saida}")
+
+    if args.comparar:
+        referencia = json.loads(args.comparar.read_text(encoding='utf-8'))['resultados']
+        regressoes = comparar_resultados(resultados, referencia, args.limite)
+        if regressoes:
+            print(f"\n❌ {len(regressoes)} regressão(ões) acima de {args.limite:.0%}:")
+            for mensagem in regressoes:
+                print(f"  - {mensagem}")
+            return 1
+        print(f"\n✅ Nenhuma regressão acima de {args.limite:.0%}")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,569 @@
+"""
+Latência de rerun por sessão das páginas Streamlit
+
+Cada sessão é um AppTest (execução headless, sem navegador) que percorre o
+app e as páginas de pages/ fazendo interações realistas: troca de página,
+radio 'criterio', selectbox 'variavel_comparacao' e método de correlação.
+As abas (st.tabs) são renderizadas todas no servidor; trocar de aba no
+navegador não dispara rerun, então não há interação a simular para elas.
+
+No modo padrão não é um teste de carga de um servidor: o AppTest substitui
+o runtime global do Streamlit a cada execução, então sessões no mesmo
+processo (ou em threads) interferem entre si. Cada sessão roda no seu
+próprio processo, com os seus próprios caches, e as N sessões disparadas
+juntas equivalem a N servidores de um usuário disputando a CPU. As
+latências medem o custo de rerun por sessão (com caches frios na primeira
+iteração), não a contenção de sessões num mesmo servidor. Os números de
+memória são a soma do pico de memória residente (maxrss) de cada processo,
+não a memória de um servidor com N sessões, em que dados e caches são
+compartilhados.
+
+Com --servidor, o benchmark inicia um único `streamlit run app.py` e
+conecta N sessões ao mesmo servidor pelo websocket do navegador
+(/_stcore/stream), enviando as mesmas interações como mensagens BackMsg.
+As sessões compartilham os caches e disputam o mesmo processo, então as
+latências incluem a contenção entre sessões, e a memória reportada é o
+pico de memória residente do servidor. O payload e a serialização dos
+gráficos ficam no session_state do servidor e não são medidos nesse modo;
+em vez disso, é registrado o volume de mensagens recebidas por rerun.
+
+O maior payload de gráficos de cada página (ver src.diagnostico) também é
+registrado; com --orcamento-kb o teste falha se alguma página o exceder.
+O tempo de serialização dos gráficos e tabelas de cada rerun (conversão
+para Arrow/JSON e envio ao st.dataframe/st.plotly_chart) também é medido.
+Com --memoria-rerun, o pico de memória alocada em Python durante cada rerun
+(tracemalloc) também é medido, para achar as páginas que copiam dados; o
+tracemalloc deixa os reruns mais lentos, então as latências dessa execução
+não são comparáveis às demais.
+
+Uso:
+    python -m benchmarks.latencia_sessoes --sessoes 8 --iteracoes 3 --saida latencia.json
+    python -m benchmarks.latencia_sessoes --sessoes 1 --iteracoes 1 --orcamento-kb 512
+    python -m benchmarks.latencia_sessoes --sessoes 1 --iteracoes 1 --memoria-rerun
+    python -m benchmarks.latencia_sessoes --servidor --sessoes 1 4 8 --iteracoes 2
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+import urllib.request
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+import websockets
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.testing.v1 import AppTest
+
+from src.diagnostico import CHAVE_PAGINAS, CHAVE_ULTIMA_PAGINA
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+RAIZ = Path(__file__).resolve().parent.parent
+APP_PATH = RAIZ / "app.py"
+
+PAGINAS = [
+    "pages/sessao_01_contexto.py",
+    "pages/sessao_02_perguntas.py",
+    "pages/sessao_03_ferramentas.py",
+    "pages/sobre.py",
+]
+
+# Porta do servidor iniciado no modo --servidor
+PORTA_SERVIDOR = 8599
+
+
+def _memoria_pico_mb() -> Optional[float]:
+    """Pico de memória residente do processo em MB (None se indisponível)"""
+    if resource is None:
+        return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss é em KB no Linux e em bytes no macOS
+    return pico / 1024 ** 2 if sys.platform == 'darwin' else pico / 1024
+
+
+class _Sessao:
+    """Sessão simulada que cronometra cada rerun (e mede o pico de memória, se pedido)"""
+
+    def __init__(self, timeout: float, memoria_rerun: bool = False):
+        self.app = AppTest.from_file(str(APP_PATH), default_timeout=timeout)
+        self.latencias: List[Dict] = []
+        self.payloads: Dict[str, int] = {}
+        self.memoria_rerun = memoria_rerun
+        if memoria_rerun and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def rerun(self, pagina: str, acao: str, elemento=None) -> None:
+        if self.memoria_rerun:
+            tracemalloc.reset_peak()
+            base, _ = tracemalloc.get_traced_memory()
+        # Páginas sem diagnóstico (Sobre) não registram serialização
+        self.app.session_state[CHAVE_ULTIMA_PAGINA] = None
+        inicio = time.perf_counter()
+        (elemento or self.app).run()
+        duracao = time.perf_counter() - inicio
+
+        if self.app.exception:
+            raise RuntimeError(f"{pagina} ({acao}): {self.app.exception[0].value}")
+
+        registro = {'pagina': pagina, 'acao': acao, 'latencia_s': duracao}
+        if self.memoria_rerun:
+            # Pico acima do que já estava alocado antes do rerun
+            registro['pico_mb'] = (tracemalloc.get_traced_memory()[1] - base) / 1024 ** 2
+        ultima = self.app.session_state[CHAVE_ULTIMA_PAGINA]
+        if ultima is not None:
+            registro['serializacao_s'] = self.app.session_state[CHAVE_PAGINAS][ultima]['serializacao_s']
+        self.latencias.append(registro)
+
+        if CHAVE_PAGINAS in self.app.session_state:
+            for nome, resumo in self.app.session_state[CHAVE_PAGINAS].items():
+                self.payloads[nome] = max(self.payloads.get(nome, 0), resumo['total'])
+
+
+def _executar_roteiro(sessao: _Sessao, rng: random.Random) -> None:
+    """Percorre todas as páginas com as interações de um analista"""
+    sessao.rerun("app.py", "carregar")
+
+    for pagina in PAGINAS:
+        sessao.app.switch_page(pagina)
+        sessao.rerun(pagina, "carregar")
+
+        if pagina.endswith("sessao_01_contexto.py"):
+            metodo = sessao.app.radio(key="metodo_corr")
+            sessao.rerun(pagina, "metodo_corr", metodo.set_value(rng.choice(metodo.options)))
+
+        elif pagina.endswith("sessao_02_perguntas.py"):
+            criterio = sessao.app.radio(key="criterio")
+            for opcao in rng.sample(list(criterio.options), len(criterio.options)):
+                sessao.rerun(pagina, "criterio", sessao.app.radio(key="criterio").set_value(opcao))
+
+            variavel = sessao.app.selectbox(key="variavel_comparacao")
+            for opcao in rng.sample(list(variavel.options), 3):
+                sessao.rerun(pagina, "variavel_comparacao",
+                             sessao.app.selectbox(key="variavel_comparacao").set_value(opcao))
+
+
+def _executar_sessao(indice: int, iteracoes: int, timeout: float, seed: int,
+                     barreira, memoria_rerun: bool = False) -> Dict:
+    """
+    Executa uma sessão no processo atual, começando junto com as demais
+
+    Returns:
+        Dicionário com as latências e o pico de memória do processo antes e depois
+    """
+    rng = random.Random(seed + indice)
+    sessao = _Sessao(timeout, memoria_rerun)
+    memoria_inicial = _memoria_pico_mb()
+
+    barreira.wait()
+    for _ in range(iteracoes):
+        _executar_roteiro(sessao, rng)
+
+    return {
+        'latencias': sessao.latencias,
+        'payloads': sessao.payloads,
+        'memoria_inicial_mb': memoria_inicial,
+        'memoria_final_mb': _memoria_pico_mb()
+    }
+
+
+def executar_sessoes(n_sessoes: int, iteracoes: int, timeout: float = 300, seed: int = 42,
+                     memoria_rerun: bool = False) -> Dict:
+    """
+    Executa n_sessoes em paralelo, cada uma num processo, repetindo o roteiro
+
+    Args:
+        n_sessoes: Número de sessões (processos) disparadas juntas
+        iteracoes: Repetições do roteiro por sessão
+        timeout: Tempo máximo de cada rerun em segundos
+        seed: Semente para as escolhas das interações
+        memoria_rerun: Medir o pico de memória de cada rerun com tracemalloc
+
+    Returns:
+        Dicionário com o resumo geral, o resumo por página e as latências brutas
+    """
+    with multiprocessing.Manager() as gerenciador:
+        barreira = gerenciador.Barrier(n_sessoes)
+        with ProcessPoolExecutor(max_workers=n_sessoes) as executor:
+            futuros = [
+                executor.submit(_executar_sessao, i, iteracoes, timeout, seed, barreira, memoria_rerun)
+                for i in range(n_sessoes)
+            ]
+            inicio = time.perf_counter()
+            sessoes = [futuro.result() for futuro in futuros]
+            duracao = time.perf_counter() - inicio
+
+    latencias = [l for sessao in sessoes for l in sessao['latencias']]
+    payloads: Dict[str, int] = {}
+    for sessao in sessoes:
+        for nome, total in sessao['payloads'].items():
+            payloads[nome] = max(payloads.get(nome, 0), total)
+    # Soma por processo: cada sessão tem os seus dados e caches
+    if sessoes[0]['memoria_inicial_mb'] is not None:
+        pico_soma = sum(sessao['memoria_final_mb'] for sessao in sessoes)
+        crescimento = sum(sessao['memoria_final_mb'] - sessao['memoria_inicial_mb'] for sessao in sessoes)
+    else:
+        pico_soma = crescimento = None
+
+    geral, por_pagina = _resumir_latencias(latencias, memoria_rerun)
+    return {
+        'geral': {
+            'modo': 'processos',
+            'sessoes': n_sessoes,
+            'iteracoes': iteracoes,
+            'duracao_s': duracao,
+            'reruns_por_s': geral['reruns'] / duracao,
+            **geral,
+            'soma_pico_processos_mb': pico_soma,
+            'soma_crescimento_pico_processos_mb': crescimento
+        },
+        'por_pagina': por_pagina,
+        'payload_max_bytes': payloads,
+        'latencias': latencias
+    }
+
+
+def _resumir(valores: np.ndarray) -> Dict:
+    """Contagem e percentis de latência"""
+    return {
+        'reruns': int(len(valores)),
+        'p50_s': float(np.percentile(valores, 50)),
+        'p95_s': float(np.percentile(valores, 95)),
+        'p99_s': float(np.percentile(valores, 99)),
+        'max_s': float(valores.max())
+    }
+
+
+def _resumir_latencias(latencias: List[Dict], memoria_rerun: bool = False):
+    """Resumo geral e por página das latências (e picos, serialização e bytes, se medidos)"""
+    todas = np.array([l['latencia_s'] for l in latencias])
+    por_pagina = {}
+    for pagina in ["app.py"] + PAGINAS:
+        registros = [l for l in latencias if l['pagina'] == pagina]
+        if not registros:
+            continue
+        por_pagina[pagina] = _resumir(np.array([l['latencia_s'] for l in registros]))
+        if memoria_rerun:
+            picos = np.array([l['pico_mb'] for l in registros])
+            por_pagina[pagina]['pico_p50_mb'] = float(np.percentile(picos, 50))
+            por_pagina[pagina]['pico_max_mb'] = float(picos.max())
+        serializacao = np.array([l['serializacao_s'] for l in registros if 'serializacao_s' in l])
+        if len(serializacao):
+            por_pagina[pagina]['serializacao_p50_ms'] = float(np.percentile(serializacao, 50)) * 1000
+            por_pagina[pagina]['serializacao_max_ms'] = float(serializacao.max()) * 1000
+        recebidos = np.array([l['bytes_recebidos'] for l in registros if 'bytes_recebidos' in l])
+        if len(recebidos):
+            por_pagina[pagina]['recebidos_max_kb'] = float(recebidos.max()) / 1024
+    return _resumir(todas), por_pagina
+
+
+def _memoria_pico_processo_mb(pid: int) -> Optional[float]:
+    """Pico de memória residente de outro processo em MB (VmHWM; None fora do Linux)"""
+    try:
+        with open(f"/proc/{pid}/status", encoding='utf-8') as arquivo:
+            for linha in arquivo:
+                if linha.startswith('VmHWM:'):
+                    return int(linha.split()[1]) / 1024
+    except OSError:
+        return None
+    return None
+
+
+@contextmanager
+def iniciar_servidor(porta: int = PORTA_SERVIDOR, timeout: float = 60) -> Iterator[subprocess.Popen]:
+    """
+    Inicia `streamlit run app.py` em modo headless e espera o health check
+
+    Args:
+        porta: Porta do servidor
+        timeout: Tempo máximo de espera pelo servidor em segundos
+
+    Yields:
+        Processo do servidor, encerrado na saída do contexto
+    """
+    processo = subprocess.Popen(
+        [sys.executable, '-m', 'streamlit', 'run', str(APP_PATH), '--server.headless', 'true',
+         '--server.port', str(porta), '--browser.gatherUsageStats', 'false'],
+        cwd=RAIZ, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        limite = time.monotonic() + timeout
+        while True:
+            try:
+                with urllib.request.urlopen(f"http://localhost:{porta}/_stcore/health", timeout=1) as resposta:
+                    if resposta.status == 200:
+                        break
+            except OSError:
+                pass
+            if processo.poll() is not None or time.monotonic() > limite:
+                raise RuntimeError(f"Servidor Streamlit não respondeu na porta {porta}")
+            time.sleep(0.2)
+        yield processo
+    finally:
+        processo.terminate()
+        processo.wait()
+
+
+class _SessaoServidor:
+    """Sessão de navegador simulada no websocket de um servidor Streamlit"""
+
+    def __init__(self, porta: int, timeout: float):
+        self.url = f"ws://localhost:{porta}/_stcore/stream"
+        self.timeout = timeout
+        self.conexao = None
+        self.paginas: Dict[str, str] = {}
+        # Widgets da última execução por chave: (id, tipo, opções) e valores enviados
+        self.widgets: Dict[str, tuple] = {}
+        self.valores: Dict[str, str] = {}
+        self.pagina_atual = ""
+        self.latencias: List[Dict] = []
+
+    async def conectar(self) -> None:
+        self.conexao = await websockets.connect(self.url, subprotocols=["streamlit"], max_size=None)
+
+    async def fechar(self) -> None:
+        await self.conexao.close()
+
+    def opcoes(self, chave: str) -> List[str]:
+        return list(self.widgets[chave][2])
+
+    async def rerun(self, pagina: str, acao: str, chave: Optional[str] = None,
+                    valor: Optional[str] = None) -> None:
+        if pagina != self.pagina_atual:
+            self.pagina_atual = pagina
+            self.valores = {}
+        if chave is not None:
+            self.valores[chave] = valor
+
+        mensagem = BackMsg()
+        estado = mensagem.rerun_script
+        estado.query_string = ""
+        estado.page_script_hash = self.paginas.get(pagina, "")
+        for nome, texto in self.valores.items():
+            widget = estado.widget_states.widgets.add()
+            widget.id = self.widgets[nome][0]
+            widget.string_value = texto
+
+        inicio = time.perf_counter()
+        await self.conexao.send(mensagem.SerializeToString())
+        recebidos = 0
+        while True:
+            dados = await asyncio.wait_for(self.conexao.recv(), self.timeout)
+            recebidos += len(dados)
+            resposta = ForwardMsg()
+            resposta.ParseFromString(dados)
+            tipo = resposta.WhichOneof('type')
+            if tipo == 'navigation':
+                self.paginas = {_caminho_pagina(p.url_pathname): p.page_script_hash
+                                for p in resposta.navigation.app_pages}
+            elif tipo == 'delta' and resposta.delta.WhichOneof('type') == 'new_element':
+                self._registrar_elemento(pagina, acao, resposta.delta.new_element)
+            elif tipo == 'script_finished':
+                break
+        duracao = time.perf_counter() - inicio
+        self.latencias.append({'pagina': pagina, 'acao': acao, 'latencia_s': duracao,
+                               'bytes_recebidos': recebidos})
+
+    def _registrar_elemento(self, pagina: str, acao: str, elemento) -> None:
+        tipo = elemento.WhichOneof('type')
+        if tipo == 'exception':
+            raise RuntimeError(f"{pagina} ({acao}): {elemento.exception.message}")
+        if tipo in ('radio', 'selectbox'):
+            widget = getattr(elemento, tipo)
+            # Id dos widgets com key: '$$ID-<hash>-<key>'
+            self.widgets[widget.id.split('-', 2)[-1]] = (widget.id, tipo, tuple(widget.options))
+
+
+def _caminho_pagina(url_pathname: str) -> str:
+    """Caminho do script da página a partir do url_pathname da navegação"""
+    return f"pages/{url_pathname}.py" if url_pathname else "app.py"
+
+
+async def _executar_roteiro_servidor(sessao: _SessaoServidor, rng: random.Random) -> None:
+    """Mesmo roteiro de _executar_roteiro, enviado pelo websocket"""
+    await sessao.rerun("app.py", "carregar")
+
+    for pagina in PAGINAS:
+        await sessao.rerun(pagina, "carregar")
+
+        if pagina.endswith("sessao_01_contexto.py"):
+            await sessao.rerun(pagina, "metodo_corr", "metodo_corr", rng.choice(sessao.opcoes("metodo_corr")))
+
+        elif pagina.endswith("sessao_02_perguntas.py"):
+            opcoes = sessao.opcoes("criterio")
+            for opcao in rng.sample(opcoes, len(opcoes)):
+                await sessao.rerun(pagina, "criterio", "criterio", opcao)
+
+            for opcao in rng.sample(sessao.opcoes("variavel_comparacao"), 3):
+                await sessao.rerun(pagina, "variavel_comparacao", "variavel_comparacao", opcao)
+
+
+async def _executar_sessoes_servidor(n_sessoes: int, iteracoes: int, porta: int, timeout: float,
+                                     seed: int) -> List[_SessaoServidor]:
+    sessoes = [_SessaoServidor(porta, timeout) for _ in range(n_sessoes)]
+    await asyncio.gather(*(sessao.conectar() for sessao in sessoes))
+    try:
+        async def percorrer(indice: int, sessao: _SessaoServidor) -> None:
+            rng = random.Random(seed + indice)
+            for _ in range(iteracoes):
+                await _executar_roteiro_servidor(sessao, rng)
+
+        await asyncio.gather(*(percorrer(i, sessao) for i, sessao in enumerate(sessoes)))
+    finally:
+        await asyncio.gather(*(sessao.fechar() for sessao in sessoes))
+    return sessoes
+
+
+def executar_sessoes_servidor(servidor: subprocess.Popen, n_sessoes: int, iteracoes: int,
+                              porta: int = PORTA_SERVIDOR, timeout: float = 300, seed: int = 42) -> Dict:
+    """
+    Executa n_sessoes simultâneas no mesmo servidor Streamlit, repetindo o roteiro
+
+    Args:
+        servidor: Processo do servidor (ver iniciar_servidor), para medir a memória
+        n_sessoes: Número de sessões conectadas juntas ao servidor
+        iteracoes: Repetições do roteiro por sessão
+        porta: Porta do servidor
+        timeout: Tempo máximo de cada rerun em segundos
+        seed: Semente para as escolhas das interações
+
+    Returns:
+        Dicionário com o resumo geral, o resumo por página e as latências brutas
+    """
+    inicio = time.perf_counter()
+    sessoes = asyncio.run(_executar_sessoes_servidor(n_sessoes, iteracoes, porta, timeout, seed))
+    duracao = time.perf_counter() - inicio
+
+    latencias = [l for sessao in sessoes for l in sessao.latencias]
+    geral, por_pagina = _resumir_latencias(latencias)
+    return {
+        'geral': {
+            'modo': 'servidor',
+            'sessoes': n_sessoes,
+            'iteracoes': iteracoes,
+            'duracao_s': duracao,
+            'reruns_por_s': geral['reruns'] / duracao,
+            **geral,
+            # Pico desde o início do servidor, acumulado entre as execuções
+            'pico_servidor_mb': _memoria_pico_processo_mb(servidor.pid)
+        },
+        'por_pagina': por_pagina,
+        'payload_max_bytes': {},
+        'latencias': latencias
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Latência de rerun por sessão das páginas Streamlit (headless)")
+    parser.add_argument('--sessoes', type=int, nargs='+', default=[1, 4, 8],
+                        help="Números de sessões disparadas juntas (um processo cada, ou no mesmo servidor)")
+    parser.add_argument('--iteracoes', type=int, default=2,
+                        help="Repetições do roteiro por sessão")
+    parser.add_argument('--timeout', type=float, default=300,
+                        help="Tempo máximo de cada rerun em segundos")
+    parser.add_argument('--saida', type=Path,
+                        help="Arquivo JSON de saída (opcional)")
+    parser.add_argument('--orcamento-kb', type=float,
+                        help="Falhar (código 1) se alguma página enviar mais KB de gráficos")
+    parser.add_argument('--memoria-rerun', action='store_true',
+                        help="Medir o pico de memória de cada rerun (tracemalloc; mais lento)")
+    parser.add_argument('--servidor', action='store_true',
+                        help="Conectar as sessões a um único `streamlit run` (concorrência real)")
+    parser.add_argument('--porta', type=int, default=PORTA_SERVIDOR,
+                        help="Porta do servidor no modo --servidor")
+    args = parser.parse_args(argv)
+    if args.servidor and (args.memoria_rerun or args.orcamento_kb is not None):
+        parser.error("--memoria-rerun e --orcamento-kb medem o session_state e exigem o modo por processo")
+
+    if args.servidor:
+        return _main_servidor(args)
+
+    relatorios = []
+    print("Sessões em processos separados (sem contenção num mesmo servidor)")
+    print(f"{'sessões':>8} {'reruns':>7} {'reruns/s':>9} {'p50 (s)':>8} {'p95 (s)':>8} "
+          f"{'p99 (s)':>8} {'Σ pico proc. (MB)':>18}")
+
+    for n_sessoes in args.sessoes:
+        relatorio = executar_sessoes(n_sessoes, args.iteracoes, args.timeout,
+                                   memoria_rerun=args.memoria_rerun)
+        relatorios.append(relatorio)
+        geral = relatorio['geral']
+        pico_soma = geral['soma_pico_processos_mb']
+        print(f"{n_sessoes:>8} {geral['reruns']:>7} {geral['reruns_por_s']:>9.2f} "
+              f"{geral['p50_s']:>8.3f} {geral['p95_s']:>8.3f} {geral['p99_s']:>8.3f} "
+              f"{(f'{pico_soma:.1f}' if pico_soma is not None else '-'):>18}")
+
+    payloads: Dict[str, int] = {}
+    for relatorio in relatorios:
+        for nome, total in relatorio['payload_max_bytes'].items():
+            payloads[nome] = max(payloads.get(nome, 0), total)
+
+    print(f"\n{'página':<15} {'payload máx. (KB)':>18}")
+    for nome, total in payloads.items():
+        print(f"{nome:<15} {total / 1024:>18.1f}")
+
+    print(f"\n{'página':<32} {'serialização p50 (ms)':>22} {'serialização máx. (ms)':>23}")
+    for pagina, resumo in relatorios[-1]['por_pagina'].items():
+        if 'serializacao_p50_ms' in resumo:
+            print(f"{pagina:<32} {resumo['serializacao_p50_ms']:>22.1f} {resumo['serializacao_max_ms']:>23.1f}")
+
+    if args.memoria_rerun:
+        print(f"\n{'página':<32} {'pico p50 (MB)':>14} {'pico máx. (MB)':>15}")
+        for pagina, resumo in relatorios[-1]['por_pagina'].items():
+            print(f"{pagina:<32} {resumo['pico_p50_mb']:>14.1f} {resumo['pico_max_mb']:>15.1f}")
+
+    if args.saida:
+        args.saida.write_text(json.dumps(relatorios, indent=2), encoding='utf-8')
+        print(f"\nResultados salvos em {args.saida}")
+
+    if args.orcamento_kb is not None:
+        acima = {nome: total for nome, total in payloads.items() if total > args.orcamento_kb * 1024}
+        if acima:
+            print(f"\nPáginas acima do orçamento de {args.orcamento_kb:.0f} KB: {', '.join(acima)}")
+            return 1
+
+    return 0
+
+
+def _main_servidor(args: argparse.Namespace) -> int:
+    """Modo --servidor: N sessões simultâneas num único servidor Streamlit"""
+    relatorios = []
+    print("Sessões simultâneas num único servidor Streamlit")
+    print(f"{'sessões':>8} {'reruns':>7} {'reruns/s':>9} {'p50 (s)':>8} {'p95 (s)':>8} "
+          f"{'p99 (s)':>8} {'pico servidor (MB)':>19}")
+
+    with iniciar_servidor(args.porta) as servidor:
+        for n_sessoes in args.sessoes:
+            relatorio = executar_sessoes_servidor(servidor, n_sessoes, args.iteracoes, args.porta, args.timeout)
+            relatorios.append(relatorio)
+            geral = relatorio['geral']
+            pico = geral['pico_servidor_mb']
+            print(f"{n_sessoes:>8} {geral['reruns']:>7} {geral['reruns_por_s']:>9.2f} "
+                  f"{geral['p50_s']:>8.3f} {geral['p95_s']:>8.3f} {geral['p99_s']:>8.3f} "
+                  f"{(f'{pico:.1f}' if pico is not None else '-'):>19}")
+
+    print(f"\n{'página':<32} {'p95 (s)':>8} {'recebido máx. (KB)':>19}")
+    for pagina, resumo in relatorios[-1]['por_pagina'].items():
+        print(f"{pagina:<32} {resumo['p95_s']:>8.3f} {resumo['recebidos_max_kb']:>19.1f}")
+
+    if args.saida:
+        args.saida.write_text(json.dumps(relatorios, indent=2), encoding='utf-8')
+        print(f"\nResultados salvos em {args.saida}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,10 +1,16 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from src.utils import (
-    load_forestfires, FWI_DESCRIPTIONS, WEATHER_DESCRIPTIONS, MONTH_MAP
+from src.utils import formatar_numeros, FWI_DESCRIPTIONS, WEATHER_DESCRIPTIONS, MONTH_MAP
+from src.correlacao import (
+    calcular_significancia_correlacoes, CORRELATION_VARS
 )
+from src.graficos import gerar_histogramas_fwi, criar_mapa_correlacao
+from src.fontes import exibir_fontes
+from src.diagnostico import exibir_grafico, exibir_tabela, exibir_diagnostico
+from src.memoria import exibir_memoria
+from src.grafo import GrafoCalculos, exibir_grafo
+from src.tabelas import formatar_tabela
+from src.particoes import selecionar_dados, obter_acumulador, obter_referencia, legendar_referencia
 
 st.set_page_config(
     page_title="Sessão 01 - Contexto",
@@ -27,13 +33,45 @@ with st.sidebar:
     st.page_link("app.py", label="Resumo", icon="📊")
     st.page_link("pages/sessao_01_contexto.py", label="Contexto", icon="🌲")
     st.page_link("pages/sessao_02_perguntas.py", label="Perguntas", icon="❓")
+    st.page_link("pages/sessao_03_ferramentas.py", label="Ferramentas", icon="🧰")
     st.page_link("pages/sobre.py", label="Sobre", icon="ℹ️")
 
 st.title("📖 Sessão 01: Entendimento do Problema e do Contexto")
 st.markdown("---")
 
 # Carregar dados
-df = load_forestfires()
+df, versao, selecao = selecionar_dados()
+
+# Grafo de cálculos: cada artefato declara as entradas de que depende e só é
+# recalculado quando alguma delas muda (ex: trocar o método de correlação não
+# refaz as estatísticas nem os histogramas). Os histogramas (com os
+# registros linha a linha) e o teste de permutação vêm de caches por versão
+# comuns às sessões (compartilhado=True) e não ficam no estado da sessão
+grafo = GrafoCalculos("Contexto")
+grafo.entrada('df', df, versao=versao)
+grafo.entrada('versao', versao)
+grafo.entrada('selecao', selecao, versao=versao)
+# Teste de permutação: no acompanhamento, refeito só quando a referência avança
+df_referencia, versao_referencia = obter_referencia(df, versao, selecao)
+grafo.entrada('df_referencia', df_referencia, versao=versao_referencia)
+grafo.entrada('versao_referencia', versao_referencia)
+
+fwi_components = ['ffmc', 'dmc', 'dc', 'isi']
+
+grafo.no('estatisticas', lambda df: df.describe(include='number'), 'df')
+grafo.no('fig_histogramas', lambda df, versao: gerar_histogramas_fwi(df, versao, tuple(fwi_components)),
+         'df', 'versao', compartilhado=True)
+grafo.no('correlacoes', lambda df, versao, metodo, n_permutacoes: calcular_significancia_correlacoes(
+    df, versao, tuple(CORRELATION_VARS), metodo.lower(), n_permutacoes
+), 'df_referencia', 'versao_referencia', 'metodo_corr', 'n_permutacoes', compartilhado=True)
+# Pearson: coeficientes a partir do acumulador de co-momentos, sem reler as linhas
+grafo.no('matriz_correlacao', lambda versao, selecao, metodo, correlacoes: (
+    obter_acumulador(versao, selecao).correlacao() if metodo == "Pearson" else correlacoes['correlacao']
+), 'versao', 'selecao', 'metodo_corr', 'correlacoes')
+grafo.no('fig_correlacao', lambda matriz, correlacoes: criar_mapa_correlacao(matriz, correlacoes['p_valor']),
+         'matriz_correlacao', 'correlacoes')
+
+estatisticas = grafo.obter('estatisticas')
 
 # ========== SEÇÃO 1: O QUE ESTÁ SENDO MEDIDO? ==========
 st.header("❓ O que está sendo medido?")
@@ -85,26 +123,26 @@ variables_data = {
     "Variável": ["X", "Y", "month", "day", "FFMC", "DMC", "DC", "ISI", "temp", "RH", "wind", "rain", "area"],
     "Tipo": ["Inteiro", "Inteiro", "Texto", "Texto", "Float", "Float", "Float", "Float", "Float", "Float", "Float", "Float", "Float"],
     "Mínimo": [
-        df['x'].min(), df['y'].min(), "-", "-",
-        f"{df['ffmc'].min():.1f}", f"{df['dmc'].min():.1f}", f"{df['dc'].min():.1f}", f"{df['isi'].min():.1f}",
-        f"{df['temp'].min():.1f}", f"{df['rh'].min():.0f}", f"{df['wind'].min():.1f}", f"{df['rain'].min():.1f}",
-        f"{df['area'].min():.2f}"
+        f"{estatisticas.loc['min', 'x']:.0f}", f"{estatisticas.loc['min', 'y']:.0f}", "-", "-",
+        f"{estatisticas.loc['min', 'ffmc']:.1f}", f"{estatisticas.loc['min', 'dmc']:.1f}", f"{estatisticas.loc['min', 'dc']:.1f}", f"{estatisticas.loc['min', 'isi']:.1f}",
+        f"{estatisticas.loc['min', 'temp']:.1f}", f"{estatisticas.loc['min', 'rh']:.0f}", f"{estatisticas.loc['min', 'wind']:.1f}", f"{estatisticas.loc['min', 'rain']:.1f}",
+        f"{estatisticas.loc['min', 'area']:.2f}"
     ],
     "Máximo": [
-        df['x'].max(), df['y'].max(), "-", "-",
-        f"{df['ffmc'].max():.1f}", f"{df['dmc'].max():.1f}", f"{df['dc'].max():.1f}", f"{df['isi'].max():.1f}",
-        f"{df['temp'].max():.1f}", f"{df['rh'].max():.0f}", f"{df['wind'].max():.1f}", f"{df['rain'].max():.1f}",
-        f"{df['area'].max():.2f}"
+        f"{estatisticas.loc['max', 'x']:.0f}", f"{estatisticas.loc['max', 'y']:.0f}", "-", "-",
+        f"{estatisticas.loc['max', 'ffmc']:.1f}", f"{estatisticas.loc['max', 'dmc']:.1f}", f"{estatisticas.loc['max', 'dc']:.1f}", f"{estatisticas.loc['max', 'isi']:.1f}",
+        f"{estatisticas.loc['max', 'temp']:.1f}", f"{estatisticas.loc['max', 'rh']:.0f}", f"{estatisticas.loc['max', 'wind']:.1f}", f"{estatisticas.loc['max', 'rain']:.1f}",
+        f"{estatisticas.loc['max', 'area']:.2f}"
     ],
     "Média": [
-        f"{df['x'].mean():.1f}", f"{df['y'].mean():.1f}", "-", "-",
-        f"{df['ffmc'].mean():.1f}", f"{df['dmc'].mean():.1f}", f"{df['dc'].mean():.1f}", f"{df['isi'].mean():.1f}",
-        f"{df['temp'].mean():.1f}", f"{df['rh'].mean():.0f}", f"{df['wind'].mean():.1f}", f"{df['rain'].mean():.1f}",
-        f"{df['area'].mean():.2f}"
+        f"{estatisticas.loc['mean', 'x']:.1f}", f"{estatisticas.loc['mean', 'y']:.1f}", "-", "-",
+        f"{estatisticas.loc['mean', 'ffmc']:.1f}", f"{estatisticas.loc['mean', 'dmc']:.1f}", f"{estatisticas.loc['mean', 'dc']:.1f}", f"{estatisticas.loc['mean', 'isi']:.1f}",
+        f"{estatisticas.loc['mean', 'temp']:.1f}", f"{estatisticas.loc['mean', 'rh']:.0f}", f"{estatisticas.loc['mean', 'wind']:.1f}", f"{estatisticas.loc['mean', 'rain']:.1f}",
+        f"{estatisticas.loc['mean', 'area']:.2f}"
     ]
 }
 
-st.dataframe(pd.DataFrame(variables_data), use_container_width=True)
+exibir_tabela(pd.DataFrame(variables_data), 'variaveis', use_container_width=True)
 
 # ========== EXPLICAÇÕES DETALHADAS ==========
 st.markdown("---")
@@ -120,12 +158,12 @@ with tab1:
     
     with col1:
         st.write("**X - Coordenada Horizontal**")
-        st.info(f"Intervalo: {df['x'].min()} a {df['x'].max()}")
+        st.info(f"Intervalo: {int(estatisticas.loc['min', 'x'])} a {int(estatisticas.loc['max', 'x'])}")
         st.write("Posição no eixo horizontal do Parque Montesinho")
     
     with col2:
         st.write("**Y - Coordenada Vertical**")
-        st.info(f"Intervalo: {df['y'].min()} a {df['y'].max()}")
+        st.info(f"Intervalo: {int(estatisticas.loc['min', 'y'])} a {int(estatisticas.loc['max', 'y'])}")
         st.write("Posição no eixo vertical do Parque Montesinho")
     
     st.write("**month - Mês do Ano**")
@@ -154,9 +192,9 @@ with tab2:
                 # Mostrar distribuição
                 if code in df.columns:
                     st.write(f"**Estatísticas no Dataset:**")
-                    st.write(f"- Mínimo: {df[code].min():.2f}")
-                    st.write(f"- Máximo: {df[code].max():.2f}")
-                    st.write(f"- Média: {df[code].mean():.2f}")
+                    st.write(f"- Mínimo: {estatisticas.loc['min', code]:.2f}")
+                    st.write(f"- Máximo: {estatisticas.loc['max', code]:.2f}")
+                    st.write(f"- Média: {estatisticas.loc['mean', code]:.2f}")
 
 with tab3:
     st.subheader("Variáveis Meteorológicas e Resultado")
@@ -166,9 +204,9 @@ with tab3:
         with st.expander(f"🌡️ **{var}** - {info['nome']} ({info['unidade']})", expanded=False):
             st.write(f"**Interpretação:** {info['interpretacao']}")
             st.write(f"**Estatísticas no Dataset:**")
-            st.write(f"- Mínimo: {df[col_name].min():.2f} {info['unidade']}")
-            st.write(f"- Máximo: {df[col_name].max():.2f} {info['unidade']}")
-            st.write(f"- Média: {df[col_name].mean():.2f} {info['unidade']}")
+            st.write(f"- Mínimo: {estatisticas.loc['min', col_name]:.2f} {info['unidade']}")
+            st.write(f"- Máximo: {estatisticas.loc['max', col_name]:.2f} {info['unidade']}")
+            st.write(f"- Média: {estatisticas.loc['mean', col_name]:.2f} {info['unidade']}")
     
     st.write("---")
     st.write("**area - Área Queimada (hectares)**")
@@ -186,20 +224,12 @@ st.header("📊 Distribuições dos Componentes FWI")
 
 col1, col2, col3, col4 = st.columns(4)
 
-fwi_components = ['ffmc', 'dmc', 'dc', 'isi']
+histogramas = grafo.obter('fig_histogramas')
 
 for idx, col in enumerate([col1, col2, col3, col4]):
     with col:
         component = fwi_components[idx]
-        fig = px.histogram(
-            df,
-            x=component,
-            nbins=30,
-            title=f"Distribuição {component}",
-            color_discrete_sequence=['#E63946']
-        )
-        fig.update_layout(height=350, showlegend=False)
-        st.plotly_chart(fig, use_container_width=True)
+        exibir_grafico(histogramas[component], f"Histograma {component}")
 
 st.markdown("---")
 
@@ -208,35 +238,54 @@ st.header("🔗 Correlação Entre Variáveis")
 
 st.write("Matriz de correlação entre índices FWI, variáveis meteorológicas e área queimada:")
 
-correlation_vars = ['ffmc', 'dmc', 'dc', 'isi', 'temp', 'rh', 'wind', 'rain', 'area']
-corr_matrix = df[correlation_vars].corr()
+col1, col2 = st.columns(2)
 
-fig_corr = go.Figure(data=go.Heatmap(
-    z=corr_matrix.values,
-    x=corr_matrix.columns,
-    y=corr_matrix.columns,
-    colorscale='RdBu',
-    zmid=0,
-    text=corr_matrix.values.round(2),
-    texttemplate='%{text}',
-    textfont={"size": 10},
-    colorbar=dict(title="Correlação")
-))
+with col1:
+    grafo.entrada('metodo_corr', st.radio(
+        "Método de correlação:",
+        ["Pearson", "Spearman"],
+        horizontal=True,
+        key="metodo_corr"
+    ))
 
-fig_corr.update_layout(height=500, width=700)
-st.plotly_chart(fig_corr, use_container_width=True)
+with col2:
+    grafo.entrada('n_permutacoes', st.select_slider(
+        "Permutações do teste de significância:",
+        options=[1000, 5000, 10000],
+        value=5000
+    ))
+
+fig_corr = grafo.obter('fig_correlacao')
+# p-valores exibidos com 4 casas no hover
+exibir_grafico(fig_corr, "Correlação", casas_decimais=4)
+legendar_referencia(df_referencia, versao_referencia, versao)
 
 st.info("""
 💡 **Interpretação:**
 - **Correlação positiva (+1 a 0):** Variáveis aumentam juntas
 - **Correlação negativa (-1 a 0):** Uma aumenta enquanto a outra diminui
 - **Próximo de 0:** Pouca ou nenhuma relação
+- **Significância (teste de permutação):** \\* p < 0,05 · \\*\\* p < 0,01 · \\*\\*\\* p < 0,001
 """)
 
 st.markdown("---")
 
+# ========== FONTES DE DADOS ==========
+st.header("🧩 Fontes de Dados")
+
+exibir_fontes(df, versao)
+
+st.markdown("---")
+
 # ========== RESUMO ESTATÍSTICO ==========
 st.header("📈 Resumo Estatístico Completo")
 
 with st.expander("Ver estatísticas descritivas detalhadas", expanded=False):
-    st.dataframe(df.describe().round(2), use_container_width=True)
+    # A contagem é inteira; as demais estatísticas têm 2 casas
+    estatisticas_texto = formatar_tabela(estatisticas, {coluna: 2 for coluna in estatisticas.columns})
+    estatisticas_texto.loc['count'] = formatar_numeros(estatisticas.loc['count'], 0)
+    exibir_tabela(estatisticas_texto, 'estatisticas', use_container_width=True)
+
+exibir_diagnostico("Contexto")
+exibir_grafo(grafo)
+exibir_memoria(df)
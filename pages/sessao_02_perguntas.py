@@ -1,9 +1,26 @@
 import streamlit as st
-import pandas as pd
-import numpy as np
-import plotly.express as px
-import plotly.graph_objects as go
-from src.utils import load_forestfires, agregar_por_mes, agregar_por_grid, MONTH_MAP, MONTH_ORDER
+from src.utils import (
+    calcular_densidade_kde,
+    CRITERIOS_REGIOES, LARGURA_BANDA_PADRAO, MONTH_MAP
+)
+from src.graficos import (
+    achatar_colunas, criar_mapa_densidade, gerar_graficos_registros,
+    criar_ranking_regioes, criar_barras_frequencia_mensal, criar_barras_area_mensal,
+    criar_serie_comparacao, criar_barras_mensais_por_ano, adicionar_destaques_anomalias,
+    criar_mapa_janela, criar_mapa_calor_piramide,
+    VARIAVEIS_COMPARACAO
+)
+from src.tabelas import exibir_tabela_paginada, FORMATO_TABELA_REGIOES, FORMATO_RESUMO_MENSAL
+from src.exportacao import exibir_exportacao
+from src.particoes import (
+    selecionar_dados, obter_agregados, obter_janelas, obter_anomalias, obter_piramide, obter_referencia,
+    legendar_referencia
+)
+from src.piramide import selecionar_janela
+from src.janelas import agregar_por_ano_mes
+from src.diagnostico import exibir_grafico, exibir_diagnostico
+from src.memoria import exibir_memoria
+from src.grafo import GrafoCalculos, exibir_grafo
 
 st.set_page_config(
     page_title="Sessão 02 - Perguntas",
@@ -26,13 +43,66 @@ with st.sidebar:
     st.page_link("app.py", label="Resumo", icon="📊")
     st.page_link("pages/sessao_01_contexto.py", label="Contexto", icon="🌲")
     st.page_link("pages/sessao_02_perguntas.py", label="Perguntas", icon="❓")
+    st.page_link("pages/sessao_03_ferramentas.py", label="Ferramentas", icon="🧰")
     st.page_link("pages/sobre.py", label="Sobre", icon="ℹ️")
 
 st.title("❓ Sessão 02: Respondendo as Perguntas sobre Incêndios")
 st.markdown("---")
 
 # Carregar dados
-df = load_forestfires()
+df, versao, selecao = selecionar_dados()
+
+# Grafo de cálculos: cada artefato declara as entradas de que depende e só é
+# recalculado quando alguma delas muda (ex: trocar o critério do ranking não
+# refaz os mapas nem o box plot). Os nós pesados, que só dependem dos dados,
+# vêm de caches por versão comuns às sessões (compartilhado=True) e não
+# ficam no estado da sessão
+grafo = GrafoCalculos("Perguntas")
+grafo.entrada('df', df, versao=versao)
+grafo.entrada('versao', versao)
+grafo.entrada('selecao', selecao, versao=versao)
+# Densidade KDE: no acompanhamento, refeita só quando a referência avança
+df_referencia, versao_referencia = obter_referencia(df, versao, selecao)
+grafo.entrada('df_referencia', df_referencia, versao=versao_referencia)
+grafo.entrada('versao_referencia', versao_referencia)
+
+grafo.no('agregados', obter_agregados, 'df', 'versao', 'selecao', compartilhado=True)
+grafo.no('janelas', obter_janelas, 'df', 'versao', 'selecao', compartilhado=True)
+grafo.no('anomalias', obter_anomalias, 'df', 'versao', 'selecao', compartilhado=True)
+grafo.no('piramide', obter_piramide, 'df', 'versao', 'selecao', compartilhado=True)
+grafo.no('graficos_registros', gerar_graficos_registros, 'df', 'versao', compartilhado=True)
+grafo.no('grid', lambda agregados: achatar_colunas(agregados['grid']), 'agregados')
+grafo.no('resumo_mensal', lambda agregados: agregados['resumo_mensal'], 'agregados')
+grafo.no('por_ano_mes', agregar_por_ano_mes, 'df', 'versao', compartilhado=True)
+grafo.no('media_geral', lambda df: df[['temp', 'rh', 'ffmc', 'isi']].mean(), 'df')
+grafo.no('celulas', lambda grid: sorted(zip(grid['x'], grid['y'])), 'grid')
+grafo.no('regioes_ordenadas',
+         lambda agregados, criterio: agregados['regioes'].sort_values(CRITERIOS_REGIOES[criterio], ascending=False),
+         'agregados', 'criterio')
+grafo.no('densidade', calcular_densidade_kde, 'df_referencia', 'versao_referencia', 'largura_banda',
+         compartilhado=True)
+
+# Mapa de calor: só o nível e a janela da pirâmide que correspondem ao zoom
+grafo.no('fig_mapa_calor', lambda piramide, anomalias, faixa: adicionar_destaques_anomalias(
+    criar_mapa_calor_piramide(piramide.janela(*faixa),
+                              titulo="Concentração de Área Queimada por Coordenadas (X, Y)",
+                              titulo_barra="Área<br>Queimada (ha)"),
+    anomalias['alertas'][anomalias['alertas']['x'].between(*faixa[:2])
+                         & anomalias['alertas']['y'].between(*faixa[2:])]
+), 'piramide', 'anomalias', 'faixa_mapa')
+grafo.no('fig_densidade', criar_mapa_densidade, 'densidade', 'medida_kde', 'largura_banda')
+grafo.no('fig_janela', lambda janelas, anomalias, dias: criar_mapa_janela(janelas, anomalias['alertas'], dias),
+         'janelas', 'anomalias', 'dias_janela')
+grafo.no('fig_dispersao', lambda graficos: graficos['dispersao'], 'graficos_registros', compartilhado=True)
+grafo.no('fig_ranking', criar_ranking_regioes, 'regioes_ordenadas', 'criterio')
+grafo.no('fig_frequencia_mensal', criar_barras_frequencia_mensal, 'resumo_mensal')
+grafo.no('fig_area_mensal', criar_barras_area_mensal, 'resumo_mensal')
+grafo.no('fig_anos', criar_barras_mensais_por_ano, 'por_ano_mes', 'medida_anual')
+grafo.no('fig_comparacao', criar_serie_comparacao, 'resumo_mensal', 'variavel_comparacao')
+grafo.no('fig_boxplot', lambda graficos: graficos['boxplot'], 'graficos_registros', compartilhado=True)
+
+janelas = grafo.obter('janelas')
+anomalias = grafo.obter('anomalias')
 
 # Criar abas para as 3 perguntas
 tab1, tab2, tab3 = st.tabs([
@@ -53,46 +123,76 @@ with tab1:
     # Mapa de calor principal
     st.subheader("Mapa de Calor: Concentração de Incêndios")
     
-    # Preparar dados para heatmap
-    heatmap_data = df.groupby(['x', 'y'])['area'].sum().reset_index()
-    heatmap_pivot = heatmap_data.pivot_table(index='y', columns='x', values='area', fill_value=0)
-    
-    fig_heatmap = go.Figure(data=go.Heatmap(
-        z=heatmap_pivot.values,
-        x=heatmap_pivot.columns,
-        y=heatmap_pivot.index,
-        colorscale='Reds',
-        colorbar=dict(title="Área<br>Queimada (ha)"),
-        hovertemplate="X: %{x}<br>Y: %{y}<br>Área: %{z:.2f} ha<extra></extra>"
-    ))
-    
-    fig_heatmap.update_layout(
-        title="Concentração de Área Queimada por Coordenadas (X, Y)",
-        xaxis_title="Coordenada X",
-        yaxis_title="Coordenada Y",
-        height=500,
-        showlegend=False
-    )
-    
-    st.plotly_chart(fig_heatmap, use_container_width=True)
+    grafo.entrada('faixa_mapa', selecionar_janela(grafo.obter('piramide'), chave="zoom_perguntas"))
+    fig_heatmap = grafo.obter('fig_mapa_calor')
+    if not anomalias['alertas'].empty:
+        st.caption("Círculos: células com alertas de anomalia recentes (ver Resumo).")
     
+    exibir_grafico(fig_heatmap, "Mapa de calor")
+
+    # Superfície suavizada (KDE via FFT)
+    st.subheader("Superfície de Densidade Suavizada")
+
+    col_kde1, col_kde2 = st.columns([1, 2])
+
+    with col_kde1:
+        grafo.entrada('medida_kde', st.radio(
+            "Densidade de:",
+            ["Incêndios", "Área Queimada"],
+            horizontal=True
+        ))
+
+    with col_kde2:
+        grafo.entrada('largura_banda', st.slider(
+            "Largura de banda do kernel (unidades de grid):",
+            min_value=0.2, max_value=3.0, value=LARGURA_BANDA_PADRAO, step=0.1
+        ))
+
+    fig_kde = grafo.obter('fig_densidade')
+
+    exibir_grafico(fig_kde, "Densidade suavizada")
+    legendar_referencia(df_referencia, versao_referencia, versao)
+
+    # Janelas móveis (só com registros datados)
+    if janelas is not None:
+        st.subheader("🕒 Janelas Móveis: Últimos Dias")
+
+        dias_janela = grafo.entrada('dias_janela', st.radio(
+            "Janela:",
+            list(janelas['janelas']),
+            format_func=lambda dias: f"Últimos {dias} dias",
+            index=1,
+            horizontal=True
+        ))
+        totais_janela = janelas['janelas'][dias_janela]
+        st.caption(f"Até {janelas['referencia']:%d/%m/%Y} (registro mais recente): "
+                   f"{int(totais_janela['area_count'].sum()):,} incêndios, "
+                   f"{totais_janela['area_sum'].sum():,.2f} ha")
+
+        if totais_janela.empty:
+            st.info("Nenhum incêndio registrado nesta janela.")
+        else:
+            exibir_grafico(grafo.obter('fig_janela'), "Janela móvel")
+
     # Análise textual
     col1, col2 = st.columns(2)
     
     with col1:
         st.write("**Insights Principais:**")
         
+        grid = grafo.obter('grid')
+
         # Top 3 coordenadas com mais incêndios
-        top_coords_freq = df.groupby(['x', 'y']).size().reset_index(name='count').sort_values('count', ascending=False).head(3)
+        top_coords_freq = grid.nlargest(3, 'area_count')
         st.write("**Top 3 Coordenadas por Frequência:**")
-        for idx, row in top_coords_freq.iterrows():
-            st.write(f"- ({row['x']}, {row['y']}): {row['count']} incêndios")
+        for x, y, count in zip(top_coords_freq['x'], top_coords_freq['y'], top_coords_freq['area_count']):
+            st.write(f"- ({x}, {y}): {count} incêndios")
         
         # Top 3 coordenadas com mais área
-        top_coords_area = df.groupby(['x', 'y'])['area'].sum().reset_index().sort_values('area', ascending=False).head(3)
+        top_coords_area = grid.nlargest(3, 'area_sum')
         st.write("\n**Top 3 Coordenadas por Área Queimada:**")
-        for idx, row in top_coords_area.iterrows():
-            st.write(f"- ({row['x']}, {row['y']}): {row['area']:.2f} ha")
+        for x, y, area in zip(top_coords_area['x'], top_coords_area['y'], top_coords_area['area_sum']):
+            st.write(f"- ({x}, {y}): {area:.2f} ha")
     
     with col2:
         st.write("**Padrão Espacial:**")
@@ -107,20 +207,19 @@ with tab1:
     # Scatter plot alternativo
     st.subheader("Visualização Alternativa: Scatter Plot")
     
-    fig_scatter = px.scatter(
-        df,
-        x='x',
-        y='y',
-        size='area',
-        color='area',
-        hover_data=['month', 'temp', 'rh', 'ffmc', 'area'],
-        color_continuous_scale='Reds',
-        title="Localização de Incêndios (tamanho = área queimada)",
-        labels={'x': 'Coordenada X', 'y': 'Coordenada Y', 'area': 'Área (ha)'}
-    )
-    
-    fig_scatter.update_layout(height=500)
-    st.plotly_chart(fig_scatter, use_container_width=True)
+    fig_scatter = grafo.obter('fig_dispersao')
+    exibir_grafico(fig_scatter, "Dispersão")
+
+    with st.expander("⬇️ Exportar registros de uma célula"):
+        celula = st.selectbox(
+            "Célula (X, Y):",
+            grafo.obter('celulas'),
+            format_func=lambda c: f"({c[0]}, {c[1]})",
+            key="exportar_celula"
+        )
+        exibir_exportacao(df, chave="exportacao_celula",
+                          nome_arquivo=f"incendios_celula_{celula[0]}_{celula[1]}",
+                          celulas=[celula])
 
 # ========== PERGUNTA 2: REGIÕES CRÍTICAS ==========
 with tab2:
@@ -132,92 +231,30 @@ with tab2:
     2. **Severidade:** Quantidade total de área queimada
     """)
     
-    # Agregar por grid
-    grid_data = df.groupby(['x', 'y']).agg({
-        'area': ['sum', 'mean', 'count', 'max'],
-        'temp': 'mean',
-        'rh': 'mean',
-        'ffmc': 'mean',
-        'dmc': 'mean',
-        'dc': 'mean',
-        'isi': 'mean'
-    }).round(2)
-    
-    grid_data.columns = ['Área Total (ha)', 'Área Média (ha)', 'Frequência', 'Área Máxima (ha)',
-                         'Temp Média', 'Umidade Média', 'FFMC Médio', 'DMC Médio', 'DC Médio', 'ISI Médio']
-    grid_data = grid_data.sort_values('Área Total (ha)', ascending=False).reset_index()
-    
     # Seletor de critério
-    criterio = st.radio(
+    criterio = grafo.entrada('criterio', st.radio(
         "Ordenar regiões por:",
-        ["Área Total Queimada", "Frequência de Incêndios", "Área Máxima em um Incêndio"],
-        horizontal=True
-    )
-    
-    if criterio == "Área Total Queimada":
-        grid_sorted = grid_data.sort_values('Área Total (ha)', ascending=False)
-        col_ordenacao = 'Área Total (ha)'
-    elif criterio == "Frequência de Incêndios":
-        grid_sorted = grid_data.sort_values('Frequência', ascending=False)
-        col_ordenacao = 'Frequência'
-    else:
-        grid_sorted = grid_data.sort_values('Área Máxima (ha)', ascending=False)
-        col_ordenacao = 'Área Máxima (ha)'
-    
-    st.subheader(f"🏆 Top 10 Regiões Críticas (por {criterio})")
-    
-    # Tabela formatada
-    top_10 = grid_sorted.head(10)
-    
-    # Colorir a coluna de ordenação
-    def color_row(row):
-        colors = ['background-color: #E63946'] * len(row)
-        return colors
-    
-    st.dataframe(
-        top_10.style.format({
-            'Área Total (ha)': '{:.2f}',
-            'Área Média (ha)': '{:.2f}',
-            'Frequência': '{:.0f}',
-            'Área Máxima (ha)': '{:.2f}',
-            'Temp Média': '{:.1f}',
-            'Umidade Média': '{:.0f}',
-            'FFMC Médio': '{:.1f}',
-            'DMC Médio': '{:.1f}',
-            'DC Médio': '{:.1f}',
-            'ISI Médio': '{:.1f}'
-        }),
-        use_container_width=True
-    )
+        list(CRITERIOS_REGIOES),
+        horizontal=True,
+        key="criterio"
+    ))
+    
+    grid_sorted = grafo.obter('regioes_ordenadas')
+    
+    st.subheader(f"🏆 Regiões Críticas (por {criterio})")
+    
+    # Tabela paginada com todas as células, das mais críticas para as menos
+    regioes_exibidas = exibir_tabela_paginada(grid_sorted, FORMATO_TABELA_REGIOES, chave="tabela_regioes")
+
+    with st.expander("⬇️ Exportar registros das regiões exibidas"):
+        exibir_exportacao(df, chave="exportacao_regioes", nome_arquivo="incendios_regioes_criticas",
+                          celulas=list(zip(regioes_exibidas['x'], regioes_exibidas['y'])))
     
     # Gráfico de ranking
     st.subheader("Visualização: Ranking de Regiões")
     
-    top_15 = grid_sorted.head(15).copy()
-    top_15['Coordenada'] = '(' + top_15['x'].astype(str) + ', ' + top_15['y'].astype(str) + ')'
-    
-    if criterio == "Área Total Queimada":
-        y_col = 'Área Total (ha)'
-    elif criterio == "Frequência de Incêndios":
-        y_col = 'Frequência'
-    else:
-        y_col = 'Área Máxima (ha)'
-    
-    fig_ranking = px.bar(
-        top_15,
-        x=y_col,
-        y='Coordenada',
-        orientation='h',
-        title=f"Top 15 Regiões Críticas - {criterio}",
-        color=y_col,
-        color_continuous_scale='Reds',
-        labels={'Coordenada': 'Coordenadas (X, Y)'},
-        text=y_col
-    )
-    
-    fig_ranking.update_traces(texttemplate='%{x:.0f}', textposition='outside')
-    fig_ranking.update_layout(height=500, showlegend=False)
-    st.plotly_chart(fig_ranking, use_container_width=True)
+    fig_ranking = grafo.obter('fig_ranking')
+    exibir_grafico(fig_ranking, "Ranking de regiões")
     
     # Análise por características
     st.subheader("📊 Características Meteorológicas das Regiões Críticas")
@@ -226,11 +263,8 @@ with tab2:
     
     with col1:
         st.write("**Regiões Críticas - Perfil Meteorológico:**")
-        top_3_coords = top_10[['x', 'y']].head(3)
-        for _, row in top_3_coords.iterrows():
-            coord = f"({row['x']}, {row['y']})"
-            data_coord = top_10[top_10['x'] == row['x']]
-            data_coord = data_coord[data_coord['y'] == row['y']].iloc[0]
+        for _, data_coord in grid_sorted.head(3).iterrows():
+            coord = f"({int(data_coord['x'])}, {int(data_coord['y'])})"
             st.write(f"""
             **{coord}**
             - Temp: {data_coord['Temp Média']:.1f}°C
@@ -241,18 +275,13 @@ with tab2:
     
     with col2:
         st.write("**Comparação com Média Geral:**")
-        media_geral = {
-            'Temp': df['temp'].mean(),
-            'Umidade': df['rh'].mean(),
-            'FFMC': df['ffmc'].mean(),
-            'ISI': df['isi'].mean()
-        }
+        media_geral = grafo.obter('media_geral')
         st.write(f"""
         **Média do Parque:**
-        - Temp: {media_geral['Temp']:.1f}°C
-        - Umidade: {media_geral['Umidade']:.0f}%
-        - FFMC: {media_geral['FFMC']:.1f}
-        - ISI: {media_geral['ISI']:.1f}
+        - Temp: {media_geral['temp']:.1f}°C
+        - Umidade: {media_geral['rh']:.0f}%
+        - FFMC: {media_geral['ffmc']:.1f}
+        - ISI: {media_geral['isi']:.1f}
         """)
 
 # ========== PERGUNTA 3: SAZONALIDADE MENSAL ==========
@@ -264,127 +293,48 @@ with tab3:
     de alto risco e padrões sazonais ao longo do ano.
     """)
     
-    # Agregar por mês
-    monthly_data = df.groupby('month').agg({
-        'area': ['sum', 'mean', 'count', 'max', 'std'],
-        'temp': 'mean',
-        'rh': 'mean',
-        'ffmc': 'mean',
-        'dmc': 'mean',
-        'dc': 'mean',
-        'isi': 'mean'
-    }).round(2)
-    
-    monthly_data.columns = ['Área Total', 'Área Média', 'Frequência', 'Área Máxima', 'Desvio Área',
-                           'Temp Média', 'Umidade Média', 'FFMC Médio', 'DMC Médio', 'DC Médio', 'ISI Médio']
-    
-    # Ordenar por ordem de meses
-    monthly_data = monthly_data.reindex([m for m in MONTH_ORDER if m in monthly_data.index])
-    monthly_data['Mês'] = monthly_data.index.map(MONTH_MAP)
+    monthly_data = grafo.obter('resumo_mensal')
     
     # Gráficos principais
     col1, col2 = st.columns(2)
     
     with col1:
         st.subheader("Frequência de Incêndios por Mês")
-        fig_freq = px.bar(
-            monthly_data.reset_index(),
-            x='Mês',
-            y='Frequência',
-            title="Quantidade de Incêndios por Mês",
-            color='Frequência',
-            color_continuous_scale='Reds',
-            text='Frequência'
-        )
-        fig_freq.update_traces(textposition='outside')
-        fig_freq.update_layout(height=400, showlegend=False)
-        fig_freq.update_xaxes(tickangle=45)
-        st.plotly_chart(fig_freq, use_container_width=True)
+        fig_freq = grafo.obter('fig_frequencia_mensal')
+        exibir_grafico(fig_freq, "Frequência mensal")
     
     with col2:
         st.subheader("Área Total Queimada por Mês")
-        fig_area = px.bar(
-            monthly_data.reset_index(),
-            x='Mês',
-            y='Área Total',
-            title="Área Queimada Total por Mês",
-            color='Área Total',
-            color_continuous_scale='Reds',
-            text='Área Total'
-        )
-        fig_area.update_traces(texttemplate='%{y:.0f}', textposition='outside')
-        fig_area.update_layout(height=400, showlegend=False)
-        fig_area.update_xaxes(tickangle=45)
-        st.plotly_chart(fig_area, use_container_width=True)
+        fig_area = grafo.obter('fig_area_mensal')
+        exibir_grafico(fig_area, "Área mensal")
+    
+    # Sazonalidade ano a ano (só com registros datados)
+    if grafo.obter('por_ano_mes') is not None:
+        st.subheader("📆 Sazonalidade Ano a Ano")
+
+        grafo.entrada('medida_anual', st.radio(
+            "Medida:",
+            ["Frequência", "Área Total"],
+            horizontal=True,
+            key="medida_anual"
+        ))
+        fig_anos = grafo.obter('fig_anos')
+        exibir_grafico(fig_anos, "Sazonalidade anual")
     
     # Análise combinada
     st.subheader("📊 Série Temporal: Evolução ao Longo do Ano")
     
     # Seletor de variável para comparação
-    variavel_comparacao = st.selectbox(
+    grafo.entrada('variavel_comparacao', st.selectbox(
         "Selecionar variável para comparar com frequência de incêndios:",
-        ["Temperatura Média (°C)", "Umidade Relativa (%)", 
-         "FFMC Médio (Combustível Fino)", "DMC Médio (Combustível Profundo)",
-         "DC Médio (Seca)", "ISI Médio (Propagação)"],
-        index=0
-    )
-    
-    # Mapear seleção para coluna
-    mapping_variaveis = {
-        "Temperatura Média (°C)": ("Temp Média", "#F77F00", "Temperatura Média (°C)"),
-        "Umidade Relativa (%)": ("Umidade Média", "#4A90E2", "Umidade Relativa (%)"),
-        "FFMC Médio (Combustível Fino)": ("FFMC Médio", "#E67E22", "FFMC Médio"),
-        "DMC Médio (Combustível Profundo)": ("DMC Médio", "#9B59B6", "DMC Médio"),
-        "DC Médio (Seca)": ("DC Médio", "#C0392B", "DC Médio"),
-        "ISI Médio (Propagação)": ("ISI Médio", "#E74C3C", "ISI Médio")
-    }
-    
-    coluna_variavel, cor_variavel, label_variavel = mapping_variaveis[variavel_comparacao]
-    
-    fig_combined = go.Figure()
-    
-    # Eixo Y primário: Frequência
-    fig_combined.add_trace(go.Scatter(
-        x=monthly_data['Mês'],
-        y=monthly_data['Frequência'],
-        name='Frequência de Incêndios',
-        mode='lines+markers',
-        yaxis='y1',
-        line=dict(color='#E63946', width=3),
-        marker=dict(size=10)
+        list(VARIAVEIS_COMPARACAO),
+        index=0,
+        key="variavel_comparacao"
     ))
     
-    # Eixo Y secundário: Variável selecionada
-    fig_combined.add_trace(go.Scatter(
-        x=monthly_data['Mês'],
-        y=monthly_data[coluna_variavel],
-        name=label_variavel,
-        mode='lines+markers',
-        yaxis='y2',
-        line=dict(color=cor_variavel, width=2, dash='dash'),
-        marker=dict(size=8)
-    ))
+    fig_combined = grafo.obter('fig_comparacao')
     
-    fig_combined.update_layout(
-        title=f"Relação entre Frequência de Incêndios e {label_variavel}",
-        xaxis=dict(title='Mês'),
-        yaxis=dict(
-            title=dict(text='Frequência de Incêndios', font=dict(color='#E63946')),
-            tickfont=dict(color='#E63946')
-        ),
-        yaxis2=dict(
-            title=dict(text=label_variavel, font=dict(color=cor_variavel)),
-            tickfont=dict(color=cor_variavel),
-            anchor='x',
-            overlaying='y',
-            side='right'
-        ),
-        height=450,
-        hovermode='x unified',
-        legend=dict(x=0.02, y=0.98)
-    )
-    
-    st.plotly_chart(fig_combined, use_container_width=True)
+    exibir_grafico(fig_combined, "Série de comparação")
     
     # Explicação das variáveis FWI
     with st.expander("ℹ️ O que significam os índices de combustão (FWI)?"):
@@ -412,23 +362,8 @@ with tab3:
     # Box plot: Distribuição de área por mês
     st.subheader("📦 Distribuição de Áreas Queimadas por Mês")
     
-    df_plot = df.copy()
-    df_plot['Mês'] = df_plot['month'].map(MONTH_MAP)
-    df_plot = df_plot.sort_values('Mês', key=lambda x: x.map({v: k for k, v in MONTH_MAP.items()}).map(lambda y: MONTH_ORDER.index(y)))
-    
-    fig_box = px.box(
-        df_plot,
-        x='Mês',
-        y='area',
-        title="Box Plot: Variação de Área Queimada por Mês",
-        color='Mês',
-        color_discrete_sequence=px.colors.sequential.Reds,
-        labels={'area': 'Área Queimada (ha)', 'Mês': 'Mês'}
-    )
-    
-    fig_box.update_layout(height=400, showlegend=False)
-    fig_box.update_xaxes(tickangle=45)
-    st.plotly_chart(fig_box, use_container_width=True)
+    fig_box = grafo.obter('fig_boxplot')
+    exibir_grafico(fig_box, "Box plot mensal")
     
     # Tabela resumida
     st.subheader("📋 Resumo Mensal Detalhado")
@@ -436,19 +371,18 @@ with tab3:
     monthly_display = monthly_data[['Mês', 'Frequência', 'Área Total', 'Área Média', 'Área Máxima',
                                      'Temp Média', 'Umidade Média', 'FFMC Médio', 'ISI Médio']].reset_index(drop=True)
     
-    st.dataframe(
-        monthly_display.style.format({
-            'Frequência': '{:.0f}',
-            'Área Total': '{:.2f}',
-            'Área Média': '{:.2f}',
-            'Área Máxima': '{:.2f}',
-            'Temp Média': '{:.1f}',
-            'Umidade Média': '{:.0f}',
-            'FFMC Médio': '{:.1f}',
-            'ISI Médio': '{:.1f}'
-        }),
-        use_container_width=True
-    )
+    exibir_tabela_paginada(monthly_display, FORMATO_RESUMO_MENSAL, chave="tabela_mensal", linhas_por_pagina=25)
+
+    with st.expander("⬇️ Exportar registros por mês"):
+        meses_exportacao = st.multiselect(
+            "Meses:",
+            list(monthly_data.index),
+            default=list(monthly_data.index),
+            format_func=lambda m: MONTH_MAP[m],
+            key="exportar_meses"
+        )
+        exibir_exportacao(df, chave="exportacao_meses", nome_arquivo="incendios_por_mes",
+                          meses=meses_exportacao)
     
     # Insights finais
     st.subheader("💡 Insights Principais sobre Sazonalidade")
@@ -496,3 +430,7 @@ with tab3:
 
 st.markdown("---")
 st.success("✅ Sessão 02 concluída! Você explorou os padrões espaciais, críticos e temporais dos incêndios do Parque Montesinho.")
+
+exibir_diagnostico("Perguntas")
+exibir_grafo(grafo)
+exibir_memoria(df)
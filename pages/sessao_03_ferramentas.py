@@ -0,0 +1,240 @@
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+from src.utils import (
+    construir_indice_similaridade,
+    buscar_incendios_similares, VARIAVEIS_SIMILARIDADE, COLUNA_DATA, MONTH_MAP
+)
+from src.simulacao import simular_mapa_queima, ignicao_padrao
+from src.particoes import selecionar_dados, obter_referencia, legendar_referencia
+from src.diagnostico import exibir_grafico, exibir_tabela, exibir_diagnostico
+from src.memoria import exibir_memoria
+
+st.set_page_config(
+    page_title="Sessão 03 - Ferramentas",
+    page_icon="🧰",
+    layout="wide"
+)
+
+# Esconder navegação padrão do Streamlit
+st.markdown("""
+<style>
+    [data-testid="stSidebarNav"] {
+        display: none;
+    }
+</style>
+""", unsafe_allow_html=True)
+
+# Barra lateral customizada
+with st.sidebar:
+    st.title("Navegação")
+    st.page_link("app.py", label="Resumo", icon="📊")
+    st.page_link("pages/sessao_01_contexto.py", label="Contexto", icon="🌲")
+    st.page_link("pages/sessao_02_perguntas.py", label="Perguntas", icon="❓")
+    st.page_link("pages/sessao_03_ferramentas.py", label="Ferramentas", icon="🧰")
+    st.page_link("pages/sobre.py", label="Sobre", icon="ℹ️")
+
+st.title("🧰 Sessão 03: Ferramentas de Análise")
+st.markdown("---")
+
+# Carregar dados
+df, versao, selecao = selecionar_dados()
+# Simulação e índice de similaridade: no acompanhamento, refeitos só quando a referência avança
+df_referencia, versao_referencia = obter_referencia(df, versao, selecao)
+
+# ========== SIMULAÇÃO DE PROPAGAÇÃO ==========
+st.header("🔥 Simulação de Propagação (E se...?)")
+
+st.write("""
+Escolha uma **célula de ignição** no grid do parque e simule a propagação do fogo
+com um **autômato celular estocástico**. A probabilidade de propagação de cada célula
+é derivada do seu perfil histórico médio de **FFMC, ISI e vento**. O resultado de
+milhares de simulações é um **mapa de probabilidade de queima**.
+""")
+
+col1, col2, col3 = st.columns(3)
+padrao_x, padrao_y = ignicao_padrao(df)
+
+with col1:
+    opcoes_x = list(range(df['x'].min(), df['x'].max() + 1))
+    ignicao_x = st.selectbox(
+        "Coordenada X da ignição:",
+        opcoes_x,
+        index=opcoes_x.index(padrao_x)
+    )
+
+with col2:
+    opcoes_y = list(range(df['y'].min(), df['y'].max() + 1))
+    ignicao_y = st.selectbox(
+        "Coordenada Y da ignição:",
+        opcoes_y,
+        index=opcoes_y.index(padrao_y)
+    )
+
+with col3:
+    n_simulacoes = st.select_slider(
+        "Número de simulações:",
+        options=[1000, 2500, 5000, 10000, 20000],
+        value=10000
+    )
+
+resultado = simular_mapa_queima(df_referencia, versao_referencia, (ignicao_x, ignicao_y), n_simulacoes)
+legendar_referencia(df_referencia, versao_referencia, versao)
+
+col1, col2 = st.columns(2)
+
+with col1:
+    fig_prob = go.Figure(data=go.Heatmap(
+        z=resultado['probabilidade'],
+        x=resultado['x'],
+        y=resultado['y'],
+        colorscale='Oranges',
+        zmin=0,
+        colorbar=dict(title="Probabilidade<br>de Propagação"),
+        hovertemplate="X: %{x}<br>Y: %{y}<br>Propagação: %{z:.2f}<extra></extra>"
+    ))
+    fig_prob.update_layout(
+        title="Probabilidade de Propagação por Célula (perfil histórico)",
+        xaxis_title="Coordenada X",
+        yaxis_title="Coordenada Y",
+        height=450
+    )
+    exibir_grafico(fig_prob, "Probabilidade de propagação")
+
+with col2:
+    fig_queima = go.Figure(data=go.Heatmap(
+        z=resultado['probabilidade_queima'],
+        x=resultado['x'],
+        y=resultado['y'],
+        colorscale='Reds',
+        zmin=0,
+        zmax=1,
+        colorbar=dict(title="Probabilidade<br>de Queima"),
+        hovertemplate="X: %{x}<br>Y: %{y}<br>Queima: %{z:.1%}<extra></extra>"
+    ))
+    fig_queima.add_trace(go.Scatter(
+        x=[ignicao_x],
+        y=[ignicao_y],
+        mode='markers',
+        marker=dict(symbol='x', size=14, color='black'),
+        name='Ignição',
+        hoverinfo='skip'
+    ))
+    fig_queima.update_layout(
+        title=f"Mapa de Probabilidade de Queima ({n_simulacoes} simulações)",
+        xaxis_title="Coordenada X",
+        yaxis_title="Coordenada Y",
+        height=450,
+        showlegend=False
+    )
+    # Probabilidade exibida em % com uma casa
+    exibir_grafico(fig_queima, "Probabilidade de queima", casas_decimais=3)
+
+st.metric(
+    label="🌳 Células Queimadas por Simulação (média)",
+    value=f"{resultado['celulas_queimadas_media']:.1f}",
+    delta=f"de {resultado['probabilidade'].size} células"
+)
+
+st.info("""
+💡 **Limitações do modelo:**
+- A direção do vento não está disponível nos dados, então a propagação é isotrópica
+- Células sem histórico de incêndios recebem a probabilidade mínima de propagação
+- O modelo é exploratório e não substitui modelos operacionais de comportamento do fogo
+""")
+
+st.markdown("---")
+
+# ========== INCÊNDIOS HISTÓRICOS SIMILARES ==========
+st.header("🔎 Incêndios Históricos Similares")
+
+st.write("""
+Informe as condições de uma **nova ignição** e encontre os **incêndios históricos mais
+parecidos** segundo os índices FWI e as variáveis meteorológicas padronizadas. A área
+queimada desses incêndios dá uma referência da severidade esperada.
+""")
+
+rotulos_similaridade = {
+    'ffmc': "FFMC", 'dmc': "DMC", 'dc': "DC", 'isi': "ISI",
+    'temp': "Temperatura (°C)", 'rh': "Umidade Relativa (%)",
+    'wind': "Vento (km/h)", 'rain': "Chuva (mm)"
+}
+
+# Condições da nova ignição (padrão: mediana histórica)
+consulta = {}
+cols_consulta = st.columns(4)
+for idx, var in enumerate(VARIAVEIS_SIMILARIDADE):
+    with cols_consulta[idx % 4]:
+        consulta[var] = st.number_input(
+            rotulos_similaridade[var],
+            value=float(df[var].median()),
+            format="%.1f",
+            key=f"consulta_{var}"
+        )
+
+col1, col2 = st.columns([1, 2])
+
+with col1:
+    k_vizinhos = st.slider("Número de incêndios similares (k):", min_value=1, max_value=20, value=5)
+
+with col2:
+    with st.expander("⚖️ Pesos das variáveis", expanded=False):
+        cols_pesos = st.columns(4)
+        pesos = {}
+        for idx, var in enumerate(VARIAVEIS_SIMILARIDADE):
+            with cols_pesos[idx % 4]:
+                pesos[var] = st.slider(
+                    rotulos_similaridade[var], min_value=0.0, max_value=3.0,
+                    value=1.0, step=0.5, key=f"peso_{var}"
+                )
+
+indice = construir_indice_similaridade(df_referencia, versao_referencia, pesos)
+similares = buscar_incendios_similares(indice, pd.DataFrame([consulta]), k=k_vizinhos)
+legendar_referencia(df_referencia, versao_referencia, versao)
+
+col1, col2, col3 = st.columns(3)
+
+with col1:
+    st.metric(
+        label="🌳 Área Média dos Similares",
+        value=f"{similares['area'].mean():.2f} ha"
+    )
+
+with col2:
+    st.metric(
+        label="📏 Área Mediana dos Similares",
+        value=f"{similares['area'].median():.2f} ha"
+    )
+
+with col3:
+    st.metric(
+        label="🔥 Similares com Área > 0",
+        value=f"{(similares['area'] > 0).sum()} de {len(similares)}"
+    )
+
+similares_display = similares.drop(columns=['consulta']).rename(columns={
+    'posicao': 'Posição', 'distancia': 'Distância', 'x': 'X', 'y': 'Y',
+    'month': 'Mês', 'day': 'Dia', 'area': 'Área (ha)', COLUNA_DATA: 'Data'
+})
+similares_display['Mês'] = similares_display['Mês'].map(MONTH_MAP)
+if 'Data' in similares_display.columns:
+    similares_display['Data'] = similares_display['Data'].dt.strftime('%d/%m/%Y')
+
+exibir_tabela(similares_display.round(2), 'similares', use_container_width=True, hide_index=True)
+
+fig_similares = px.scatter(
+    similares,
+    x='distancia',
+    y='area',
+    color='area',
+    color_continuous_scale='Reds',
+    hover_data=['x', 'y', 'month'] + VARIAVEIS_SIMILARIDADE,
+    title="Área Queimada × Distância até a Nova Ignição",
+    labels={'distancia': 'Distância (padronizada)', 'area': 'Área (ha)'}
+)
+fig_similares.update_layout(height=400)
+exibir_grafico(fig_similares, "Similares")
+
+exibir_diagnostico("Ferramentas")
+exibir_memoria(df)
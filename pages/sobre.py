@@ -21,6 +21,7 @@ with st.sidebar:
     st.page_link("app.py", label="Resumo", icon="📊")
     st.page_link("pages/sessao_01_contexto.py", label="Contexto", icon="🌲")
     st.page_link("pages/sessao_02_perguntas.py", label="Perguntas", icon="❓")
+    st.page_link("pages/sessao_03_ferramentas.py", label="Ferramentas", icon="🧰")
     st.page_link("pages/sobre.py", label="Sobre", icon="ℹ️")
 
 st.title("ℹ️ Sobre Esta Aplicação")
@@ -0,0 +1,313 @@
+"""
+Acompanhamento de um CSV de incêndios que recebe registros ao longo do dia
+
+O sistema de campo anexa relatos ao fim do arquivo. Em vez de invalidar
+load_forestfires e reler tudo, o AcompanhadorCSV guarda a posição (em
+bytes) até onde já leu e, a cada verificação, interpreta só as linhas
+novas. As linhas novas são incorporadas às somas parciais dos agregados
+(calcular_parciais) e ao acumulador de covariância, de modo que o custo da
+atualização acompanha o volume anexado, e não o tamanho do arquivo. Os
+registros ficam numa lista de blocos: cada lote entra como um bloco novo e
+blocos vizinhos de tamanho parecido são fundidos (cada registro é copiado
+O(log N) vezes no total). O DataFrame completo só é montado quando uma
+página o pede (dados_instantaneo), uma vez por instantâneo. Se o arquivo tiver a coluna de data, as janelas móveis
+(src.janelas) também são atualizadas a cada lote. As linhas de base de
+anomalia (src.anomalias) recebem os registros novos na ordem de chegada.
+A pirâmide do mapa de calor (src.piramide) recebe cada lote copiando só os
+tiles tocados.
+
+Os cálculos que não têm versão incremental e percorrem o quadro inteiro
+(teste de permutação das correlações, densidade KDE, simulação e índice de
+similaridade) usam a referência do instantâneo: dados e versão que só
+avançam a cada INTERVALO_REFERENCIA_S, e não a cada lote.
+
+As linhas novas passam pela etapa de ingestão (src.ingestao): registros
+inválidos ou repetidos são descartados antes de entrar nos agregados.
+
+Uma linha ainda incompleta no fim do arquivo (sem quebra de linha) fica
+para a próxima verificação. Se o arquivo for truncado ou substituído, ele
+é relido desde o início.
+
+As sessões abertas verificam a versão dos dados num fragmento periódico
+(exibir_acompanhamento) e recarregam a página quando ela muda.
+
+Uso:
+    python -m src.servidor --acompanhar [--intervalo-acompanhamento 2]
+"""
+
+import io
+import logging
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pandas as pd
+import streamlit as st
+
+from src.utils import CSV_PATH, COLUNA_DATA, calcular_parciais, reduzir_parciais, combinar_agregados
+from src.correlacao import AcumuladorCovariancia
+from src.ingestao import Ingestao
+from src.janelas import JanelasMoveis
+from src.anomalias import DetectorAnomalias
+from src.piramide import PiramideMapa
+
+
+logger = logging.getLogger(__name__)
+
+# Intervalo entre verificações do arquivo e das sessões, em segundos
+INTERVALO_PADRAO_S = 2.0
+
+# Intervalo mínimo entre avanços da referência dos cálculos pesados, em segundos
+INTERVALO_REFERENCIA_S = 300.0
+
+
+class AcompanhadorCSV:
+    """
+    Lê incrementalmente um CSV no esquema de forestfires.csv que cresce por anexação
+
+    Cada atualização publica um novo instantâneo (blocos de registros, versão,
+    agregados e acumulador de covariância); instantâneos anteriores nunca são
+    alterados (exceto pelo DataFrame montado sob demanda, ver
+    dados_instantaneo), então as sessões podem usá-los sem trava.
+    """
+
+    def __init__(self, caminho: Path = CSV_PATH):
+        self.caminho = Path(caminho)
+        self._trava = threading.Lock()
+        self._geracao = 0
+        self._reiniciar()
+        self.atualizar()
+
+    def _reiniciar(self) -> None:
+        """Volta ao início do arquivo (primeira leitura, truncamento ou substituição)"""
+        self._geracao += 1
+        self._posicao = 0
+        self._inode = None
+        self._colunas = None
+        self._instantaneo = None
+        self._blocos: List[pd.DataFrame] = []
+        # Hashes só em memória: o arquivo acompanhado é a fonte de verdade
+        self._ingestao = Ingestao(diretorio=None)
+        self._janelas = JanelasMoveis()
+        self._detector = DetectorAnomalias()
+        self._piramide = PiramideMapa()
+        self._referencia_em = 0.0
+
+    def _ler_linhas_novas(self) -> Optional[pd.DataFrame]:
+        """Interpreta as linhas completas anexadas desde a última leitura"""
+        with open(self.caminho, 'rb') as arquivo:
+            arquivo.seek(self._posicao)
+            dados = arquivo.read()
+
+        # Só até a última quebra de linha: uma linha pela metade fica para depois
+        fim = dados.rfind(b'\n') + 1
+        if fim == 0:
+            return None
+        if fim < len(dados):
+            dados = dados[:fim]
+
+        if self._colunas is None:
+            novas = pd.read_csv(io.BytesIO(dados))
+            novas.columns = novas.columns.str.lower().str.strip()
+            self._colunas = list(novas.columns)
+        else:
+            novas = pd.read_csv(io.BytesIO(dados), header=None, names=self._colunas)
+
+        self._posicao += fim
+        novas, _ = self._ingestao.ingerir(novas)
+        return novas
+
+    def atualizar(self) -> int:
+        """
+        Incorpora as linhas anexadas desde a última chamada
+
+        Returns:
+            Número de registros novos (0 se nada mudou)
+        """
+        with self._trava:
+            stat = self.caminho.stat()
+            if self._inode is not None and (stat.st_ino != self._inode or stat.st_size < self._posicao):
+                logger.info("Arquivo %s truncado ou substituído; relendo desde o início", self.caminho)
+                self._reiniciar()
+            self._inode = stat.st_ino
+
+            if self._instantaneo is not None and stat.st_size == self._posicao:
+                return 0
+
+            novas = self._ler_linhas_novas()
+            if novas is None:
+                if self._instantaneo is None:
+                    raise ValueError(f"{self.caminho} não tem o cabeçalho completo")
+                return 0
+
+            anterior = self._instantaneo
+            self._anexar_bloco(novas)
+            # Parciais: uma linha por grupo (célula e mês), não por registro
+            parciais = calcular_parciais(novas)
+            acumulador = AcumuladorCovariancia().atualizar(novas)
+            if anterior is not None:
+                parciais = reduzir_parciais(pd.concat([anterior['parciais'], parciais], ignore_index=True))
+                acumulador = anterior['acumulador'].combinar(acumulador)
+            datado = COLUNA_DATA in novas.columns
+            if datado:
+                self._janelas.atualizar(novas)
+            alertas = self._detector.atualizar(novas)
+            self._piramide = self._piramide.atualizar(novas)
+            if alertas:
+                logger.warning("%d alertas de anomalia novos em %s", alertas, self.caminho)
+
+            versao = f"acompanhamento-{self._geracao}-{self._posicao}"
+            self._instantaneo = {
+                'blocos': tuple(self._blocos),
+                'n_registros': sum(len(bloco) for bloco in self._blocos),
+                'versao': versao,
+                'parciais': parciais,
+                'agregados': combinar_agregados(parciais) if len(parciais) else None,
+                'acumulador': acumulador,
+                'janelas': self._janelas.resultado() if datado else None,
+                'anomalias': self._detector.resultado(),
+                'piramide': self._piramide,
+                'linhas_novas': len(novas),
+                'atualizado_em': datetime.now()
+            }
+            agora = time.monotonic()
+            if anterior is None or agora - self._referencia_em >= INTERVALO_REFERENCIA_S:
+                self._instantaneo['referencia'] = self._instantaneo
+                self._referencia_em = agora
+            else:
+                self._instantaneo['referencia'] = anterior['referencia']
+            return len(novas)
+
+    def _anexar_bloco(self, novas: pd.DataFrame) -> None:
+        """Anexa um lote à lista de blocos, fundindo blocos vizinhos de tamanho parecido"""
+        if len(novas) == 0 and self._blocos:
+            return
+        self._blocos.append(novas)
+        while len(self._blocos) > 1 and len(self._blocos[-2]) <= len(self._blocos[-1]):
+            ultimo = self._blocos.pop()
+            self._blocos[-1] = pd.concat([self._blocos[-1], ultimo], ignore_index=True)
+
+    def instantaneo(self) -> Dict:
+        """
+        Estado atual dos dados acompanhados
+
+        Returns:
+            Dicionário com 'blocos' (registros, ver dados_instantaneo),
+            'n_registros', 'versao', 'parciais', 'agregados' (formato de
+            calcular_agregados; None sem registros), 'acumulador', 'janelas'
+            (formato de calcular_janelas), 'anomalias' (formato de
+            calcular_anomalias), 'piramide' (PiramideMapa), 'referencia'
+            (instantâneo usado nos cálculos pesados), 'linhas_novas' (da
+            última atualização) e 'atualizado_em'
+        """
+        return self._instantaneo
+
+
+_trava_dados = threading.Lock()
+
+
+def dados_instantaneo(instantaneo: Dict) -> pd.DataFrame:
+    """
+    DataFrame com todos os registros de um instantâneo
+
+    Montado na primeira chamada (uma cópia dos blocos) e guardado no próprio
+    instantâneo: a thread de acompanhamento não copia o quadro a cada lote,
+    só as páginas que precisam dele, uma vez por versão.
+
+    Args:
+        instantaneo: Saída de AcompanhadorCSV.instantaneo (ou a sua 'referencia')
+
+    Returns:
+        DataFrame no esquema de forestfires.csv
+    """
+    with _trava_dados:
+        if 'df' not in instantaneo:
+            blocos = instantaneo['blocos']
+            instantaneo['df'] = blocos[0] if len(blocos) == 1 else pd.concat(blocos, ignore_index=True)
+        return instantaneo['df']
+
+
+_acompanhador: Optional[AcompanhadorCSV] = None
+_parar = threading.Event()
+_trava = threading.Lock()
+_thread: Optional[threading.Thread] = None
+
+
+def _executar(intervalo_s: float) -> None:
+    """Corpo da thread de acompanhamento"""
+    while not _parar.wait(intervalo_s):
+        try:
+            inicio = time.perf_counter()
+            novas = _acompanhador.atualizar()
+            if novas:
+                logger.info("%d registros novos incorporados em %.3f s",
+                            novas, time.perf_counter() - inicio)
+        except Exception:
+            logger.exception("Falha ao ler registros novos de %s", _acompanhador.caminho)
+
+
+def iniciar_acompanhamento(caminho: Path = CSV_PATH,
+                           intervalo_s: float = INTERVALO_PADRAO_S) -> AcompanhadorCSV:
+    """
+    Lê o arquivo e passa a acompanhá-lo numa thread (apenas uma vez por processo)
+
+    Args:
+        caminho: CSV acompanhado
+        intervalo_s: Intervalo entre verificações do arquivo, em segundos
+
+    Returns:
+        Acompanhador ativo
+    """
+    global _acompanhador, _thread
+    with _trava:
+        if _acompanhador is None:
+            _acompanhador = AcompanhadorCSV(caminho)
+            _parar.clear()
+            _thread = threading.Thread(target=_executar, args=(intervalo_s,),
+                                       name="acompanhamento-csv", daemon=True)
+            _thread.start()
+    return _acompanhador
+
+
+def parar_acompanhamento() -> None:
+    """Encerra a thread de acompanhamento e volta à leitura por load_forestfires"""
+    global _acompanhador, _thread
+    with _trava:
+        _parar.set()
+        if _thread is not None:
+            _thread.join()
+        _acompanhador = None
+        _thread = None
+
+
+def acompanhador_ativo() -> Optional[AcompanhadorCSV]:
+    """Acompanhador iniciado neste processo, se houver"""
+    return _acompanhador
+
+
+@st.fragment(run_every=INTERVALO_PADRAO_S)
+def _verificar_versao(versao_exibida: str) -> None:
+    """Recarrega a página quando o acompanhador publica uma versão nova"""
+    instantaneo = _acompanhador.instantaneo() if _acompanhador is not None else None
+    if instantaneo is None:
+        return
+    if instantaneo['versao'] != versao_exibida:
+        st.rerun()
+    st.caption(f"🔄 Acompanhando {_acompanhador.caminho.name}: {instantaneo['n_registros']:,} registros "
+               f"(atualizado às {instantaneo['atualizado_em']:%H:%M:%S})")
+
+
+def exibir_acompanhamento(versao: str) -> None:
+    """
+    Exibe o estado do acompanhamento e recarrega a página quando chegam registros
+
+    A verificação roda num fragmento periódico que só compara versões; a
+    página inteira só é refeita quando há dados novos.
+
+    Args:
+        versao: Versão dos dados usada na execução atual da página
+    """
+    with st.sidebar:
+        _verificar_versao(versao)
@@ -0,0 +1,291 @@
+"""
+Detecção de anomalias por célula do grid com médias móveis exponenciais (EWMA)
+
+O DetectorAnomalias mantém, para cada célula (X, Y) e cada mês, a média e a
+variância exponencialmente ponderadas de duas séries:
+
+- Área: log(1 + área) de cada registro recebido. Um registro cujo escore z
+  (em relação à linha de base anterior a ele) passa de LIMIAR_Z é sinalizado
+  como queimada anormalmente grande para aquela célula e mês.
+- Frequência (só com a coluna de data): número de incêndios da célula em
+  cada dia. Ao fechar um dia (chegou um registro de data posterior), a
+  contagem de todas as células é comparada à linha de base do mês.
+  Registros que chegam depois de o seu dia ter sido fechado só entram na
+  série de área.
+
+O estado fica em vetores NumPy (células x meses) e cada registro custa O(1).
+Dentro de um lote, registros da mesma célula e mês são aplicados em ordem de
+chegada; a atualização é vetorizada por "rodada" (a k-ésima ocorrência de
+cada chave), então o custo em Python acompanha a maior repetição de uma
+chave no lote, não o tamanho do lote.
+"""
+
+from collections import deque
+from typing import Deque, Dict, Optional
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from src.diagnostico import exibir_tabela
+from src.utils import COLUNA_DATA, MAX_ENTRADAS_CACHE, MONTH_MAP, MONTH_ORDER
+
+
+# Peso da observação mais recente nas médias exponenciais
+FATOR_SUAVIZACAO = 0.1
+
+# Escore z a partir do qual uma observação é sinalizada (só desvios para cima)
+LIMIAR_Z = 3.0
+
+# Observações mínimas de uma célula e mês antes de sinalizar
+MIN_OBSERVACOES = 10
+
+# Piso da variância de cada série: evita escores enormes em séries quase
+# constantes (ex: uma célula sem incêndios em que ocorre um único incêndio)
+VARIANCIA_MINIMA_AREA = 0.05
+VARIANCIA_MINIMA_FREQUENCIA = 1.0
+
+# Alertas mais recentes mantidos pelo detector
+MAX_ALERTAS = 500
+
+COLUNAS_ALERTAS = ['tipo', 'x', 'y', 'month', COLUNA_DATA, 'valor', 'esperado', 'z']
+
+
+class _LinhaBase:
+    """Média e variância exponenciais por (célula, mês), em vetores planos"""
+
+    def __init__(self, n_chaves: int, variancia_minima: float):
+        self.variancia_minima = variancia_minima
+        self.media = np.zeros(n_chaves)
+        self.variancia = np.zeros(n_chaves)
+        self.n = np.zeros(n_chaves, dtype=np.int64)
+
+    def ampliar(self, indices_antigos: np.ndarray, n_chaves: int) -> None:
+        """Realoca os vetores para um grid maior, preservando o estado das chaves antigas"""
+        for nome in ('media', 'variancia', 'n'):
+            antigo = getattr(self, nome)
+            novo = np.zeros(n_chaves, dtype=antigo.dtype)
+            novo[indices_antigos] = antigo
+            setattr(self, nome, novo)
+
+    def atualizar(self, chaves: np.ndarray, valores: np.ndarray) -> np.ndarray:
+        """
+        Aplica uma observação a cada chave (chaves distintas entre si)
+
+        Returns:
+            Escore z de cada observação em relação à linha de base anterior
+            (NaN enquanto a chave tem menos de MIN_OBSERVACOES)
+        """
+        media = self.media[chaves]
+        variancia = self.variancia[chaves]
+        n = self.n[chaves]
+
+        desvio = valores - media
+        z = np.where(n >= MIN_OBSERVACOES,
+                     desvio / np.sqrt(np.maximum(variancia, self.variancia_minima)), np.nan)
+
+        primeira = n == 0
+        incremento = FATOR_SUAVIZACAO * desvio
+        self.media[chaves] = np.where(primeira, valores, media + incremento)
+        self.variancia[chaves] = np.where(primeira, 0.0,
+                                          (1 - FATOR_SUAVIZACAO) * (variancia + desvio * incremento))
+        self.n[chaves] = n + 1
+        return z
+
+
+class DetectorAnomalias:
+    """
+    Linhas de base EWMA por célula e mês, com sinalização por escore z
+
+    Os alertas gerados ficam numa fila limitada a MAX_ALERTAS (os mais recentes).
+    """
+
+    def __init__(self):
+        self._lado_x = 0
+        self._lado_y = 0
+        self._area = _LinhaBase(0, VARIANCIA_MINIMA_AREA)
+        self._frequencia = _LinhaBase(0, VARIANCIA_MINIMA_FREQUENCIA)
+        self._dia_aberto: Optional[int] = None
+        self._contagem_dia = np.zeros((0, 0), dtype=np.int64)
+        self._alertas: Deque[Dict] = deque(maxlen=MAX_ALERTAS)
+        self.registros = 0
+        self.total_alertas = 0
+
+    def _chaves(self, ix: np.ndarray, iy: np.ndarray, im: np.ndarray) -> np.ndarray:
+        return (ix * self._lado_y + iy) * 12 + im
+
+    def _garantir_celulas(self, lado_x: int, lado_y: int) -> None:
+        """Amplia o grid quando chegam coordenadas maiores que as já vistas"""
+        if lado_x <= self._lado_x and lado_y <= self._lado_y:
+            return
+        ix, iy, im = np.meshgrid(np.arange(self._lado_x), np.arange(self._lado_y), np.arange(12), indexing='ij')
+        antigos = (ix, iy, im)
+        novo_x, novo_y = max(lado_x, self._lado_x), max(lado_y, self._lado_y)
+        self._lado_x, self._lado_y = novo_x, novo_y
+        indices = self._chaves(*antigos).ravel()
+        for linha_base in (self._area, self._frequencia):
+            linha_base.ampliar(indices, novo_x * novo_y * 12)
+        self._contagem_dia = np.pad(self._contagem_dia, ((0, novo_x - self._contagem_dia.shape[0]),
+                                                         (0, novo_y - self._contagem_dia.shape[1])))
+
+    def _registrar(self, tipo: str, ix: np.ndarray, iy: np.ndarray, im: np.ndarray,
+                   datas: Optional[np.ndarray], valores: np.ndarray,
+                   esperados: np.ndarray, z: np.ndarray) -> None:
+        for i in np.flatnonzero(z > LIMIAR_Z):
+            self.total_alertas += 1
+            self._alertas.append({
+                'tipo': tipo,
+                'x': int(ix[i]) + 1,
+                'y': int(iy[i]) + 1,
+                'month': MONTH_ORDER[im[i]],
+                COLUNA_DATA: pd.Timestamp(datas[i]) if datas is not None else pd.NaT,
+                'valor': float(valores[i]),
+                'esperado': float(esperados[i]),
+                'z': float(z[i])
+            })
+
+    def _atualizar_area(self, ix: np.ndarray, iy: np.ndarray, im: np.ndarray,
+                        area: np.ndarray, datas: Optional[np.ndarray]) -> None:
+        """Aplica log(1 + área) de cada registro à linha de base da célula e mês, em ordem"""
+        chaves = self._chaves(ix, iy, im)
+        valores = np.log1p(area)
+
+        # Rodada k = k-ésima ocorrência da chave no lote: chaves distintas em cada rodada
+        rodadas = pd.Series(chaves).groupby(chaves).cumcount().to_numpy()
+        ordem = np.argsort(rodadas, kind='stable')
+        limites = np.searchsorted(rodadas[ordem], np.arange(rodadas.max() + 2))
+
+        for inicio, fim in zip(limites[:-1], limites[1:]):
+            linhas = ordem[inicio:fim]
+            esperados = self._area.media[chaves[linhas]]
+            z = self._area.atualizar(chaves[linhas], valores[linhas])
+            self._registrar('área', ix[linhas], iy[linhas], im[linhas],
+                            datas[linhas] if datas is not None else None,
+                            area[linhas], np.expm1(esperados), z)
+
+    def _fechar_dia(self) -> None:
+        """Compara a contagem do dia aberto de cada célula à linha de base do mês"""
+        dia = np.datetime64(self._dia_aberto, 'D')
+        mes = int(dia.astype('datetime64[M]').astype(np.int64) % 12)
+        ix, iy = np.meshgrid(np.arange(self._lado_x), np.arange(self._lado_y), indexing='ij')
+        ix, iy = ix.ravel(), iy.ravel()
+        im = np.full(len(ix), mes)
+        chaves = self._chaves(ix, iy, im)
+        contagens = self._contagem_dia.ravel().astype(float)
+
+        esperados = self._frequencia.media[chaves]
+        z = self._frequencia.atualizar(chaves, contagens)
+        self._registrar('frequência', ix, iy, im, np.full(len(ix), dia), contagens, esperados, z)
+        self._contagem_dia[:] = 0
+
+    def _atualizar_frequencia(self, ix: np.ndarray, iy: np.ndarray, dias: np.ndarray) -> None:
+        """Acumula contagens diárias, fechando os dias (inclusive os sem incêndios) que ficaram para trás"""
+        for dia in np.unique(dias):
+            if self._dia_aberto is not None and dia < self._dia_aberto:
+                continue
+            if self._dia_aberto is None:
+                self._dia_aberto = int(dia)
+            # Dias sem registros também entram na linha de base (contagem zero); lacunas longas são limitadas a um ano
+            while self._dia_aberto < dia:
+                self._fechar_dia()
+                self._dia_aberto = max(self._dia_aberto + 1, int(dia) - 366)
+            do_dia = dias == dia
+            np.add.at(self._contagem_dia, (ix[do_dia], iy[do_dia]), 1)
+
+    def atualizar(self, df: pd.DataFrame) -> int:
+        """
+        Processa registros na ordem de chegada
+
+        Args:
+            df: Registros com 'x', 'y', 'month' e 'area' (e, opcionalmente,
+                COLUNA_DATA como datetime)
+
+        Returns:
+            Número de alertas novos
+        """
+        if df.empty:
+            return 0
+        antes = self.total_alertas
+
+        ix = df['x'].to_numpy(dtype=np.int64) - 1
+        iy = df['y'].to_numpy(dtype=np.int64) - 1
+        im = df['month'].map(MONTH_ORDER.index).to_numpy(dtype=np.int64)
+        self._garantir_celulas(int(ix.max()) + 1, int(iy.max()) + 1)
+
+        datas = None
+        if COLUNA_DATA in df.columns and df[COLUNA_DATA].notna().all():
+            datas = df[COLUNA_DATA].to_numpy().astype('datetime64[D]')
+        self._atualizar_area(ix, iy, im, df['area'].to_numpy(dtype=float), datas)
+        if datas is not None:
+            self._atualizar_frequencia(ix, iy, datas.astype(np.int64))
+
+        self.registros += len(df)
+        return self.total_alertas - antes
+
+    def resultado(self) -> Dict:
+        """
+        Instantâneo dos alertas (cópia, não muda depois)
+
+        Returns:
+            Dicionário com 'alertas' (DataFrame com COLUNAS_ALERTAS, do mais
+            recente ao mais antigo, no máximo MAX_ALERTAS), 'total_alertas' e
+            'registros' (totais processados)
+        """
+        alertas = pd.DataFrame(list(self._alertas), columns=COLUNAS_ALERTAS)
+        alertas[COLUNA_DATA] = pd.to_datetime(alertas[COLUNA_DATA])
+        return {
+            'alertas': alertas.iloc[::-1].reset_index(drop=True),
+            'total_alertas': self.total_alertas,
+            'registros': self.registros
+        }
+
+
+@st.cache_data(max_entries=MAX_ENTRADAS_CACHE)
+def calcular_anomalias(_df: pd.DataFrame, versao: str) -> Dict:
+    """
+    Alertas de anomalia de todos os registros, na ordem do arquivo
+
+    Args:
+        _df: DataFrame de incêndios (excluído do hash do cache)
+        versao: Versão dos dados, usada como chave do cache
+
+    Returns:
+        Saída de DetectorAnomalias.resultado
+    """
+    detector = DetectorAnomalias()
+    detector.atualizar(_df)
+    return detector.resultado()
+
+
+def exibir_alertas(anomalias: Dict, limite: int = 20) -> None:
+    """
+    Painel com os alertas de anomalia mais recentes
+
+    Args:
+        anomalias: Saída de DetectorAnomalias.resultado
+        limite: Número máximo de alertas listados
+    """
+    alertas = anomalias['alertas']
+    st.header("🚨 Alertas de Anomalia")
+
+    if alertas.empty:
+        st.success(f"Nenhuma célula fora do padrão em {anomalias['registros']:,} registros "
+                   f"(escore z acima de {LIMIAR_Z:.0f}).")
+        return
+
+    st.write(f"**{len(alertas)}** alertas recentes: células cuja área queimada (por registro) ou "
+             f"frequência diária ficou mais de {LIMIAR_Z:.0f} desvios acima da média móvel "
+             f"exponencial da célula no mês.")
+
+    exibicao = alertas.head(limite).assign(
+        Célula=lambda a: '(' + a['x'].astype(str) + ', ' + a['y'].astype(str) + ')',
+        Mês=lambda a: a['month'].map(MONTH_MAP),
+        Valor=lambda a: a['valor'].round(2),
+        Esperado=lambda a: a['esperado'].round(2),
+        z=lambda a: a['z'].round(1)
+    ).rename(columns={'tipo': 'Tipo'})
+    colunas = ['Tipo', 'Célula', 'Mês', 'Valor', 'Esperado', 'z']
+    if exibicao[COLUNA_DATA].notna().any():
+        exibicao['Data'] = exibicao[COLUNA_DATA].dt.strftime('%d/%m/%Y')
+        colunas.insert(3, 'Data')
+    exibir_tabela(exibicao[colunas], 'alertas', use_container_width=True, hide_index=True)
@@ -0,0 +1,402 @@
+"""
+API HTTP local com os KPIs e agregados do dashboard em JSON
+
+Serve os mesmos cálculos das páginas (calcular_kpis_incendios,
+agregar_por_grid, agregar_por_mes e o ranking de regiões críticas) para
+outras ferramentas internas, sem depender de uma sessão Streamlit.
+
+Cada resposta é identificada pela versão dos dados, pela rota e pelos
+parâmetros: o ETag é derivado só dessas chaves, então um If-None-Match
+válido é respondido com 304 sem calcular nada. Os corpos (JSON e gzip)
+ficam num cache LRU em memória até a versão dos dados mudar.
+
+Rotas (todas aceitam ?mes=jan,feb,... para filtrar por mês):
+    GET /            Índice das rotas e versão atual dos dados
+    GET /kpis        KPIs principais
+    GET /grid        Agregados por coordenada (X, Y)
+    GET /mes         Agregados por mês
+    GET /ranking     Regiões críticas (?criterio=area_total|frequencia|area_maxima&limite=10)
+    GET /exportar    Registros em CSV ou Parquet, transmitidos em blocos
+                     (?formato=csv|parquet&compressao=gzip|snappy|zstd&x=6&y=5)
+
+Uso:
+    python -m src.api --host 127.0.0.1 --porta 8765
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import logging
+import sys
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+import pandas as pd
+
+from src.utils import (
+    load_forestfires, obter_versao_dados, calcular_agregados, calcular_kpis_incendios,
+    agregar_por_grid, agregar_por_mes, agregar_regioes_criticas, CRITERIOS_REGIOES, CSV_PATH, MONTH_ORDER
+)
+from src.graficos import achatar_colunas
+from src.exportacao import (
+    gerar_exportacao, validar_exportacao, extensao_exportacao, COMPRESSOES_EXPORTACAO, TIPOS_MIME
+)
+
+
+logger = logging.getLogger(__name__)
+
+# Critérios do ranking aceitos na URL e critério correspondente das páginas
+CRITERIOS_API = dict(zip(['area_total', 'frequencia', 'area_maxima'], CRITERIOS_REGIOES))
+
+LIMITE_RANKING_PADRAO = 10
+LIMITE_RANKING_MAXIMO = 100
+
+# Corpos menores que isso não compensam a compressão
+TAMANHO_MINIMO_GZIP = 512
+
+# Número máximo de respostas mantidas no cache
+TAMANHO_CACHE_RESPOSTAS = 256
+
+
+class ErroRequisicao(ValueError):
+    """Parâmetros inválidos na requisição (respondido com 400)"""
+
+
+def _registros(df: pd.DataFrame) -> List[Dict]:
+    """Converte um DataFrame em lista de registros com NaN como null"""
+    df = achatar_colunas(df)
+    return df.astype(object).where(df.notna(), None).to_dict('records')
+
+
+def _valor_json(valor):
+    """Converte escalares numpy para tipos nativos do JSON"""
+    if isinstance(valor, np.generic):
+        return valor.item()
+    raise TypeError(f"Tipo não serializável: {type(valor).__name__}")
+
+
+def _parametros(query: str) -> Dict[str, str]:
+    """Lê a query string, mantendo o último valor de cada parâmetro"""
+    return {chave: valores[-1] for chave, valores in parse_qs(query).items()}
+
+
+def _ler_meses(mes: str) -> List[str]:
+    """Valida o parâmetro ?mes=jan,feb,..."""
+    meses = [m.strip().lower() for m in mes.split(',') if m.strip()]
+    invalidos = [m for m in meses if m not in MONTH_ORDER]
+    if invalidos:
+        raise ErroRequisicao(f"Mês inválido: {', '.join(invalidos)}")
+    return meses
+
+
+def _filtrar_meses(df: pd.DataFrame, mes: Optional[str]) -> pd.DataFrame:
+    """Aplica o filtro ?mes=jan,feb,... ao DataFrame"""
+    if not mes:
+        return df
+    meses = _ler_meses(mes)
+    filtrado = df[df['month'].isin(meses)]
+    if filtrado.empty:
+        raise ErroRequisicao(f"Nenhum incêndio registrado em: {', '.join(meses)}")
+    return filtrado
+
+
+def _ler_limite(valor: Optional[str]) -> int:
+    """Valida o parâmetro ?limite= do ranking"""
+    if valor is None:
+        return LIMITE_RANKING_PADRAO
+    try:
+        limite = int(valor)
+    except ValueError:
+        raise ErroRequisicao(f"Limite inválido: {valor}")
+    if not 1 <= limite <= LIMITE_RANKING_MAXIMO:
+        raise ErroRequisicao(f"Limite deve estar entre 1 e {LIMITE_RANKING_MAXIMO}")
+    return limite
+
+
+def _rota_kpis(df: pd.DataFrame, versao: str, parametros: Dict) -> Dict:
+    if parametros.get('mes'):
+        return calcular_kpis_incendios(_filtrar_meses(df, parametros['mes']))
+    return calcular_agregados(df, versao)['kpis']
+
+
+def _rota_grid(df: pd.DataFrame, versao: str, parametros: Dict) -> List[Dict]:
+    if parametros.get('mes'):
+        return _registros(agregar_por_grid(_filtrar_meses(df, parametros['mes'])))
+    return _registros(calcular_agregados(df, versao)['grid'])
+
+
+def _rota_mes(df: pd.DataFrame, versao: str, parametros: Dict) -> List[Dict]:
+    if parametros.get('mes'):
+        return _registros(agregar_por_mes(_filtrar_meses(df, parametros['mes'])))
+    return _registros(calcular_agregados(df, versao)['mes'])
+
+
+def _rota_ranking(df: pd.DataFrame, versao: str, parametros: Dict) -> List[Dict]:
+    criterio = parametros.get('criterio', 'area_total')
+    if criterio not in CRITERIOS_API:
+        raise ErroRequisicao(f"Critério inválido: {criterio} (opções: {', '.join(CRITERIOS_API)})")
+    limite = _ler_limite(parametros.get('limite'))
+
+    if parametros.get('mes'):
+        regioes = agregar_regioes_criticas(_filtrar_meses(df, parametros['mes']))
+    else:
+        regioes = calcular_agregados(df, versao)['regioes']
+
+    coluna = CRITERIOS_REGIOES[CRITERIOS_API[criterio]]
+    return _registros(regioes.sort_values(coluna, ascending=False).head(limite))
+
+
+ROTAS = {
+    '/kpis': _rota_kpis,
+    '/grid': _rota_grid,
+    '/mes': _rota_mes,
+    '/ranking': _rota_ranking
+}
+
+# Parâmetros aceitos por rota (os demais são ignorados e não entram na chave)
+PARAMETROS_ROTAS = {
+    '/kpis': ('mes',),
+    '/grid': ('mes',),
+    '/mes': ('mes',),
+    '/ranking': ('mes', 'criterio', 'limite')
+}
+
+
+class CacheRespostas:
+    """Cache LRU de respostas prontas (JSON e gzip), chaveado por versão, rota e parâmetros"""
+
+    def __init__(self, tamanho_maximo: int = TAMANHO_CACHE_RESPOSTAS):
+        self.tamanho_maximo = tamanho_maximo
+        self._respostas: OrderedDict = OrderedDict()
+        self._trava = threading.Lock()
+        self._versao_df: Optional[str] = None
+        self._df: Optional[pd.DataFrame] = None
+
+    def dados(self) -> Tuple[str, pd.DataFrame]:
+        """
+        Versão atual e DataFrame correspondente, recarregando se o arquivo mudou
+
+        Returns:
+            Tupla (versao, df)
+        """
+        versao = obter_versao_dados()
+        with self._trava:
+            if versao != self._versao_df:
+                self._df = load_forestfires(CSV_PATH, versao)
+                self._versao_df = versao
+                self._respostas.clear()
+            return versao, self._df
+
+    def obter(self, chave: Tuple) -> Optional[Dict]:
+        with self._trava:
+            resposta = self._respostas.get(chave)
+            if resposta is not None:
+                self._respostas.move_to_end(chave)
+            return resposta
+
+    def guardar(self, chave: Tuple, resposta: Dict) -> None:
+        with self._trava:
+            self._respostas[chave] = resposta
+            self._respostas.move_to_end(chave)
+            while len(self._respostas) > self.tamanho_maximo:
+                self._respostas.popitem(last=False)
+
+
+def calcular_etag(versao: str, rota: str, parametros: Dict) -> str:
+    """
+    ETag de uma resposta, derivado só da versão dos dados e da requisição
+
+    Args:
+        versao: Versão dos dados (ver obter_versao_dados)
+        rota: Caminho da rota
+        parametros: Parâmetros já normalizados da rota
+
+    Returns:
+        ETag forte entre aspas
+    """
+    chave = json.dumps([versao, rota, sorted(parametros.items())])
+    return '"' + hashlib.sha1(chave.encode('utf-8')).hexdigest()[:20] + '"'
+
+
+def montar_resposta(rota: str, parametros: Dict, versao: str, df: pd.DataFrame) -> Dict:
+    """
+    Calcula o corpo de uma rota e as versões sem compressão e gzip
+
+    Returns:
+        Dicionário com 'corpo', 'corpo_gzip' (None se pequeno demais) e 'etag'
+    """
+    dados = ROTAS[rota](df, versao, parametros)
+    corpo = json.dumps(
+        {'versao': versao, 'parametros': parametros, 'dados': dados},
+        ensure_ascii=False, default=_valor_json
+    ).encode('utf-8')
+
+    return {
+        'corpo': corpo,
+        'corpo_gzip': gzip.compress(corpo, compresslevel=6) if len(corpo) >= TAMANHO_MINIMO_GZIP else None,
+        'etag': calcular_etag(versao, rota, parametros)
+    }
+
+
+class ManipuladorAPI(BaseHTTPRequestHandler):
+    """Manipulador HTTP das rotas da API"""
+
+    cache: CacheRespostas = CacheRespostas()
+    server_version = "ds-mpes-api"
+
+    def log_message(self, formato: str, *args) -> None:
+        logger.debug("%s - %s", self.address_string(), formato % args)
+
+    def _enviar(self, status: int, corpo: bytes = b'', cabecalhos: Optional[Dict] = None) -> None:
+        self.send_response(status)
+        for nome, valor in (cabecalhos or {}).items():
+            self.send_header(nome, valor)
+        self.send_header('Content-Length', str(len(corpo)))
+        self.end_headers()
+        if corpo and self.command != 'HEAD':
+            self.wfile.write(corpo)
+
+    def _enviar_erro(self, status: int, mensagem: str) -> None:
+        corpo = json.dumps({'erro': mensagem}, ensure_ascii=False).encode('utf-8')
+        self._enviar(status, corpo, {'Content-Type': 'application/json; charset=utf-8'})
+
+    def do_GET(self) -> None:
+        url = urlsplit(self.path)
+        rota = url.path.rstrip('/') or '/'
+
+        try:
+            versao, df = self.cache.dados()
+        except OSError as erro:
+            self._enviar_erro(503, f"Dados indisponíveis: {erro}")
+            return
+
+        if rota == '/':
+            indice = {'versao': versao, 'rotas': sorted(ROTAS), 'criterios': sorted(CRITERIOS_API)}
+            self._enviar(200, json.dumps(indice).encode('utf-8'),
+                         {'Content-Type': 'application/json; charset=utf-8'})
+            return
+
+        if rota == '/exportar':
+            self._exportar(versao, df, _parametros(url.query))
+            return
+
+        if rota not in ROTAS:
+            self._enviar_erro(404, f"Rota inexistente: {rota}")
+            return
+
+        todos = _parametros(url.query)
+        parametros = {p: todos[p] for p in PARAMETROS_ROTAS[rota] if todos.get(p)}
+        etag = calcular_etag(versao, rota, parametros)
+        cabecalhos = {
+            'ETag': etag,
+            'Cache-Control': 'no-cache',
+            'Vary': 'Accept-Encoding'
+        }
+
+        # Revalidação condicional: não precisa nem consultar o cache
+        if_none_match = self.headers.get('If-None-Match', '')
+        if etag in [t.strip() for t in if_none_match.split(',')] or if_none_match.strip() == '*':
+            self._enviar(304, cabecalhos=cabecalhos)
+            return
+
+        chave = (versao, rota, tuple(sorted(parametros.items())))
+        resposta = self.cache.obter(chave)
+        if resposta is None:
+            try:
+                resposta = montar_resposta(rota, parametros, versao, df)
+            except ErroRequisicao as erro:
+                self._enviar_erro(400, str(erro))
+                return
+            self.cache.guardar(chave, resposta)
+
+        cabecalhos['Content-Type'] = 'application/json; charset=utf-8'
+        aceita_gzip = 'gzip' in self.headers.get('Accept-Encoding', '')
+        if aceita_gzip and resposta['corpo_gzip'] is not None:
+            cabecalhos['Content-Encoding'] = 'gzip'
+            self._enviar(200, resposta['corpo_gzip'], cabecalhos)
+        else:
+            self._enviar(200, resposta['corpo'], cabecalhos)
+
+    def _exportar(self, versao: str, df: pd.DataFrame, parametros: Dict) -> None:
+        """Transmite a exportação bloco a bloco, sem montar o arquivo em memória"""
+        formato = parametros.get('formato', 'csv')
+        compressao = parametros.get('compressao') or COMPRESSOES_EXPORTACAO.get(formato, [None])[0]
+        try:
+            validar_exportacao(formato, compressao)
+            meses = _ler_meses(parametros['mes']) if parametros.get('mes') else None
+            celulas = None
+            if 'x' in parametros or 'y' in parametros:
+                if not ('x' in parametros and 'y' in parametros):
+                    raise ErroRequisicao("Informe x e y da célula")
+                try:
+                    celulas = [(int(parametros['x']), int(parametros['y']))]
+                except ValueError:
+                    raise ErroRequisicao(f"Célula inválida: ({parametros['x']}, {parametros['y']})")
+        except ValueError as erro:
+            self._enviar_erro(400, str(erro))
+            return
+
+        chave = {k: v for k, v in parametros.items() if k in ('formato', 'compressao', 'mes', 'x', 'y')}
+        etag = calcular_etag(versao, '/exportar', chave)
+        if etag in [t.strip() for t in self.headers.get('If-None-Match', '').split(',')]:
+            self._enviar(304, cabecalhos={'ETag': etag})
+            return
+
+        nome = 'incendios' + extensao_exportacao(formato, compressao)
+        self.send_response(200)
+        self.send_header('Content-Type', TIPOS_MIME[(formato, compressao)])
+        self.send_header('Content-Disposition', f'attachment; filename="{nome}"')
+        self.send_header('ETag', etag)
+        # Sem Content-Length: o fim da resposta é o fechamento da conexão
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        if self.command == 'HEAD':
+            return
+
+        for dados in gerar_exportacao(df, formato, compressao, meses=meses, celulas=celulas):
+            self.wfile.write(dados)
+
+    do_HEAD = do_GET
+
+
+def criar_servidor(host: str = '127.0.0.1', porta: int = 8765) -> ThreadingHTTPServer:
+    """
+    Cria o servidor HTTP da API (sem iniciá-lo)
+
+    Args:
+        host: Endereço de escuta
+        porta: Porta de escuta (0 = porta livre escolhida pelo sistema)
+
+    Returns:
+        Servidor pronto para serve_forever()
+    """
+    return ThreadingHTTPServer((host, porta), ManipuladorAPI)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="API JSON local com os agregados do dashboard")
+    parser.add_argument('--host', default='127.0.0.1', help="Endereço de escuta")
+    parser.add_argument('--porta', type=int, default=8765, help="Porta de escuta")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(levelname)s %(message)s")
+
+    servidor = criar_servidor(args.host, args.porta)
+    logger.info("API disponível em http://%s:%d/", *servidor.server_address[:2])
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,130 @@
+"""
+Pré-aquecimento dos caches do dashboard
+
+Calcula em segundo plano os dados, KPIs, agregados e gráficos padrão de
+todas as páginas, para que o primeiro analista não espere pelo cálculo.
+O estado fica disponível por aquecimento_concluido/status_aquecimento.
+"""
+
+import logging
+import threading
+import time
+from typing import Dict, Optional
+
+from streamlit import runtime
+
+from src.utils import (
+    calcular_densidade_kde, construir_indice_similaridade, VARIAVEIS_SIMILARIDADE, LARGURA_BANDA_PADRAO
+)
+from src.correlacao import calcular_significancia_correlacoes, CORRELATION_VARS
+from src.graficos import gerar_graficos_resumo
+from src.simulacao import simular_mapa_queima, ignicao_padrao
+from src.particoes import carregar_dados_padrao, obter_agregados, obter_acumulador, obter_piramide
+from src.fontes import iniciar_carregamento
+
+
+logger = logging.getLogger(__name__)
+
+_pronto = threading.Event()
+_trava = threading.Lock()
+_thread: Optional[threading.Thread] = None
+_estado: Dict = {'inicio': None, 'duracao_s': None, 'erro': None}
+
+
+def aquecer_caches() -> float:
+    """
+    Executa os cálculos padrão de todas as páginas, populando os caches
+
+    Os argumentos são os mesmos usados pelas páginas com os widgets nos
+    valores iniciais, para que as chaves de cache coincidam.
+
+    Returns:
+        Duração do aquecimento em segundos
+    """
+    inicio = time.perf_counter()
+
+    # Fontes complementares em paralelo com os cálculos abaixo
+    iniciar_carregamento()
+
+    df, versao, selecao = carregar_dados_padrao()
+    if df.empty:
+        # Sem registros não há o que aquecer; as páginas mostram o aviso
+        return time.perf_counter() - inicio
+
+    # Resumo (app.py)
+    gerar_graficos_resumo(obter_agregados(df, versao, selecao), versao)
+    obter_piramide(df, versao, selecao)
+
+    # Contexto
+    calcular_significancia_correlacoes(df, versao, tuple(CORRELATION_VARS), 'pearson', 5000)
+    obter_acumulador(versao, selecao)
+
+    # Perguntas
+    calcular_densidade_kde(df, versao, LARGURA_BANDA_PADRAO)
+
+    # Ferramentas
+    construir_indice_similaridade(df, versao, {var: 1.0 for var in VARIAVEIS_SIMILARIDADE})
+    simular_mapa_queima(df, versao, ignicao_padrao(df), 10000)
+
+    return time.perf_counter() - inicio
+
+
+def _executar(aguardar_runtime: bool) -> None:
+    """Corpo da thread de aquecimento"""
+    try:
+        # Os caches do Streamlit só são compartilhados com as sessões depois
+        # que o runtime do servidor existe
+        while aguardar_runtime and not runtime.exists():
+            time.sleep(0.1)
+
+        _estado['inicio'] = time.time()
+        logger.info("Aquecimento de cache iniciado")
+        _estado['duracao_s'] = aquecer_caches()
+        logger.info("Aquecimento de cache concluído em %.2f s", _estado['duracao_s'])
+    except Exception as erro:
+        _estado['erro'] = repr(erro)
+        logger.exception("Falha no aquecimento de cache")
+    finally:
+        _pronto.set()
+
+
+def iniciar_aquecimento(aguardar_runtime: bool = False) -> threading.Event:
+    """
+    Inicia o aquecimento numa thread em segundo plano (apenas uma vez por processo)
+
+    Args:
+        aguardar_runtime: Esperar o runtime do servidor Streamlit existir antes de
+            começar (usado quando o aquecimento é iniciado antes do servidor)
+
+    Returns:
+        Evento de prontidão, sinalizado ao fim do aquecimento (com ou sem erro)
+    """
+    global _thread
+    with _trava:
+        if _thread is None:
+            _thread = threading.Thread(
+                target=_executar, args=(aguardar_runtime,),
+                name="aquecimento-cache", daemon=True
+            )
+            _thread.start()
+    return _pronto
+
+
+def aquecimento_concluido() -> bool:
+    """Indica se o aquecimento terminou"""
+    return _pronto.is_set()
+
+
+def status_aquecimento() -> Dict:
+    """
+    Estado atual do aquecimento
+
+    Returns:
+        Dicionário com 'iniciado', 'concluido', 'duracao_s' e 'erro'
+    """
+    return {
+        'iniciado': _thread is not None,
+        'concluido': _pronto.is_set(),
+        'duracao_s': _estado['duracao_s'],
+        'erro': _estado['erro']
+    }
@@ -0,0 +1,284 @@
+"""
+Correlações entre índices FWI, variáveis meteorológicas e área queimada
+
+Inclui o teste de permutação para significância das correlações, executado
+em lotes de produtos matriciais e distribuído num pool de processos, e um
+acumulador incremental de covariância alimentado bloco a bloco.
+"""
+
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from functools import reduce
+from typing import Dict, Iterable, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from src.utils import load_forestfires, calcular_hashes, CSV_PATH, MAX_ENTRADAS_CACHE
+from src.memoria import medir_recurso
+
+
+# Variáveis exibidas na matriz de correlação
+CORRELATION_VARS = ['ffmc', 'dmc', 'dc', 'isi', 'temp', 'rh', 'wind', 'rain', 'area']
+
+# Número de permutações por tarefa enviada ao pool de processos
+PERMUTACOES_POR_LOTE = 1000
+
+# Máximo de elementos da matriz permutada (B, n, p) mantida de uma vez (~256 MB em float64)
+ELEMENTOS_POR_SUBLOTE = 32 * 1024 * 1024
+
+# Último acumulador do CSV: registros cobertos e hash do último deles
+_ultimo_acumulador: Dict = {}
+_trava_acumulador = threading.Lock()
+
+
+def _padronizar(valores: np.ndarray) -> np.ndarray:
+    """
+    Centraliza e escala as colunas para que Z.T @ Z / n seja a matriz de correlação
+
+    Args:
+        valores: Matriz (n, p) de observações
+
+    Returns:
+        Matriz (n, p) padronizada (colunas constantes ficam zeradas)
+    """
+    centrado = valores - valores.mean(axis=0)
+    desvio = centrado.std(axis=0)
+    desvio[desvio == 0] = np.inf
+    return centrado / desvio
+
+
+def _contar_extremos_lote(z: np.ndarray, corr_abs: np.ndarray, n_permutacoes: int,
+                          seed: np.random.SeedSequence) -> np.ndarray:
+    """
+    Conta, para cada par, as permutações com |r| pelo menos tão extremo quanto o observado
+
+    As permutações do lote são aplicadas às linhas de Z de uma só vez e as
+    correlações nulas de todos os pares saem de um único matmul em lote.
+    Com muitas linhas, o lote é dividido em sublotes para limitar a memória.
+
+    Args:
+        z: Matriz (n, p) padronizada
+        corr_abs: Matriz (p, p) com |r| observado
+        n_permutacoes: Número de permutações do lote
+        seed: Semente do gerador aleatório do lote
+
+    Returns:
+        Matriz (p, p) com as contagens
+    """
+    rng = np.random.default_rng(seed)
+    n, p = z.shape
+    por_sublote = max(1, ELEMENTOS_POR_SUBLOTE // (n * p))
+
+    contagem = np.zeros((p, p), dtype=np.int64)
+    for inicio in range(0, n_permutacoes, por_sublote):
+        tamanho = min(por_sublote, n_permutacoes - inicio)
+        indices = rng.permuted(np.broadcast_to(np.arange(n), (tamanho, n)), axis=1)
+        # (p, n) @ (B, n, p) -> (B, p, p): corr(Z_i, Z_j permutada) para todos os pares
+        corr_nula = np.matmul(z.T, z[indices]) / n
+        # Tolerância para empates numéricos com o valor observado
+        contagem += (np.abs(corr_nula) >= corr_abs - 1e-12).sum(axis=0)
+    return contagem
+
+
+def teste_permutacao_correlacoes(valores: np.ndarray, n_permutacoes: int = 5000,
+                                 seed: Optional[int] = None,
+                                 n_processos: Optional[int] = None) -> Dict:
+    """
+    Calcula correlações e p-valores bilaterais por teste de permutação
+
+    Args:
+        valores: Matriz (n, p) de observações (já transformada em postos para Spearman)
+        n_permutacoes: Número total de permutações
+        seed: Semente para reprodutibilidade
+        n_processos: Número de processos (None = CPUs disponíveis, 1 = sem pool)
+
+    Returns:
+        Dicionário com matrizes (p, p) 'correlacao' e 'p_valor'
+    """
+    z = _padronizar(np.asarray(valores, dtype=float))
+    corr = z.T @ z / z.shape[0]
+    corr_abs = np.abs(corr)
+
+    n_lotes = max(1, int(np.ceil(n_permutacoes / PERMUTACOES_POR_LOTE)))
+    tamanhos = [len(lote) for lote in np.array_split(np.arange(n_permutacoes), n_lotes)]
+    seeds = np.random.SeedSequence(seed).spawn(n_lotes)
+
+    if n_processos is None:
+        n_processos = min(os.cpu_count() or 1, n_lotes)
+
+    if n_processos <= 1:
+        contagens = [
+            _contar_extremos_lote(z, corr_abs, tamanho, s)
+            for tamanho, s in zip(tamanhos, seeds)
+        ]
+    else:
+        with ProcessPoolExecutor(max_workers=n_processos) as executor:
+            contagens = list(executor.map(
+                _contar_extremos_lote,
+                [z] * n_lotes, [corr_abs] * n_lotes, tamanhos, seeds
+            ))
+
+    p_valor = (np.sum(contagens, axis=0) + 1) / (n_permutacoes + 1)
+    np.fill_diagonal(p_valor, 0.0)
+
+    return {'correlacao': corr, 'p_valor': p_valor}
+
+
+@st.cache_data(max_entries=MAX_ENTRADAS_CACHE)
+def calcular_significancia_correlacoes(_df: pd.DataFrame, versao: str,
+                                       variaveis: Sequence[str] = tuple(CORRELATION_VARS),
+                                       metodo: str = 'pearson', n_permutacoes: int = 5000,
+                                       seed: int = 42) -> Dict:
+    """
+    Matriz de correlação com p-valores de permutação, em cache por versão dos dados
+
+    Args:
+        _df: DataFrame com dados de incêndios (não entra na chave do cache)
+        versao: Versão dos dados (ver obter_versao_dados)
+        variaveis: Colunas incluídas na matriz
+        metodo: 'pearson' ou 'spearman'
+        n_permutacoes: Número total de permutações
+        seed: Semente para reprodutibilidade
+
+    Returns:
+        Dicionário com DataFrames 'correlacao' e 'p_valor' indexados pelas variáveis
+    """
+    variaveis = list(variaveis)
+    dados = _df[variaveis]
+    if metodo == 'spearman':
+        dados = dados.rank()
+    elif metodo != 'pearson':
+        raise ValueError(f"Método de correlação desconhecido: {metodo}")
+
+    resultado = teste_permutacao_correlacoes(dados.to_numpy(dtype=float), n_permutacoes, seed)
+
+    return {
+        chave: pd.DataFrame(matriz, index=variaveis, columns=variaveis)
+        for chave, matriz in resultado.items()
+    }
+
+
+class AcumuladorCovariancia:
+    """
+    Acumulador incremental de médias e co-momentos (Welford/Chan)
+
+    Mantém apenas n, o vetor de médias e a matriz de co-momentos centrados,
+    de modo que a covariância e a correlação podem ser obtidas sem as linhas
+    originais. Acumuladores de shards diferentes podem ser combinados.
+    """
+
+    def __init__(self, variaveis: Sequence[str] = tuple(CORRELATION_VARS)):
+        self.variaveis = list(variaveis)
+        p = len(self.variaveis)
+        self.n = 0
+        self.media = np.zeros(p)
+        self.comomentos = np.zeros((p, p))
+
+    def _combinar_estatisticas(self, n: int, media: np.ndarray, comomentos: np.ndarray) -> None:
+        """Incorpora estatísticas (n, média, co-momentos) de outra partição (fórmula de Chan)"""
+        if n == 0:
+            return
+        total = self.n + n
+        delta = media - self.media
+        self.comomentos += comomentos + np.outer(delta, delta) * (self.n * n / total)
+        self.media += delta * (n / total)
+        self.n = total
+
+    def atualizar(self, bloco: pd.DataFrame) -> 'AcumuladorCovariancia':
+        """
+        Incorpora um bloco de registros
+
+        Args:
+            bloco: DataFrame com as colunas do acumulador
+
+        Returns:
+            O próprio acumulador, para encadeamento
+        """
+        valores = bloco[self.variaveis].to_numpy(dtype=float)
+        if len(valores):
+            media = valores.mean(axis=0)
+            centrado = valores - media
+            self._combinar_estatisticas(len(valores), media, centrado.T @ centrado)
+        return self
+
+    def combinar(self, outro: 'AcumuladorCovariancia') -> 'AcumuladorCovariancia':
+        """
+        Combina com o acumulador de outro shard, sem alterar os originais
+
+        Args:
+            outro: Acumulador com as mesmas variáveis
+
+        Returns:
+            Novo acumulador equivalente à união dos dois shards
+        """
+        if outro.variaveis != self.variaveis:
+            raise ValueError("Acumuladores com variáveis diferentes não podem ser combinados")
+        resultado = AcumuladorCovariancia(self.variaveis)
+        resultado._combinar_estatisticas(self.n, self.media, self.comomentos)
+        resultado._combinar_estatisticas(outro.n, outro.media, outro.comomentos)
+        return resultado
+
+    def covariancia(self, ddof: int = 1) -> pd.DataFrame:
+        """Matriz de covariância amostral"""
+        return pd.DataFrame(self.comomentos / max(self.n - ddof, 1),
+                            index=self.variaveis, columns=self.variaveis)
+
+    def correlacao(self) -> pd.DataFrame:
+        """Matriz de correlação de Pearson"""
+        desvio = np.sqrt(np.diag(self.comomentos))
+        desvio[desvio == 0] = np.inf
+        corr = self.comomentos / np.outer(desvio, desvio)
+        np.fill_diagonal(corr, 1.0)
+        return pd.DataFrame(corr, index=self.variaveis, columns=self.variaveis)
+
+
+def combinar_acumuladores(acumuladores: Iterable[AcumuladorCovariancia]) -> AcumuladorCovariancia:
+    """
+    Combina os acumuladores parciais de vários shards
+
+    Args:
+        acumuladores: Acumuladores com as mesmas variáveis
+
+    Returns:
+        Acumulador equivalente à união de todos os shards
+    """
+    return reduce(AcumuladorCovariancia.combinar, acumuladores)
+
+
+@st.cache_resource(max_entries=MAX_ENTRADAS_CACHE)
+@medir_recurso
+def obter_acumulador_correlacao(versao: str) -> AcumuladorCovariancia:
+    """
+    Acumulador de covariância dos dados, mantido incrementalmente entre versões
+
+    Usa o DataFrame já carregado por load_forestfires, sem reler o arquivo.
+    Quando a nova versão apenas acrescenta registros à anterior (ingestão
+    por anexação), só os registros novos são acumulados e combinados com o
+    acumulador anterior; a passagem completa fica para a carga inicial ou
+    quando o arquivo foi reescrito.
+
+    Args:
+        versao: Versão dos dados (ver obter_versao_dados)
+
+    Returns:
+        Acumulador com as variáveis de CORRELATION_VARS
+    """
+    df = load_forestfires(CSV_PATH, versao)
+    with _trava_acumulador:
+        cobertos = _ultimo_acumulador.get('registros', 0)
+        anexado = (0 < cobertos <= len(df)
+                   and calcular_hashes(df.iloc[cobertos - 1:cobertos])[0] == _ultimo_acumulador['hash'])
+        if anexado:
+            novos = df.iloc[cobertos:]
+            acumulador = _ultimo_acumulador['acumulador']
+            if len(novos):
+                acumulador = combinar_acumuladores([acumulador, AcumuladorCovariancia().atualizar(novos)])
+        else:
+            acumulador = AcumuladorCovariancia().atualizar(df)
+        if len(df):
+            _ultimo_acumulador.update(acumulador=acumulador, registros=len(df),
+                                      hash=calcular_hashes(df.iloc[-1:])[0])
+    return acumulador
@@ -0,0 +1,130 @@
+"""
+Diagnóstico do que cada página envia ao navegador
+
+As páginas exibem os gráficos por exibir_grafico, que compacta a figura
+e registra o tamanho do payload, e as tabelas por exibir_tabela, que as
+entrega ao st.dataframe já como tabelas Arrow. O tempo de serialização de
+cada elemento é registrado. Ao fim da página, exibir_diagnostico mostra os
+tamanhos e tempos na barra lateral e avisa quando o total passa do
+orçamento por página. Os totais ficam em st.session_state para que o
+benchmark de latência (benchmarks.latencia_sessoes) possa verificar o
+orçamento sem navegador.
+"""
+
+import logging
+import time
+from typing import Dict, Union
+
+import pandas as pd
+import plotly.graph_objects as go
+import pyarrow as pa
+import streamlit as st
+
+from src.graficos import compactar_figura, tamanho_payload
+
+
+logger = logging.getLogger(__name__)
+
+# Orçamento de bytes de gráficos enviados por rerun de uma página
+ORCAMENTO_PAGINA_BYTES = 512 * 1024
+
+# Chaves em st.session_state
+CHAVE_GRAFICOS = 'payload_graficos'
+CHAVE_SERIALIZACAO = 'serializacao_elementos'
+CHAVE_PAGINAS = 'payload_paginas'
+CHAVE_ULTIMA_PAGINA = 'payload_ultima_pagina'
+
+
+def _registrar_serializacao(nome: str, inicio: float) -> None:
+    """Registra o tempo de serialização de um elemento desde 'inicio'"""
+    st.session_state.setdefault(CHAVE_SERIALIZACAO, {})[nome] = time.perf_counter() - inicio
+
+
+def exibir_grafico(fig: go.Figure, nome: str, casas_decimais: int = 2) -> int:
+    """
+    Compacta, contabiliza e exibe uma figura com st.plotly_chart
+
+    Args:
+        fig: Figura Plotly
+        nome: Nome do gráfico no diagnóstico (único na página)
+        casas_decimais: Casas decimais exibidas nos rótulos e hovers
+
+    Returns:
+        Tamanho do payload da figura em bytes
+    """
+    compactar_figura(fig, casas_decimais)
+    tamanho = tamanho_payload(fig)
+    st.session_state.setdefault(CHAVE_GRAFICOS, {})[nome] = tamanho
+
+    inicio = time.perf_counter()
+    st.plotly_chart(fig, use_container_width=True)
+    _registrar_serializacao(nome, inicio)
+    return tamanho
+
+
+def exibir_tabela(dados: Union[pd.DataFrame, pa.Table], nome: str, **kwargs) -> None:
+    """
+    Exibe uma tabela com st.dataframe, entregando-a como tabela Arrow
+
+    Um DataFrame é convertido uma vez com pa.Table.from_pandas: colunas
+    NumPy e de texto Arrow (TIPO_TEXTO) passam sem montar objetos Python, e
+    o st.dataframe só escreve os buffers no formato IPC, sem a conversão e
+    a verificação de tipos que faz com DataFrames. Tabelas com colunas de
+    tipos mistos, que o Arrow não converte, seguem como DataFrame. Tabelas
+    formatadas (src.tabelas) chegam com colunas de texto Arrow.
+
+    Args:
+        dados: DataFrame ou tabela Arrow
+        nome: Nome da tabela no diagnóstico (único na página)
+        **kwargs: Argumentos de st.dataframe (ex: hide_index)
+    """
+    inicio = time.perf_counter()
+    if isinstance(dados, pd.DataFrame):
+        try:
+            # Índice oculto não é enviado; os demais vão como colunas de índice
+            dados = pa.Table.from_pandas(dados, preserve_index=False if kwargs.get('hide_index') else None)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            logger.debug("Tabela %s com tipos mistos; enviada como DataFrame", nome)
+    st.dataframe(dados, **kwargs)
+    _registrar_serializacao(nome, inicio)
+
+
+def exibir_diagnostico(pagina: str) -> Dict:
+    """
+    Fecha a contabilidade da página e exibe o diagnóstico na barra lateral
+
+    Deve ser chamada ao fim do script da página, depois de todos os gráficos.
+
+    Args:
+        pagina: Nome da página
+
+    Returns:
+        Dicionário com 'graficos' (bytes por gráfico), 'total', 'orcamento',
+        'serializacao' (segundos por gráfico ou tabela) e 'serializacao_s'
+    """
+    graficos = st.session_state.pop(CHAVE_GRAFICOS, {})
+    serializacao = st.session_state.pop(CHAVE_SERIALIZACAO, {})
+    total = sum(graficos.values())
+    resumo = {'graficos': graficos, 'total': total, 'orcamento': ORCAMENTO_PAGINA_BYTES,
+              'serializacao': serializacao, 'serializacao_s': sum(serializacao.values())}
+    st.session_state.setdefault(CHAVE_PAGINAS, {})[pagina] = resumo
+    st.session_state[CHAVE_ULTIMA_PAGINA] = pagina
+
+    with st.sidebar:
+        if total > ORCAMENTO_PAGINA_BYTES:
+            logger.warning("Página %s enviou %d bytes de gráficos (orçamento: %d)",
+                           pagina, total, ORCAMENTO_PAGINA_BYTES)
+            st.warning(f"Gráficos acima do orçamento: {total / 1024:.0f} KB "
+                       f"de {ORCAMENTO_PAGINA_BYTES / 1024:.0f} KB")
+
+        with st.expander("📦 Payload dos gráficos"):
+            st.caption(f"Total: {total / 1024:.1f} KB de {ORCAMENTO_PAGINA_BYTES / 1024:.0f} KB · "
+                       f"serialização de gráficos e tabelas: {resumo['serializacao_s'] * 1000:.0f} ms")
+            if graficos:
+                tabela = pd.DataFrame({
+                    'Gráfico': list(graficos),
+                    'KB': [tamanho / 1024 for tamanho in graficos.values()]
+                })
+                st.dataframe(tabela.round(1), hide_index=True, use_container_width=True)
+
+    return resumo
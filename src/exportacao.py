@@ -0,0 +1,246 @@
+"""
+Exportação em blocos dos registros de incêndios (CSV ou Parquet)
+
+Os registros selecionados são filtrados e serializados bloco a bloco, e
+os bytes de cada bloco são entregues assim que ficam prontos. Nem o
+recorte filtrado nem o arquivo completo são montados em memória: o uso de
+memória depende só do tamanho do bloco.
+
+gerar_exportacao produz os bytes como um iterador (usado pela rota
+/exportar da API, que os transmite direto ao cliente), salvar_exportacao
+grava num arquivo e exibir_exportacao monta o botão de download das páginas.
+"""
+
+import io
+import zlib
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+import streamlit as st
+
+
+# Compressões aceitas por formato (a primeira é a padrão)
+COMPRESSOES_EXPORTACAO = {
+    'csv': [None, 'gzip'],
+    'parquet': ['snappy', 'zstd', 'gzip']
+}
+
+TIPOS_MIME = {
+    ('csv', None): 'text/csv',
+    ('csv', 'gzip'): 'application/gzip',
+    ('parquet', 'snappy'): 'application/vnd.apache.parquet',
+    ('parquet', 'zstd'): 'application/vnd.apache.parquet',
+    ('parquet', 'gzip'): 'application/vnd.apache.parquet'
+}
+
+TAMANHO_BLOCO_EXPORTACAO = 50_000
+
+# Nível 3 comprime quase tanto quanto o 6 em ~1/3 do tempo nestes dados
+NIVEL_GZIP = 3
+
+
+class _BufferDrenavel:
+    """Destino de escrita cujos bytes acumulados podem ser retirados a cada bloco"""
+
+    def __init__(self):
+        self._partes: List[bytes] = []
+        self._posicao = 0
+        self.closed = False
+
+    def write(self, dados) -> int:
+        dados = bytes(dados)
+        self._partes.append(dados)
+        self._posicao += len(dados)
+        return len(dados)
+
+    def tell(self) -> int:
+        return self._posicao
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drenar(self) -> bytes:
+        dados = b''.join(self._partes)
+        self._partes.clear()
+        return dados
+
+
+def extensao_exportacao(formato: str, compressao: Optional[str]) -> str:
+    """Extensão do arquivo exportado (ex: '.csv.gz', '.parquet')"""
+    if formato == 'csv':
+        return '.csv.gz' if compressao == 'gzip' else '.csv'
+    return '.parquet'
+
+
+def validar_exportacao(formato: str, compressao: Optional[str]) -> None:
+    """
+    Verifica se o formato e a compressão são suportados
+
+    Raises:
+        ValueError: Formato ou compressão inválidos
+    """
+    if formato not in COMPRESSOES_EXPORTACAO:
+        raise ValueError(f"Formato inválido: {formato} (opções: {', '.join(COMPRESSOES_EXPORTACAO)})")
+    if compressao not in COMPRESSOES_EXPORTACAO[formato]:
+        opcoes = ', '.join(str(c) for c in COMPRESSOES_EXPORTACAO[formato])
+        raise ValueError(f"Compressão inválida para {formato}: {compressao} (opções: {opcoes})")
+
+
+def filtrar_bloco(bloco: pd.DataFrame, meses: Optional[Sequence[str]] = None,
+                  celulas: Optional[Sequence[Tuple[int, int]]] = None) -> pd.DataFrame:
+    """
+    Seleciona as linhas de um bloco por mês e/ou célula (X, Y)
+
+    Args:
+        bloco: Bloco de registros de incêndios
+        meses: Meses a manter (None = todos)
+        celulas: Células (X, Y) a manter (None = todas)
+
+    Returns:
+        Linhas selecionadas do bloco
+    """
+    mascara = pd.Series(True, index=bloco.index)
+    if meses is not None:
+        mascara &= bloco['month'].isin(meses)
+    if celulas is not None:
+        codigos = pd.Index([x * 1000 + y for x, y in celulas])
+        mascara &= (bloco['x'] * 1000 + bloco['y']).isin(codigos)
+    return bloco[mascara]
+
+
+def gerar_exportacao(df: pd.DataFrame, formato: str = 'csv', compressao: Optional[str] = None,
+                     meses: Optional[Sequence[str]] = None,
+                     celulas: Optional[Sequence[Tuple[int, int]]] = None,
+                     tamanho_bloco: int = TAMANHO_BLOCO_EXPORTACAO) -> Iterator[bytes]:
+    """
+    Serializa os registros selecionados em blocos, entregando os bytes de cada um
+
+    Args:
+        df: DataFrame com dados de incêndios (ex: retornado por load_forestfires)
+        formato: 'csv' ou 'parquet'
+        compressao: Ver COMPRESSOES_EXPORTACAO
+        meses: Meses a exportar (None = todos)
+        celulas: Células (X, Y) a exportar (None = todas)
+        tamanho_bloco: Linhas do DataFrame processadas por bloco
+
+    Yields:
+        Bytes do arquivo exportado, na ordem
+    """
+    validar_exportacao(formato, compressao)
+
+    buffer = _BufferDrenavel()
+    schema = pa.Schema.from_pandas(df.iloc[:0], preserve_index=False)
+    # gzip aplicado a cada bloco já serializado (wbits=31: cabeçalho gzip)
+    compressor = zlib.compressobj(NIVEL_GZIP, zlib.DEFLATED, 31) if compressao == 'gzip' else None
+
+    if formato == 'csv':
+        buffer.write((','.join(df.columns) + '\n').encode('utf-8'))
+        opcoes = pa_csv.WriteOptions(include_header=False, quoting_style='none')
+
+        def escrever(tabela: pa.Table) -> None:
+            pa_csv.write_csv(tabela, buffer, opcoes)
+
+        def fechar() -> None:
+            pass
+    else:
+        escritor = pq.ParquetWriter(buffer, schema, compression=compressao)
+        escrever = escritor.write_table
+        fechar = escritor.close
+
+    def drenar() -> bytes:
+        dados = buffer.drenar()
+        return compressor.compress(dados) if compressor is not None and formato == 'csv' else dados
+
+    for inicio in range(0, len(df), tamanho_bloco):
+        bloco = filtrar_bloco(df.iloc[inicio:inicio + tamanho_bloco], meses, celulas)
+        if len(bloco):
+            escrever(pa.Table.from_pandas(bloco, schema=schema, preserve_index=False))
+        dados = drenar()
+        if dados:
+            yield dados
+
+    fechar()
+    dados = drenar()
+    if compressor is not None and formato == 'csv':
+        dados += compressor.flush()
+    if dados:
+        yield dados
+
+
+def salvar_exportacao(caminho: Path, df: pd.DataFrame, formato: str = 'csv',
+                      compressao: Optional[str] = None, **filtros) -> Path:
+    """
+    Grava a exportação em um arquivo, bloco a bloco
+
+    Args:
+        caminho: Arquivo de saída
+        df: DataFrame com dados de incêndios
+        formato: 'csv' ou 'parquet'
+        compressao: Ver COMPRESSOES_EXPORTACAO
+        **filtros: meses, celulas e tamanho_bloco (ver gerar_exportacao)
+
+    Returns:
+        Caminho do arquivo gerado
+    """
+    caminho = Path(caminho)
+    with open(caminho, 'wb') as arquivo:
+        for dados in gerar_exportacao(df, formato, compressao, **filtros):
+            arquivo.write(dados)
+    return caminho
+
+
+def _preparar_download(df: pd.DataFrame, formato: str, compressao: Optional[str],
+                       filtros: Dict) -> Callable:
+    """Função chamada pelo botão de download só quando o analista clica"""
+    def gerar() -> io.BytesIO:
+        arquivo = io.BytesIO()
+        for dados in gerar_exportacao(df, formato, compressao, **filtros):
+            arquivo.write(dados)
+        return arquivo
+    return gerar
+
+
+def exibir_exportacao(df: pd.DataFrame, chave: str, nome_arquivo: str,
+                      meses: Optional[Sequence[str]] = None,
+                      celulas: Optional[Sequence[Tuple[int, int]]] = None) -> None:
+    """
+    Exibe as opções de formato e o botão de download dos registros selecionados
+
+    O arquivo só é gerado quando o botão é clicado, nunca a cada rerun. O
+    Streamlit guarda o arquivo pronto em memória para o download; para
+    exportações muito grandes, use a rota /exportar da API, que transmite
+    os blocos direto ao cliente.
+
+    Args:
+        df: DataFrame com dados de incêndios
+        chave: Prefixo das chaves dos widgets (único na página)
+        nome_arquivo: Nome do arquivo sem extensão
+        meses: Meses a exportar (None = todos)
+        celulas: Células (X, Y) a exportar (None = todas)
+    """
+    col1, col2, col3 = st.columns([1, 1, 2])
+
+    with col1:
+        formato = st.radio("Formato:", list(COMPRESSOES_EXPORTACAO), horizontal=True,
+                           format_func=str.upper, key=f"{chave}_formato")
+    with col2:
+        compressao = st.selectbox("Compressão:", COMPRESSOES_EXPORTACAO[formato],
+                                  format_func=lambda c: c or "nenhuma", key=f"{chave}_compressao_{formato}")
+
+    filtros = {'meses': meses, 'celulas': celulas}
+    with col3:
+        st.download_button(
+            "⬇️ Baixar registros",
+            data=_preparar_download(df, formato, compressao, filtros),
+            file_name=nome_arquivo + extensao_exportacao(formato, compressao),
+            mime=TIPOS_MIME[(formato, compressao)],
+            on_click="ignore",
+            key=f"{chave}_download"
+        )
@@ -0,0 +1,324 @@
+"""
+Carregamento concorrente das fontes de dados do dashboard
+
+Além dos registros de incêndios, o dashboard combina fontes opcionais:
+
+- estacoes: exportação das estações meteorológicas (data/estacoes.csv), com
+  a coluna 'month' (ou 'date') e medições numéricas; as médias por dia (com
+  datas) ou por mês entram no DataFrame com o prefixo 'estacao_'.
+- limites: metadados dos limites do parque por célula do grid
+  (data/limites.csv), com 'x', 'y' e atributos da célula (ex: 'zona').
+
+As fontes são lidas ao mesmo tempo num pool de threads (o leitor CSV do
+Arrow libera o GIL), com o tempo de cada uma registrado. As páginas não
+esperam pelas fontes lentas: exibir_fontes mostra o que já chegou e se
+atualiza sozinho até todas terminarem.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+import pandas as pd
+import pyarrow.csv as pa_csv
+import streamlit as st
+
+from src.diagnostico import exibir_tabela
+from src.utils import (
+    load_forestfires, obter_versao_dados, converter_datas, COLUNA_DATA, CSV_PATH, MAX_ENTRADAS_CACHE, MONTH_MAP, MONTH_ORDER
+)
+
+
+logger = logging.getLogger(__name__)
+
+ARQUIVO_ESTACOES = CSV_PATH.parent / "estacoes.csv"
+ARQUIVO_LIMITES = CSV_PATH.parent / "limites.csv"
+
+PREFIXO_ESTACOES = "estacao_"
+
+# Intervalo de atualização do painel enquanto há fontes carregando, em segundos
+INTERVALO_PAINEL_S = 1.0
+
+
+def _ler_csv(caminho: Path) -> pd.DataFrame:
+    """Lê um CSV com o leitor do Arrow (libera o GIL) e padroniza os nomes das colunas"""
+    df = pa_csv.read_csv(caminho).to_pandas()
+    df.columns = df.columns.str.lower().str.strip()
+    return converter_datas(df)
+
+
+def carregar_estacoes(caminho: Path = ARQUIVO_ESTACOES) -> pd.DataFrame:
+    """
+    Lê a exportação das estações meteorológicas e tira a média entre estações
+
+    Args:
+        caminho: CSV com 'month' ou 'date' e medições numéricas (ex: 'temp',
+            'rh', 'wind', 'rain'); colunas de texto (ex: 'estacao') são ignoradas
+
+    Returns:
+        DataFrame com 'month' (e COLUNA_DATA, se houver) e as médias das
+        medições, prefixadas com PREFIXO_ESTACOES
+
+    Raises:
+        ValueError: Arquivo sem 'month' nem COLUNA_DATA
+    """
+    df = _ler_csv(caminho)
+    if COLUNA_DATA in df.columns:
+        # Datas em branco ou inválidas (NaT) ficam sem mês e saem das médias
+        df['month'] = df[COLUNA_DATA].dt.month.map(dict(enumerate(MONTH_ORDER, 1)))
+        chaves = [COLUNA_DATA, 'month']
+    elif 'month' in df.columns:
+        chaves = ['month']
+    else:
+        raise ValueError(f"{caminho.name}: informe a coluna 'month' ou '{COLUNA_DATA}'")
+
+    medicoes = [c for c in df.select_dtypes('number').columns if c not in ('x', 'y')]
+    medias = df.groupby(chaves, as_index=False)[medicoes].mean()
+    return medias.rename(columns={c: PREFIXO_ESTACOES + c for c in medicoes})
+
+
+def carregar_limites(caminho: Path = ARQUIVO_LIMITES) -> pd.DataFrame:
+    """
+    Lê os metadados de limites do parque por célula do grid
+
+    Args:
+        caminho: CSV com 'x', 'y' e atributos da célula
+
+    Returns:
+        DataFrame com uma linha por célula
+
+    Raises:
+        ValueError: Arquivo sem 'x' e 'y'
+    """
+    df = _ler_csv(caminho)
+    if not {'x', 'y'} <= set(df.columns):
+        raise ValueError(f"{caminho.name}: informe as colunas 'x' e 'y'")
+    return df.drop_duplicates(['x', 'y'], keep='last')
+
+
+def carregar_incendios(caminho: Path = CSV_PATH) -> pd.DataFrame:
+    """Registros de incêndios pelo cache de load_forestfires, com a mesma chave das páginas"""
+    return load_forestfires(caminho, obter_versao_dados(caminho))
+
+
+# Fontes conhecidas: arquivo, descrição, função de leitura e se é obrigatória
+FONTES: Dict[str, Dict] = {
+    'incendios': {'caminho': CSV_PATH, 'descricao': "Registros de incêndios",
+                  'carregar': carregar_incendios, 'obrigatoria': True},
+    'estacoes': {'caminho': ARQUIVO_ESTACOES, 'descricao': "Estações meteorológicas",
+                 'carregar': carregar_estacoes, 'obrigatoria': False},
+    'limites': {'caminho': ARQUIVO_LIMITES, 'descricao': "Limites do parque",
+                'carregar': carregar_limites, 'obrigatoria': False}
+}
+
+
+def versao_fontes(fontes: Dict[str, Dict] = FONTES) -> str:
+    """Versão conjunta das fontes (mtime e tamanho de cada arquivo existente)"""
+    partes = []
+    for nome, fonte in fontes.items():
+        caminho = Path(fonte['caminho'])
+        if caminho.exists():
+            stat = caminho.stat()
+            partes.append(f"{nome}:{stat.st_mtime_ns}-{stat.st_size}")
+    return "|".join(partes)
+
+
+class CarregamentoFontes:
+    """
+    Leitura das fontes em paralelo, consultável enquanto ainda está em andamento
+
+    Fontes opcionais sem arquivo são marcadas como ausentes e não são lidas.
+    """
+
+    def __init__(self, fontes: Dict[str, Dict] = FONTES, n_threads: Optional[int] = None):
+        self.fontes = fontes
+        self.versao = versao_fontes(fontes)
+        self.inicio = time.perf_counter()
+        self._duracoes: Dict[str, float] = {}
+        self._futuros: Dict[str, Future] = {}
+
+        presentes = {nome: fonte for nome, fonte in fontes.items()
+                     if fonte['obrigatoria'] or Path(fonte['caminho']).exists()}
+        executor = ThreadPoolExecutor(max_workers=n_threads or max(1, len(presentes)),
+                                      thread_name_prefix="fontes")
+        for nome, fonte in presentes.items():
+            self._futuros[nome] = executor.submit(self._carregar, nome, fonte['carregar'], Path(fonte['caminho']))
+        executor.shutdown(wait=False)
+
+    def _carregar(self, nome: str, carregar: Callable[[Path], pd.DataFrame], caminho: Path) -> pd.DataFrame:
+        inicio = time.perf_counter()
+        try:
+            return carregar(caminho)
+        finally:
+            self._duracoes[nome] = time.perf_counter() - inicio
+            logger.info("Fonte %s carregada em %.3f s", nome, self._duracoes[nome])
+
+    def concluido(self) -> bool:
+        """Indica se todas as fontes presentes terminaram (com ou sem erro)"""
+        return all(futuro.done() for futuro in self._futuros.values())
+
+    def aguardar(self, timeout: Optional[float] = None) -> bool:
+        """Espera as fontes terminarem; retorna se todas terminaram"""
+        limite = None if timeout is None else time.perf_counter() + timeout
+        for futuro in self._futuros.values():
+            restante = None if limite is None else max(0.0, limite - time.perf_counter())
+            try:
+                futuro.result(restante)
+            except TimeoutError:
+                return False
+            except Exception:
+                pass
+        return True
+
+    def resultados(self) -> Dict[str, pd.DataFrame]:
+        """Fontes já carregadas com sucesso"""
+        return {nome: futuro.result() for nome, futuro in self._futuros.items()
+                if futuro.done() and futuro.exception() is None}
+
+    def status(self) -> pd.DataFrame:
+        """
+        Situação de cada fonte
+
+        Returns:
+            DataFrame com 'fonte', 'descricao', 'estado' ('carregando',
+            'pronta', 'erro' ou 'ausente'), 'linhas', 'duracao_s' e 'erro'
+        """
+        linhas = []
+        for nome, fonte in self.fontes.items():
+            futuro = self._futuros.get(nome)
+            registro = {'fonte': nome, 'descricao': fonte['descricao'], 'estado': 'ausente',
+                        'linhas': None, 'duracao_s': self._duracoes.get(nome), 'erro': None}
+            if futuro is not None and not futuro.done():
+                registro['estado'] = 'carregando'
+                registro['duracao_s'] = time.perf_counter() - self.inicio
+            elif futuro is not None and futuro.exception() is not None:
+                registro['estado'] = 'erro'
+                registro['erro'] = str(futuro.exception())
+            elif futuro is not None:
+                registro['estado'] = 'pronta'
+                registro['linhas'] = len(futuro.result())
+            linhas.append(registro)
+        return pd.DataFrame(linhas)
+
+
+_carregamento: Optional[CarregamentoFontes] = None
+_trava = threading.Lock()
+
+
+def iniciar_carregamento() -> CarregamentoFontes:
+    """
+    Carregamento das fontes do processo, iniciado na primeira chamada
+
+    Um novo carregamento começa quando algum arquivo de fonte muda.
+
+    Returns:
+        Carregamento em andamento ou concluído
+    """
+    global _carregamento
+    with _trava:
+        if _carregamento is None or _carregamento.versao != versao_fontes(_carregamento.fontes):
+            _carregamento = CarregamentoFontes()
+    return _carregamento
+
+
+@st.cache_data(max_entries=MAX_ENTRADAS_CACHE)
+def enriquecer(_df: pd.DataFrame, versao: str, _fontes: Dict[str, pd.DataFrame],
+               chave_fontes: str) -> pd.DataFrame:
+    """
+    Junta as fontes opcionais já carregadas aos registros de incêndios
+
+    Args:
+        _df: Registros de incêndios (excluído do hash do cache)
+        versao: Versão dos registros
+        _fontes: Fontes carregadas (CarregamentoFontes.resultados)
+        chave_fontes: Versão das fontes e nomes das já carregadas (chave do cache)
+
+    Returns:
+        Registros com as colunas das estações (por dia, se ambos têm datas, ou
+        por mês) e dos limites (por célula)
+    """
+    enriquecido = _df
+    estacoes = _fontes.get('estacoes')
+    if estacoes is not None:
+        if COLUNA_DATA in estacoes.columns and COLUNA_DATA in _df.columns:
+            enriquecido = enriquecido.merge(estacoes.drop(columns='month'), on=COLUNA_DATA, how='left')
+        else:
+            mensais = estacoes.drop(columns=COLUNA_DATA, errors='ignore').groupby('month', as_index=False).mean()
+            enriquecido = enriquecido.merge(mensais, on='month', how='left')
+    limites = _fontes.get('limites')
+    if limites is not None:
+        enriquecido = enriquecido.merge(limites, on=['x', 'y'], how='left', suffixes=('', '_limite'))
+    return enriquecido
+
+
+def _desenhar_painel(df: pd.DataFrame, versao: str, carregamento: CarregamentoFontes) -> None:
+    """Status das fontes e o que já dá para mostrar com as que chegaram"""
+    status = carregamento.status()
+    icones = {'carregando': '⏳', 'pronta': '✅', 'erro': '⚠️', 'ausente': '➖'}
+    exibicao = pd.DataFrame({
+        'Fonte': status['estado'].map(icones) + ' ' + status['descricao'],
+        'Estado': status['estado'],
+        'Linhas': status['linhas'],
+        'Tempo (s)': status['duracao_s'].round(3)
+    })
+    exibir_tabela(exibicao, 'status_fontes', use_container_width=True, hide_index=True)
+    for _, falha in status[status['estado'] == 'erro'].iterrows():
+        st.warning(f"{falha['descricao']}: {falha['erro']}")
+
+    fontes = {nome: dados for nome, dados in carregamento.resultados().items() if nome != 'incendios'}
+    if not fontes:
+        if carregamento.concluido():
+            st.caption(f"Sem fontes complementares: inclua {ARQUIVO_ESTACOES.name} ou "
+                       f"{ARQUIVO_LIMITES.name} em {ARQUIVO_ESTACOES.parent.name}/.")
+        return
+
+    enriquecido = enriquecer(df, versao, fontes, f"{carregamento.versao}:{','.join(sorted(fontes))}")
+
+    if 'estacoes' in fontes:
+        comuns = [c for c in ('temp', 'rh', 'wind', 'rain') if PREFIXO_ESTACOES + c in enriquecido.columns]
+        if comuns:
+            st.write("**Registros × estações meteorológicas (médias mensais)**")
+            colunas = comuns + [PREFIXO_ESTACOES + c for c in comuns]
+            comparacao = enriquecido.groupby('month')[colunas].mean().reindex(
+                [m for m in MONTH_ORDER if m in set(enriquecido['month'])]
+            )
+            comparacao.index = comparacao.index.map(MONTH_MAP)
+            exibir_tabela(comparacao.round(1), 'comparacao_estacoes', use_container_width=True)
+
+    if 'limites' in fontes:
+        atributos = [c for c in fontes['limites'].columns
+                     if c not in ('x', 'y') and not pd.api.types.is_numeric_dtype(fontes['limites'][c])]
+        for atributo in atributos[:1]:
+            st.write(f"**Incêndios por {atributo} (limites do parque)**")
+            resumo = enriquecido.groupby(atributo, dropna=False)['area'].agg(['size', 'sum']).rename(
+                columns={'size': 'Incêndios', 'sum': 'Área Total (ha)'}
+            ).sort_values('Área Total (ha)', ascending=False)
+            exibir_tabela(resumo.round(2), f'incendios_por_{atributo}', use_container_width=True)
+
+
+@st.fragment(run_every=INTERVALO_PAINEL_S)
+def _painel_parcial(df: pd.DataFrame, versao: str) -> None:
+    """Painel que se redesenha enquanto há fontes carregando"""
+    carregamento = iniciar_carregamento()
+    if carregamento.concluido():
+        # Recarrega a página para trocar pelo painel sem atualização periódica
+        st.rerun()
+    _desenhar_painel(df, versao, carregamento)
+
+
+def exibir_fontes(df: pd.DataFrame, versao: str) -> None:
+    """
+    Painel das fontes de dados, exibido sem esperar pelas fontes lentas
+
+    Args:
+        df: Registros de incêndios da página
+        versao: Versão dos registros
+    """
+    carregamento = iniciar_carregamento()
+    if carregamento.concluido():
+        _desenhar_painel(df, versao, carregamento)
+    else:
+        _painel_parcial(df, versao)
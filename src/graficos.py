@@ -0,0 +1,711 @@
+"""
+Construção dos gráficos padrão do dashboard
+
+As funções recebem os dados já agregados e retornam figuras Plotly, para
+que possam ser reutilizadas pelas páginas e pelo aquecimento de cache.
+"""
+
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+import plotly.io as pio
+import streamlit as st
+
+from src.utils import COLUNA_DATA, CRITERIOS_REGIOES, MAX_ENTRADAS_CACHE, MONTH_MAP, MONTH_ORDER
+
+
+# Variáveis comparáveis com a frequência mensal: (coluna, cor, rótulo)
+VARIAVEIS_COMPARACAO = {
+    "Temperatura Média (°C)": ("Temp Média", "#F77F00", "Temperatura Média (°C)"),
+    "Umidade Relativa (%)": ("Umidade Média", "#4A90E2", "Umidade Relativa (%)"),
+    "FFMC Médio (Combustível Fino)": ("FFMC Médio", "#E67E22", "FFMC Médio"),
+    "DMC Médio (Combustível Profundo)": ("DMC Médio", "#9B59B6", "DMC Médio"),
+    "DC Médio (Seca)": ("DC Médio", "#C0392B", "DC Médio"),
+    "ISI Médio (Propagação)": ("ISI Médio", "#E74C3C", "ISI Médio")
+}
+
+# Atributos de dados dos traços que podem ser compactados
+ATRIBUTOS_COMPACTAVEIS = ('x', 'y', 'z', 'customdata', 'text', 'marker.size', 'marker.color')
+
+# Acima disso, float32 (7 dígitos significativos) pode alterar casas exibidas
+LIMITE_FLOAT32 = 1e6
+
+
+def achatar_colunas(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Achata colunas MultiIndex resultantes de agregações ('area', 'sum') -> 'area_sum'
+
+    Args:
+        df: DataFrame agregado
+
+    Returns:
+        Cópia rasa do DataFrame com colunas simples
+    """
+    df = df.copy(deep=False)
+    df.columns = [
+        '_'.join([c for c in col if c]).strip('_') if isinstance(col, tuple) else col
+        for col in df.columns
+    ]
+    return df
+
+
+def _compactar_valores(valores, casas_decimais: int) -> Optional[np.ndarray]:
+    """
+    Versão compacta de um array de dados de um traço
+
+    Returns:
+        Novo array, ou None se o tipo não tiver versão compacta
+    """
+    arr = np.asarray(valores)
+
+    if arr.dtype.kind == 'O' and arr.ndim == 2:
+        # customdata misto (texto e números): arredondar só as colunas numéricas
+        arr = arr.copy()
+        for j in range(arr.shape[1]):
+            coluna = pd.to_numeric(pd.Series(arr[:, j]), errors='coerce')
+            if coluna.notna().all():
+                arr[:, j] = coluna.round(casas_decimais).tolist()
+        return arr
+
+    if arr.dtype.kind != 'f':
+        # Inteiros já são reduzidos ao menor tipo pelo Plotly; texto não tem versão compacta
+        return None
+
+    finitos = arr[np.isfinite(arr)]
+    if finitos.size == arr.size and np.array_equal(finitos, np.round(finitos)) \
+            and np.abs(finitos).max(initial=0) < 2 ** 31:
+        return arr.astype(np.int64)
+
+    arr = np.round(arr, casas_decimais)
+    if np.abs(finitos).max(initial=0) < LIMITE_FLOAT32:
+        arr = arr.astype(np.float32)
+    return arr
+
+
+def compactar_figura(fig: go.Figure, casas_decimais: int = 2) -> go.Figure:
+    """
+    Reduz o payload da figura enviado ao navegador
+
+    Os arrays numéricos são enviados pelo Plotly como arrays tipados em
+    base64: valores inteiros viram o menor tipo inteiro que os comporta e
+    os demais são arredondados para as casas exibidas e enviados como
+    float32. Dados mistos (customdata com texto) continuam em JSON, com
+    os números arredondados.
+
+    Args:
+        fig: Figura Plotly (modificada no lugar)
+        casas_decimais: Casas decimais exibidas nos rótulos e hovers
+
+    Returns:
+        A própria figura, para encadeamento
+    """
+    for traco in fig.data:
+        for atributo in ATRIBUTOS_COMPACTAVEIS:
+            try:
+                valores = traco[atributo]
+            except (KeyError, ValueError):
+                continue
+            if valores is None or isinstance(valores, str) or np.ndim(valores) == 0:
+                continue
+
+            compacto = _compactar_valores(valores, casas_decimais)
+            if compacto is not None:
+                # O Plotly ignora atribuições de valores iguais ao atual
+                traco[atributo] = None
+                traco[atributo] = compacto
+
+    return fig
+
+
+def tamanho_payload(fig: go.Figure) -> int:
+    """
+    Tamanho em bytes da especificação da figura enviada ao navegador
+
+    Args:
+        fig: Figura Plotly
+
+    Returns:
+        Número de bytes do JSON, serializado como no st.plotly_chart
+    """
+    return len(pio.to_json(fig, validate=False).encode('utf-8'))
+
+
+def criar_grafico_area_mensal(monthly_data: pd.DataFrame) -> go.Figure:
+    """
+    Gráfico de linha da área queimada por mês
+
+    Args:
+        monthly_data: Saída de agregar_por_mes com colunas achatadas e 'month_nome'
+
+    Returns:
+        Figura Plotly
+    """
+    fig_monthly = px.line(
+        monthly_data,
+        x='month_nome',
+        y='area_sum',
+        markers=True,
+        title="Área Queimada por Mês",
+        labels={'month_nome': 'Mês', 'area_sum': 'Área (ha)'},
+        color_discrete_sequence=['#E63946']
+    )
+    fig_monthly.update_layout(
+        height=400,
+        showlegend=False,
+        hovermode='x unified'
+    )
+    fig_monthly.update_xaxes(tickangle=45)
+    return fig_monthly
+
+
+def criar_grafico_frequencia_mensal(monthly_data: pd.DataFrame) -> go.Figure:
+    """
+    Gráfico de barras da frequência de incêndios por mês
+
+    Args:
+        monthly_data: Saída de agregar_por_mes com colunas achatadas e 'month_nome'
+
+    Returns:
+        Figura Plotly
+    """
+    fig_freq = px.bar(
+        monthly_data,
+        x='month_nome',
+        y='area_count',
+        title="Frequência de Incêndios por Mês",
+        labels={'month_nome': 'Mês', 'area_count': 'Quantidade'},
+        color_discrete_sequence=['#F77F00']
+    )
+    fig_freq.update_layout(
+        height=400,
+        showlegend=False,
+        hovermode='x unified'
+    )
+    fig_freq.update_xaxes(tickangle=45)
+    return fig_freq
+
+
+def criar_mapa_calor_area(grid_data: pd.DataFrame,
+                          titulo: str = "Mapa de Calor: Área Queimada por Coordenadas",
+                          titulo_barra: str = "Área (ha)") -> go.Figure:
+    """
+    Mapa de calor da área queimada total por coordenadas (X, Y)
+
+    Args:
+        grid_data: Saída de agregar_por_grid com colunas achatadas
+        titulo: Título do gráfico
+        titulo_barra: Título da barra de cores
+
+    Returns:
+        Figura Plotly
+    """
+    heatmap_pivot = grid_data.pivot_table(index='y', columns='x', values='area_sum', fill_value=0)
+
+    fig_heatmap = go.Figure(data=go.Heatmap(
+        x=heatmap_pivot.columns,
+        y=heatmap_pivot.index,
+        z=heatmap_pivot.values,
+        colorscale='Reds',
+        colorbar=dict(title=titulo_barra),
+        hovertemplate="X: %{x}<br>Y: %{y}<br>Área: %{z:.2f} ha<extra></extra>"
+    ))
+
+    fig_heatmap.update_layout(
+        title=titulo,
+        xaxis_title="Coordenada X",
+        yaxis_title="Coordenada Y",
+        height=500
+    )
+    return fig_heatmap
+
+
+def criar_mapa_calor_piramide(janela: Dict,
+                              titulo: str = "Mapa de Calor: Área Queimada por Coordenadas",
+                              titulo_barra: str = "Área (ha)") -> go.Figure:
+    """
+    Mapa de calor da área queimada a partir de uma janela da pirâmide
+
+    Args:
+        janela: Saída de PiramideMapa.janela
+        titulo: Título do gráfico
+        titulo_barra: Título da barra de cores
+
+    Returns:
+        Figura Plotly
+    """
+    fator = janela['fator']
+    if fator > 1:
+        titulo = f"{titulo} (blocos de {fator}×{fator} células)"
+
+    fig_heatmap = go.Figure(data=go.Heatmap(
+        x=janela['x'],
+        y=janela['y'],
+        z=janela['soma'],
+        customdata=np.dstack([janela['contagem'], janela['maximo']]),
+        colorscale='Reds',
+        colorbar=dict(title=titulo_barra),
+        hovertemplate="X: %{x}<br>Y: %{y}<br>Área: %{z:.2f} ha<br>"
+                      "Incêndios: %{customdata[0]:.0f}<br>Maior incêndio: %{customdata[1]:.2f} ha<extra></extra>"
+    ))
+
+    fig_heatmap.update_layout(
+        title=titulo,
+        xaxis_title="Coordenada X",
+        yaxis_title="Coordenada Y",
+        height=500
+    )
+    return fig_heatmap
+
+
+def adicionar_destaques_anomalias(fig: go.Figure, alertas: pd.DataFrame) -> go.Figure:
+    """
+    Marca sobre um mapa de calor as células com alertas de anomalia
+
+    A figura original não é alterada (pode vir do cache).
+
+    Args:
+        fig: Mapa de calor com eixos X e Y do grid
+        alertas: Alertas de DetectorAnomalias.resultado
+
+    Returns:
+        Nova figura com os marcadores (a própria figura, se não houver alertas)
+    """
+    if alertas.empty:
+        return fig
+
+    por_celula = alertas.groupby(['x', 'y']).agg(alertas=('z', 'size'), z_max=('z', 'max')).reset_index()
+    destacada = go.Figure(fig)
+    destacada.add_trace(go.Scatter(
+        x=por_celula['x'],
+        y=por_celula['y'],
+        mode='markers',
+        marker=dict(symbol='circle-open', size=18, line=dict(width=3), color='#1D3557'),
+        customdata=por_celula[['alertas', 'z_max']],
+        hovertemplate="X: %{x}<br>Y: %{y}<br>%{customdata[0]} alerta(s), z máx. %{customdata[1]:.1f}<extra></extra>",
+        name="Anomalias",
+        showlegend=False
+    ))
+    return destacada
+
+
+def criar_mapa_janela(janelas: Dict, alertas: pd.DataFrame, dias_janela: int) -> go.Figure:
+    """
+    Mapa de calor da área queimada numa janela móvel, com os alertas dela
+
+    Args:
+        janelas: Saída de JanelasMoveis.resultado
+        alertas: Alertas de DetectorAnomalias.resultado
+        dias_janela: Janela exibida (uma das chaves de janelas['janelas'])
+
+    Returns:
+        Figura Plotly
+    """
+    fig = criar_mapa_calor_area(
+        janelas['janelas'][dias_janela],
+        titulo=f"Área Queimada nos Últimos {dias_janela} Dias",
+        titulo_barra="Área<br>Queimada (ha)"
+    )
+    # Só os alertas dentro da janela
+    recentes = (janelas['referencia'] - alertas[COLUNA_DATA]).dt.days < dias_janela
+    return adicionar_destaques_anomalias(fig, alertas[recentes])
+
+
+def criar_mapa_densidade(densidade: Dict, medida_kde: str, largura_banda: float) -> go.Figure:
+    """
+    Mapa de calor da superfície de densidade suavizada
+
+    Args:
+        densidade: Saída de calcular_densidade_kde
+        medida_kde: "Incêndios" ou "Área Queimada"
+        largura_banda: Largura de banda usada (exibida no título)
+
+    Returns:
+        Figura Plotly
+    """
+    if medida_kde == "Incêndios":
+        z_kde = densidade['densidade_incendios']
+        titulo_barra = "Incêndios<br>por unidade²"
+    else:
+        z_kde = densidade['densidade_area']
+        titulo_barra = "Área (ha)<br>por unidade²"
+
+    fig_kde = go.Figure(data=go.Heatmap(
+        z=z_kde,
+        x=densidade['x'],
+        y=densidade['y'],
+        colorscale='Reds',
+        colorbar=dict(title=titulo_barra),
+        hovertemplate="X: %{x:.1f}<br>Y: %{y:.1f}<br>Densidade: %{z:.2f}<extra></extra>"
+    ))
+
+    fig_kde.update_layout(
+        title=f"Densidade Suavizada de {medida_kde} (kernel gaussiano, σ = {largura_banda:.1f})",
+        xaxis_title="Coordenada X",
+        yaxis_title="Coordenada Y",
+        height=500
+    )
+    return fig_kde
+
+
+def criar_dispersao_localizacao(df: pd.DataFrame) -> go.Figure:
+    """
+    Dispersão das localizações dos incêndios com tamanho proporcional à área
+
+    Args:
+        df: DataFrame com dados de incêndios
+
+    Returns:
+        Figura Plotly
+    """
+    fig_scatter = px.scatter(
+        df,
+        x='x',
+        y='y',
+        size='area',
+        color='area',
+        hover_data=['month', 'temp', 'rh', 'ffmc', 'area'],
+        color_continuous_scale='Reds',
+        title="Localização de Incêndios (tamanho = área queimada)",
+        labels={'x': 'Coordenada X', 'y': 'Coordenada Y', 'area': 'Área (ha)'}
+    )
+
+    fig_scatter.update_layout(height=500)
+    return fig_scatter
+
+
+def criar_ranking_regioes(grid_sorted: pd.DataFrame, criterio: str) -> go.Figure:
+    """
+    Barras horizontais com as 15 regiões mais críticas segundo o critério
+
+    Args:
+        grid_sorted: Saída de agregar_regioes_criticas ordenada pelo critério
+        criterio: Chave de CRITERIOS_REGIOES
+
+    Returns:
+        Figura Plotly
+    """
+    y_col = CRITERIOS_REGIOES[criterio]
+
+    top_15 = grid_sorted.head(15).copy()
+    top_15['Coordenada'] = '(' + top_15['x'].astype(str) + ', ' + top_15['y'].astype(str) + ')'
+
+    fig_ranking = px.bar(
+        top_15,
+        x=y_col,
+        y='Coordenada',
+        orientation='h',
+        title=f"Top 15 Regiões Críticas - {criterio}",
+        color=y_col,
+        color_continuous_scale='Reds',
+        labels={'Coordenada': 'Coordenadas (X, Y)'},
+        text=y_col
+    )
+
+    fig_ranking.update_traces(texttemplate='%{x:.0f}', textposition='outside')
+    fig_ranking.update_layout(height=500, showlegend=False)
+    return fig_ranking
+
+
+def criar_barras_frequencia_mensal(monthly_data: pd.DataFrame) -> go.Figure:
+    """
+    Barras da quantidade de incêndios por mês
+
+    Args:
+        monthly_data: Saída de agregar_resumo_mensal
+
+    Returns:
+        Figura Plotly
+    """
+    fig_freq = px.bar(
+        monthly_data.reset_index(),
+        x='Mês',
+        y='Frequência',
+        title="Quantidade de Incêndios por Mês",
+        color='Frequência',
+        color_continuous_scale='Reds',
+        text='Frequência'
+    )
+    fig_freq.update_traces(textposition='outside')
+    fig_freq.update_layout(height=400, showlegend=False)
+    fig_freq.update_xaxes(tickangle=45)
+    return fig_freq
+
+
+def criar_barras_area_mensal(monthly_data: pd.DataFrame) -> go.Figure:
+    """
+    Barras da área queimada total por mês
+
+    Args:
+        monthly_data: Saída de agregar_resumo_mensal
+
+    Returns:
+        Figura Plotly
+    """
+    fig_area = px.bar(
+        monthly_data.reset_index(),
+        x='Mês',
+        y='Área Total',
+        title="Área Queimada Total por Mês",
+        color='Área Total',
+        color_continuous_scale='Reds',
+        text='Área Total'
+    )
+    fig_area.update_traces(texttemplate='%{y:.0f}', textposition='outside')
+    fig_area.update_layout(height=400, showlegend=False)
+    fig_area.update_xaxes(tickangle=45)
+    return fig_area
+
+
+def criar_barras_mensais_por_ano(por_ano_mes: pd.DataFrame, medida: str) -> go.Figure:
+    """
+    Barras agrupadas por mês, uma cor por ano
+
+    Args:
+        por_ano_mes: Saída de agregar_por_ano_mes
+        medida: 'Frequência' ou 'Área Total'
+
+    Returns:
+        Figura Plotly
+    """
+    fig_anos = px.bar(
+        por_ano_mes,
+        x='Mês',
+        y=medida,
+        color='Ano',
+        barmode='group',
+        title=f"{medida} por Mês, Ano a Ano",
+        color_discrete_sequence=px.colors.sequential.Reds[2:]
+    )
+    fig_anos.update_layout(height=400, legend_title_text='Ano')
+    fig_anos.update_xaxes(tickangle=45)
+    return fig_anos
+
+
+def criar_serie_comparacao(monthly_data: pd.DataFrame, variavel_comparacao: str) -> go.Figure:
+    """
+    Série mensal da frequência de incêndios contra uma variável em eixo secundário
+
+    Args:
+        monthly_data: Saída de agregar_resumo_mensal
+        variavel_comparacao: Chave de VARIAVEIS_COMPARACAO
+
+    Returns:
+        Figura Plotly
+    """
+    coluna_variavel, cor_variavel, label_variavel = VARIAVEIS_COMPARACAO[variavel_comparacao]
+
+    fig_combined = go.Figure()
+
+    # Eixo Y primário: Frequência
+    fig_combined.add_trace(go.Scatter(
+        x=monthly_data['Mês'],
+        y=monthly_data['Frequência'],
+        name='Frequência de Incêndios',
+        mode='lines+markers',
+        yaxis='y1',
+        line=dict(color='#E63946', width=3),
+        marker=dict(size=10)
+    ))
+
+    # Eixo Y secundário: Variável selecionada
+    fig_combined.add_trace(go.Scatter(
+        x=monthly_data['Mês'],
+        y=monthly_data[coluna_variavel],
+        name=label_variavel,
+        mode='lines+markers',
+        yaxis='y2',
+        line=dict(color=cor_variavel, width=2, dash='dash'),
+        marker=dict(size=8)
+    ))
+
+    fig_combined.update_layout(
+        title=f"Relação entre Frequência de Incêndios e {label_variavel}",
+        xaxis=dict(title='Mês'),
+        yaxis=dict(
+            title=dict(text='Frequência de Incêndios', font=dict(color='#E63946')),
+            tickfont=dict(color='#E63946')
+        ),
+        yaxis2=dict(
+            title=dict(text=label_variavel, font=dict(color=cor_variavel)),
+            tickfont=dict(color=cor_variavel),
+            anchor='x',
+            overlaying='y',
+            side='right'
+        ),
+        height=450,
+        hovermode='x unified',
+        legend=dict(x=0.02, y=0.98)
+    )
+    return fig_combined
+
+
+def criar_boxplot_mensal(df: pd.DataFrame) -> go.Figure:
+    """
+    Box plot da área queimada por mês
+
+    Args:
+        df: DataFrame com dados de incêndios
+
+    Returns:
+        Figura Plotly
+    """
+    # Quartis e cercas por mês calculados aqui: só os outliers vão para a
+    # figura, em vez de uma cópia de todas as linhas
+    por_mes = df['area'].groupby(df['month'])
+    quartis = por_mes.quantile([0.25, 0.5, 0.75]).unstack()
+    meses = [m for m in MONTH_ORDER if m in quartis.index]
+    cores = px.colors.sequential.Reds
+
+    fig_box = go.Figure()
+    for i, mes in enumerate(meses):
+        q1, mediana, q3 = quartis.loc[mes, [0.25, 0.5, 0.75]]
+        valores = por_mes.get_group(mes)
+        normal = valores.between(q1 - 1.5 * (q3 - q1), q3 + 1.5 * (q3 - q1))
+        dentro, fora = valores[normal], valores[~normal]
+        cor = cores[i % len(cores)]
+        fig_box.add_trace(go.Box(
+            x=[MONTH_MAP[mes]], q1=[q1], median=[mediana], q3=[q3],
+            lowerfence=[dentro.min()], upperfence=[dentro.max()],
+            name=MONTH_MAP[mes], marker_color=cor, boxpoints=False
+        ))
+        if not fora.empty:
+            fig_box.add_trace(go.Scatter(
+                x=[MONTH_MAP[mes]] * len(fora), y=fora.to_numpy(), mode='markers',
+                marker=dict(color=cor, size=5), name=MONTH_MAP[mes], hoverinfo='y'
+            ))
+
+    fig_box.update_layout(
+        title="Box Plot: Variação de Área Queimada por Mês",
+        xaxis_title='Mês',
+        yaxis_title='Área Queimada (ha)'
+    )
+    fig_box.update_layout(height=400, showlegend=False)
+    fig_box.update_xaxes(tickangle=45)
+    return fig_box
+
+
+def criar_histograma_fwi(df: pd.DataFrame, componente: str) -> go.Figure:
+    """
+    Histograma de um componente FWI
+
+    Args:
+        df: DataFrame com dados de incêndios
+        componente: Coluna do componente ('ffmc', 'dmc', 'dc' ou 'isi')
+
+    Returns:
+        Figura Plotly
+    """
+    fig = px.histogram(
+        df,
+        x=componente,
+        nbins=30,
+        title=f"Distribuição {componente}",
+        color_discrete_sequence=['#E63946']
+    )
+    fig.update_layout(height=350, showlegend=False)
+    return fig
+
+
+def criar_mapa_correlacao(corr_matrix: pd.DataFrame, p_valores: pd.DataFrame) -> go.Figure:
+    """
+    Mapa de calor da matriz de correlação com marcação de significância
+
+    Args:
+        corr_matrix: Matriz de correlação
+        p_valores: P-valores do teste de permutação, mesmo índice da matriz
+
+    Returns:
+        Figura Plotly
+    """
+    # Marcar significância: * p < 0.05, ** p < 0.01, *** p < 0.001
+    estrelas = np.select(
+        [p_valores.values < 0.001, p_valores.values < 0.01, p_valores.values < 0.05],
+        ['***', '**', '*'],
+        default=''
+    )
+    np.fill_diagonal(estrelas, '')
+    texto_corr = np.char.add(np.char.mod('%.2f', corr_matrix.values), estrelas)
+
+    fig_corr = go.Figure(data=go.Heatmap(
+        z=corr_matrix.values,
+        x=corr_matrix.columns,
+        y=corr_matrix.columns,
+        colorscale='RdBu',
+        zmid=0,
+        text=texto_corr,
+        texttemplate='%{text}',
+        textfont={"size": 10},
+        customdata=p_valores.values,
+        hovertemplate="%{y} × %{x}<br>r = %{z:.3f}<br>p = %{customdata:.4f}<extra></extra>",
+        colorbar=dict(title="Correlação")
+    ))
+
+    fig_corr.update_layout(height=500, width=700)
+    return fig_corr
+
+
+@st.cache_data(max_entries=MAX_ENTRADAS_CACHE)
+def gerar_graficos_resumo(_agregados: Dict, versao: str) -> Dict[str, go.Figure]:
+    """
+    Gráficos da página de resumo, em cache por versão dos dados
+
+    Os gráficos saem dos agregados já calculados (ver
+    src.particoes.obter_agregados: combinados das parciais por partição ou
+    do acompanhamento incremental), sem reagrupar os registros.
+
+    Args:
+        _agregados: Dicionário no formato de calcular_agregados (não entra na chave do cache)
+        versao: Versão dos dados (ver obter_versao_dados)
+
+    Returns:
+        Dicionário com as figuras 'area_mensal', 'frequencia_mensal' e 'mapa_calor'
+    """
+    monthly_data = achatar_colunas(_agregados['mes'])
+    monthly_data['month_nome'] = monthly_data['month'].map(MONTH_MAP)
+
+    return {
+        'area_mensal': compactar_figura(criar_grafico_area_mensal(monthly_data)),
+        'frequencia_mensal': compactar_figura(criar_grafico_frequencia_mensal(monthly_data)),
+        'mapa_calor': compactar_figura(criar_mapa_calor_area(achatar_colunas(_agregados['grid'])))
+    }
+
+
+@st.cache_data(max_entries=MAX_ENTRADAS_CACHE)
+def gerar_graficos_registros(_df: pd.DataFrame, versao: str) -> Dict[str, go.Figure]:
+    """
+    Gráficos da página de perguntas feitos com os registros linha a linha
+
+    Em cache por versão dos dados, comum a todas as sessões: as figuras
+    carregam uma linha por registro e não são guardadas no estado de cada
+    sessão (ver GrafoCalculos.no com compartilhado=True).
+
+    Args:
+        _df: DataFrame com os dados (não entra na chave do cache)
+        versao: Versão dos dados (ver obter_versao_dados)
+
+    Returns:
+        Dicionário com as figuras 'dispersao' e 'boxplot'
+    """
+    return {
+        'dispersao': compactar_figura(criar_dispersao_localizacao(_df)),
+        'boxplot': compactar_figura(criar_boxplot_mensal(_df))
+    }
+
+
+@st.cache_data(max_entries=MAX_ENTRADAS_CACHE)
+def gerar_histogramas_fwi(_df: pd.DataFrame, versao: str, componentes: Tuple[str, ...]) -> Dict[str, go.Figure]:
+    """
+    Histogramas dos componentes do FWI, em cache por versão dos dados
+
+    Args:
+        _df: DataFrame com os dados (não entra na chave do cache)
+        versao: Versão dos dados (ver obter_versao_dados)
+        componentes: Colunas do FWI (ex: ('ffmc', 'dmc', 'dc', 'isi'))
+
+    Returns:
+        Dicionário componente -> figura de criar_histograma_fwi
+    """
+    return {componente: compactar_figura(criar_histograma_fwi(_df, componente)) for componente in componentes}
@@ -0,0 +1,224 @@
+"""
+Grafo de cálculos das páginas, com recálculo incremental
+
+Cada artefato derivado de uma página (agregados, rankings, matriz de
+correlação, figuras) é um nó que declara as entradas de que depende: as
+entradas da página (dados, identificados pela versão, e valores de
+widgets) ou outros nós. A assinatura de um nó é a das suas entradas; a
+cada rerun só os nós cuja assinatura mudou são recalculados, e os demais
+vêm do resultado guardado em st.session_state (por sessão e por página).
+
+Nós pesados, que dependem só dos dados (figuras com os registros linha a
+linha, agregados), são declarados com compartilhado=True: a função já é um
+cache por versão comum a todas as sessões (st.cache_data ou
+st.cache_resource) e o valor não é guardado em st.session_state. Cada
+sessão memoriza apenas os nós baratos que dependem dos seus widgets.
+
+    grafo = GrafoCalculos("Perguntas")
+    grafo.entrada('df', df, versao=versao)
+    grafo.no('agregados', obter_agregados, 'df', 'versao', 'selecao', compartilhado=True)
+    grafo.no('regioes', lambda agregados: agregados['regioes'], 'agregados')
+    ...
+    grafo.entrada('criterio', st.radio(...))
+    fig = grafo.obter('fig_ranking')
+
+exibir_grafo mostra na barra lateral quais nós foram calculados no rerun,
+o motivo (entradas alteradas) e o tempo de cada um.
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+import pandas as pd
+import streamlit as st
+
+
+# Chave em st.session_state: {página: {nó: (assinatura, valor)}}
+CHAVE_GRAFOS = 'grafo_calculos'
+
+
+def _assinatura(valor: Any) -> Hashable:
+    """Assinatura de um valor de widget (listas e dicionários viram tuplas)"""
+    if isinstance(valor, (list, tuple)):
+        return tuple(_assinatura(item) for item in valor)
+    if isinstance(valor, dict):
+        return tuple(sorted((chave, _assinatura(item)) for chave, item in valor.items()))
+    if isinstance(valor, (pd.DataFrame, pd.Series)):
+        raise TypeError("Entradas com DataFrame precisam de versao explícita")
+    hash(valor)
+    return valor
+
+
+@dataclass(frozen=True)
+class No:
+    """Nó do grafo: função, nomes das entradas (passadas na mesma ordem) e se o valor vem de um cache compartilhado"""
+
+    funcao: Callable
+    entradas: Tuple[str, ...]
+    compartilhado: bool = False
+
+
+class GrafoCalculos:
+    """
+    Grafo de cálculos de uma página
+
+    Os nós são declarados uma vez por rerun (no topo da página) e avaliados
+    sob demanda por obter, depois que as entradas de que dependem foram
+    definidas. O resultado de cada nó é guardado em st.session_state com a
+    sua assinatura e reaproveitado enquanto ela não mudar; os nós
+    compartilhados só são reaproveitados dentro do rerun.
+    """
+
+    def __init__(self, pagina: str):
+        self.pagina = pagina
+        self._nos: Dict[str, No] = {}
+        self._entradas: Dict[str, Tuple[Any, Hashable]] = {}
+        self._avaliados: Dict[str, Tuple[Hashable, Any]] = {}
+        self._execucoes: List[Dict] = []
+        self._memoria = st.session_state.setdefault(CHAVE_GRAFOS, {}).setdefault(pagina, {})
+
+    def entrada(self, nome: str, valor: Any, versao: Optional[Hashable] = None) -> Any:
+        """
+        Define uma entrada da página
+
+        Args:
+            nome: Nome usado nas declarações dos nós
+            valor: Valor da entrada (dados ou valor de um widget)
+            versao: Identifica o valor quando ele não é comparável por si só
+                (ex: a versão dos dados para um DataFrame); padrão: o valor
+
+        Returns:
+            O próprio valor, para encadear com o widget
+        """
+        if nome in self._nos:
+            raise ValueError(f"'{nome}' já é um nó do grafo")
+        self._entradas[nome] = (valor, _assinatura(valor) if versao is None else versao)
+        return valor
+
+    def no(self, nome: str, funcao: Callable, *entradas: str, compartilhado: bool = False) -> None:
+        """
+        Declara um nó
+
+        Args:
+            nome: Nome do nó
+            funcao: Função chamada com os valores das entradas, na ordem dada
+            *entradas: Nomes das entradas da página ou de outros nós
+            compartilhado: A função consulta um cache por versão comum às
+                sessões; o valor não é guardado em st.session_state
+        """
+        if nome in self._entradas:
+            raise ValueError(f"'{nome}' já é uma entrada do grafo")
+        self._nos[nome] = No(funcao, tuple(entradas), compartilhado)
+
+    def _avaliar(self, nome: str) -> Tuple[Hashable, Any]:
+        """Assinatura e valor de uma entrada ou nó, recalculando o nó se preciso"""
+        if nome in self._entradas:
+            valor, assinatura = self._entradas[nome]
+            return assinatura, valor
+        if nome in self._avaliados:
+            return self._avaliados[nome]
+        if nome not in self._nos:
+            raise KeyError(f"'{nome}' não foi definido no grafo da página {self.pagina} "
+                           "(entrada de widget avaliada antes do widget?)")
+
+        no = self._nos[nome]
+        avaliadas = [self._avaliar(entrada) for entrada in no.entradas]
+        assinatura = tuple(a for a, _ in avaliadas)
+
+        guardado = None if no.compartilhado else self._memoria.get(nome)
+        if guardado is not None and guardado[0] == assinatura:
+            self._execucoes.append({'no': nome, 'calculado': False, 'motivo': '', 'duracao_s': 0.0})
+            self._avaliados[nome] = guardado
+            return guardado
+
+        if no.compartilhado:
+            motivo = 'cache compartilhado'
+        elif guardado is None:
+            motivo = 'primeira execução'
+        else:
+            motivo = ', '.join(e for e, antiga, nova in zip(no.entradas, guardado[0], assinatura)
+                               if antiga != nova)
+        inicio = time.perf_counter()
+        valor = no.funcao(*(v for _, v in avaliadas))
+        self._execucoes.append({'no': nome, 'calculado': not no.compartilhado, 'motivo': motivo,
+                                'duracao_s': time.perf_counter() - inicio})
+
+        self._avaliados[nome] = (assinatura, valor)
+        if not no.compartilhado:
+            self._memoria[nome] = self._avaliados[nome]
+        return assinatura, valor
+
+    def obter(self, nome: str) -> Any:
+        """
+        Valor de um nó, recalculado só se alguma entrada mudou desde o último rerun
+
+        Os valores são compartilhados entre reruns: não os modifique.
+
+        Args:
+            nome: Nome do nó (ou de uma entrada)
+
+        Returns:
+            Valor do nó
+        """
+        return self._avaliar(nome)[1]
+
+    def execucoes(self) -> pd.DataFrame:
+        """
+        Nós avaliados neste rerun
+
+        Returns:
+            DataFrame com 'no', 'entradas', 'calculado', 'motivo' e
+            'duracao_s', na ordem de avaliação (as dependências antes)
+        """
+        execucoes = pd.DataFrame(self._execucoes, columns=['no', 'calculado', 'motivo', 'duracao_s'])
+        execucoes.insert(1, 'entradas', execucoes['no'].map(lambda n: ', '.join(self._nos[n].entradas)))
+        return execucoes
+
+    def dot(self) -> str:
+        """Grafo em DOT (st.graphviz_chart): calculados em vermelho, reaproveitados em verde"""
+        calculados = {e['no'] for e in self._execucoes if e['calculado']}
+        avaliados = {e['no'] for e in self._execucoes}
+        linhas = ['digraph {', 'rankdir=LR;', 'node [shape=box, style=filled, fontsize=10];']
+        for nome in self._entradas:
+            linhas.append(f'"{nome}" [shape=ellipse, fillcolor="#e9ecef"];')
+        for nome, no in self._nos.items():
+            cor = '#f8d7da' if nome in calculados else '#d4edda' if nome in avaliados else 'white'
+            linhas.append(f'"{nome}" [fillcolor="{cor}"];')
+            linhas.extend(f'"{entrada}" -> "{nome}";' for entrada in no.entradas)
+        linhas.append('}')
+        return '\n'.join(linhas)
+
+
+def exibir_grafo(grafo: GrafoCalculos) -> pd.DataFrame:
+    """
+    Exibe na barra lateral os nós calculados e reaproveitados no rerun
+
+    Deve ser chamada ao fim do script da página, depois de todos os obter.
+
+    Args:
+        grafo: Grafo da página
+
+    Returns:
+        Saída de GrafoCalculos.execucoes
+    """
+    execucoes = grafo.execucoes()
+    calculados = execucoes[execucoes['calculado']]
+
+    with st.sidebar.expander("🧮 Grafo de cálculos"):
+        st.caption(f"{len(calculados)} de {len(execucoes)} nós recalculados "
+                   f"em {calculados['duracao_s'].sum() * 1000:.0f} ms")
+        if not execucoes.empty:
+            tabela = execucoes.assign(
+                Status=execucoes['calculado'].map({True: 'calculado', False: 'reaproveitado'}),
+                ms=(execucoes['duracao_s'] * 1000).round(1)
+            )
+            st.dataframe(
+                tabela[['no', 'Status', 'ms', 'motivo', 'entradas']].rename(columns={
+                    'no': 'Nó', 'motivo': 'Motivo', 'entradas': 'Entradas'
+                }),
+                hide_index=True, use_container_width=True
+            )
+        st.graphviz_chart(grafo.dot(), use_container_width=True)
+
+    return execucoes
@@ -0,0 +1,324 @@
+"""
+Validação e deduplicação de registros de incêndios na ingestão
+
+Relatos reenviados pelo sistema de campo geram linhas repetidas que inflam
+a frequência e a área queimada. Em vez de rodar duplicated() sobre todo o
+histórico a cada carga, cada lote recebido passa por uma etapa de ingestão:
+
+1. Validação em bloco: valores fora das faixas (LIMITES_VALIDACAO, com as
+   faixas do FWI de FWI_DESCRIPTIONS), meses fora de MONTH_ORDER, dias da
+   semana desconhecidos, valores ausentes ou não numéricos e, se houver a
+   coluna de data, datas inválidas ou que não batem com o mês e o dia. As linhas
+   rejeitadas vão para o arquivo de quarentena com o motivo.
+2. Deduplicação: um hash de 64 bits por linha (vetorizado) é procurado no
+   conjunto de hashes já aceitos, persistido em disco. Só o lote novo é
+   processado: o custo acompanha o tamanho do lote, não o do histórico.
+
+Uso:
+    python -m src.ingestao --origem relatos_hoje.csv [--destino data/forestfires.csv]
+"""
+
+import argparse
+import logging
+import re
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.utils import (
+    ler_forestfires_em_blocos, calcular_hashes, CSV_PATH, COLUNA_DATA, ESQUEMA_FORESTFIRES,
+    FWI_DESCRIPTIONS, MONTH_ORDER
+)
+
+
+logger = logging.getLogger(__name__)
+
+DIRETORIO_INGESTAO = Path(__file__).parent.parent / "data" / "ingestao"
+ARQUIVO_HASHES = "hashes.u64"
+ARQUIVO_QUARENTENA = "quarentena.csv"
+
+COLUNAS_REGISTRO = ESQUEMA_FORESTFIRES.names
+TIPOS_REGISTRO = ESQUEMA_FORESTFIRES.empty_table().to_pandas().dtypes.to_dict()
+
+COLUNAS_INTEIRAS = [c for c, tipo in TIPOS_REGISTRO.items() if pd.api.types.is_integer_dtype(tipo)]
+
+DIAS_SEMANA = ['mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun']
+MESES_NUMERO = {mes: i + 1 for i, mes in enumerate(MONTH_ORDER)}
+DIAS_NUMERO = {dia: i for i, dia in enumerate(DIAS_SEMANA)}
+
+
+def _faixas_fwi() -> Dict[str, Tuple[float, float]]:
+    """Faixas documentadas em FWI_DESCRIPTIONS (ex: "18.7 - 96.2")"""
+    faixas = {}
+    for codigo, descricao in FWI_DESCRIPTIONS.items():
+        minimo, maximo = re.findall(r'\d+(?:\.\d+)?', descricao['range'])
+        faixas[codigo.lower()] = (float(minimo), float(maximo))
+    return faixas
+
+
+# Faixa válida (mínimo, máximo) de cada coluna numérica; None = sem limite
+LIMITES_VALIDACAO: Dict[str, Tuple[Optional[float], Optional[float]]] = {
+    'x': (1, None),
+    'y': (1, None),
+    **_faixas_fwi(),
+    'temp': (-30, 50),
+    'rh': (0, 100),
+    'wind': (0, None),
+    'rain': (0, None),
+    'area': (0, None)
+}
+
+# Compacta os hashes recentes no vetor principal quando passam desta fração
+FRACAO_COMPACTACAO = 0.125
+
+
+def _pertence(ordenado: np.ndarray, valores: np.ndarray) -> np.ndarray:
+    """Pertinência vetorizada de valores num vetor ordenado (busca binária)"""
+    if len(ordenado) == 0:
+        return np.zeros(len(valores), dtype=bool)
+    posicoes = np.searchsorted(ordenado, valores)
+    return ordenado[np.minimum(posicoes, len(ordenado) - 1)] == valores
+
+
+class ConjuntoHashes:
+    """
+    Conjunto de hashes de 64 bits com pertinência vetorizada e persistência incremental
+
+    Os hashes ficam em dois vetores ordenados: o principal e um menor com os
+    recentes, que é fundido ao principal só quando cresce. Em disco, cada
+    lote aceito é anexado ao arquivo (8 bytes por hash), sem regravar o
+    conjunto.
+    """
+
+    def __init__(self, caminho: Optional[Path] = None):
+        self.caminho = Path(caminho) if caminho is not None else None
+        self._principal = np.empty(0, dtype=np.uint64)
+        self._recentes = np.empty(0, dtype=np.uint64)
+        if self.caminho is not None and self.caminho.exists():
+            self._principal = np.unique(np.fromfile(self.caminho, dtype=np.uint64))
+
+    def __len__(self) -> int:
+        return len(self._principal) + len(self._recentes)
+
+    def contem(self, hashes: np.ndarray) -> np.ndarray:
+        """Máscara dos hashes já presentes no conjunto"""
+        return _pertence(self._principal, hashes) | _pertence(self._recentes, hashes)
+
+    def adicionar(self, hashes: np.ndarray) -> None:
+        """
+        Adiciona hashes novos (ausentes do conjunto e sem repetição)
+
+        Args:
+            hashes: Vetor uint64
+        """
+        if len(hashes) == 0:
+            return
+        self._recentes = np.union1d(self._recentes, hashes)
+        if len(self._recentes) > FRACAO_COMPACTACAO * len(self._principal):
+            self._principal = np.union1d(self._principal, self._recentes)
+            self._recentes = np.empty(0, dtype=np.uint64)
+
+        if self.caminho is not None:
+            self.caminho.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.caminho, 'ab') as arquivo:
+                np.asarray(hashes, dtype=np.uint64).tofile(arquivo)
+
+
+def _colunas(df: pd.DataFrame) -> List[str]:
+    """Colunas do registro presentes em df (a data é opcional)"""
+    return COLUNAS_REGISTRO + [COLUNA_DATA] if COLUNA_DATA in df.columns else COLUNAS_REGISTRO
+
+
+def validar_registros(df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.Series]:
+    """
+    Valida um lote de registros em bloco
+
+    Args:
+        df: Registros no esquema de forestfires.csv (colunas padronizadas),
+            com os valores como lidos do arquivo
+
+    Returns:
+        Tupla (validos, motivos): registros válidos com os tipos de
+        ESQUEMA_FORESTFIRES (data como datetime) e, para os inválidos, os motivos separados por
+        vírgula (indexados como em df)
+
+    Raises:
+        ValueError: Colunas obrigatórias ausentes
+    """
+    faltantes = [c for c in COLUNAS_REGISTRO if c not in df.columns]
+    if faltantes:
+        raise ValueError(f"Colunas ausentes: {', '.join(faltantes)}")
+
+    convertidos = {c: pd.to_numeric(df[c], errors='coerce') for c in LIMITES_VALIDACAO}
+    falhas = {}
+    for coluna, (minimo, maximo) in LIMITES_VALIDACAO.items():
+        valores = convertidos[coluna]
+        falha = valores.isna()
+        if minimo is not None:
+            falha |= valores < minimo
+        if maximo is not None:
+            falha |= valores > maximo
+        if coluna in COLUNAS_INTEIRAS:
+            falha |= valores % 1 != 0
+        falhas[coluna] = falha.to_numpy()
+    falhas['month'] = ~df['month'].isin(MONTH_ORDER).to_numpy()
+    falhas['day'] = ~df['day'].isin(DIAS_SEMANA).to_numpy()
+    if COLUNA_DATA in df.columns:
+        datas = pd.to_datetime(df[COLUNA_DATA], errors='coerce')
+        convertidos[COLUNA_DATA] = datas
+        falhas[COLUNA_DATA] = (datas.isna()
+                               | (datas.dt.month != df['month'].map(MESES_NUMERO))
+                               | (datas.dt.weekday != df['day'].map(DIAS_NUMERO))).to_numpy()
+
+    nomes = np.array(list(falhas))
+    matriz = np.column_stack(list(falhas.values()))
+    invalido = matriz.any(axis=1)
+
+    # Texto do motivo só para as linhas rejeitadas
+    motivos = pd.Series([', '.join(nomes[linha]) for linha in matriz[invalido]],
+                        index=df.index[invalido], dtype='str')
+
+    validos = df.assign(**convertidos)[_colunas(df)][~invalido].astype(TIPOS_REGISTRO)
+    return validos, motivos
+
+
+class Ingestao:
+    """
+    Etapa de ingestão: valida, deduplica e registra os lotes recebidos
+
+    Com diretorio=None, o conjunto de hashes fica só em memória e as linhas
+    inválidas são apenas contadas (sem arquivo de quarentena).
+    """
+
+    def __init__(self, diretorio: Optional[Path] = DIRETORIO_INGESTAO):
+        self.diretorio = Path(diretorio) if diretorio is not None else None
+        self.hashes = ConjuntoHashes(self.diretorio / ARQUIVO_HASHES if self.diretorio else None)
+
+    @property
+    def caminho_quarentena(self) -> Optional[Path]:
+        return self.diretorio / ARQUIVO_QUARENTENA if self.diretorio is not None else None
+
+    def registrar_existentes(self, df: pd.DataFrame) -> int:
+        """
+        Adiciona ao conjunto os hashes de registros já armazenados, sem validá-los
+
+        Registros repetidos no histórico são sinalizados no log; a leitura do
+        arquivo (load_forestfires) já os descarta pelo mesmo hash.
+
+        Args:
+            df: Registros já aceitos (ex: o histórico atual)
+
+        Returns:
+            Número de hashes novos
+        """
+        validos, _ = validar_registros(df)
+        hashes = np.unique(calcular_hashes(validos))
+        novos = hashes[~self.hashes.contem(hashes)]
+        self.hashes.adicionar(novos)
+        if len(novos) < len(validos):
+            logger.warning("%d registros repetidos no histórico (descartados na leitura)",
+                           len(validos) - len(novos))
+        return len(novos)
+
+    def ingerir(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, Dict]:
+        """
+        Processa um lote: valida, descarta duplicatas e registra os aceitos
+
+        Args:
+            df: Lote no esquema de forestfires.csv (colunas padronizadas)
+
+        Returns:
+            Tupla (aceitos, resumo): registros aceitos, com os tipos de
+            ESQUEMA_FORESTFIRES, e dicionário com 'recebidos', 'aceitos',
+            'duplicados' e 'quarentena'
+        """
+        validos, motivos = validar_registros(df)
+
+        hashes = calcular_hashes(validos)
+        # Primeira ocorrência de cada hash no lote e ausente do histórico
+        _, primeiros = np.unique(hashes, return_index=True)
+        unico = np.zeros(len(hashes), dtype=bool)
+        unico[primeiros] = True
+        aceito = unico & ~self.hashes.contem(hashes)
+
+        self.hashes.adicionar(hashes[aceito])
+        if len(motivos):
+            self._quarentenar(df.loc[motivos.index], motivos)
+
+        resumo = {
+            'recebidos': len(df),
+            'aceitos': int(aceito.sum()),
+            'duplicados': int(len(validos) - aceito.sum()),
+            'quarentena': len(motivos)
+        }
+        if resumo['duplicados'] or resumo['quarentena']:
+            logger.info("Ingestão: %(recebidos)d recebidos, %(aceitos)d aceitos, "
+                        "%(duplicados)d duplicados, %(quarentena)d em quarentena", resumo)
+        return validos[aceito].reset_index(drop=True), resumo
+
+    def _quarentenar(self, rejeitados: pd.DataFrame, motivos: pd.Series) -> None:
+        """Anexa as linhas rejeitadas ao arquivo de quarentena"""
+        if self.caminho_quarentena is None:
+            return
+        registro = rejeitados[_colunas(rejeitados)].assign(
+            motivo=motivos, recebido_em=datetime.now().isoformat(timespec='seconds')
+        )
+        self.caminho_quarentena.parent.mkdir(parents=True, exist_ok=True)
+        novo = not self.caminho_quarentena.exists()
+        registro.to_csv(self.caminho_quarentena, mode='a', header=novo, index=False)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Valida, deduplica e anexa lotes de relatos de incêndios ao arquivo de dados"
+    )
+    parser.add_argument('--origem', type=Path, nargs='+', required=True,
+                        help="Lotes recebidos (CSV no esquema de forestfires.csv, opcionalmente comprimidos)")
+    parser.add_argument('--destino', type=Path, default=CSV_PATH,
+                        help="Arquivo de dados ao qual os registros aceitos são anexados")
+    parser.add_argument('--diretorio', type=Path, default=DIRETORIO_INGESTAO,
+                        help="Diretório do conjunto de hashes e da quarentena")
+    args = parser.parse_args(argv)
+
+    ingestao = Ingestao(args.diretorio)
+    if len(ingestao.hashes) == 0 and args.destino.exists():
+        # Primeira execução: o histórico atual define o que já foi recebido
+        registrados = sum(ingestao.registrar_existentes(bloco) for bloco in ler_forestfires_em_blocos(args.destino))
+        print(f"{registrados:,} registros existentes em {args.destino} registrados")
+
+    # Cabeçalho do destino: os lotes são anexados na ordem dessas colunas
+    cabecalho = None
+    if args.destino.exists():
+        cabecalho = list(pd.read_csv(args.destino, nrows=0).columns.str.lower().str.strip())
+
+    for origem in args.origem:
+        lote = pd.read_csv(origem)
+        lote.columns = lote.columns.str.lower().str.strip()
+        if cabecalho is not None and set(_colunas(lote)) != set(cabecalho):
+            print(f"Erro em {origem}: colunas {sorted(_colunas(lote))} diferem das de "
+                  f"{args.destino} ({sorted(cabecalho)})", file=sys.stderr)
+            return 1
+        try:
+            aceitos, resumo = ingestao.ingerir(lote)
+        except ValueError as erro:
+            print(f"Erro em {origem}: {erro}", file=sys.stderr)
+            return 1
+        if cabecalho is None:
+            cabecalho = list(aceitos.columns)
+            aceitos.to_csv(args.destino, index=False)
+        else:
+            aceitos[cabecalho].to_csv(args.destino, mode='a', header=False, index=False)
+        print(f"{origem}: {resumo['aceitos']:,} aceitos, {resumo['duplicados']:,} duplicados, "
+              f"{resumo['quarentena']:,} em quarentena")
+
+    if ingestao.caminho_quarentena.exists():
+        print(f"Quarentena: {ingestao.caminho_quarentena}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,197 @@
+"""
+Agregados em janelas móveis (últimos 7, 30 e 365 dias) por célula do grid
+
+Com a coluna de data (COLUNA_DATA), a área queimada e a contagem de
+incêndios de cada célula (X, Y) nas janelas móveis são mantidas
+incrementalmente pela JanelasMoveis: um anel de baldes diários por célula
+guarda o último ano, e os totais de cada janela são atualizados ao incluir
+registros e ao avançar o dia de referência (o balde que sai da janela é
+subtraído). Responder "últimos 30 dias" custa O(células), sem reler os
+registros.
+
+O dia de referência é a data mais recente recebida, não a data do sistema:
+os dados históricos continuam com janelas preenchidas.
+"""
+
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from src.utils import COLUNA_DATA, MAX_ENTRADAS_CACHE, MONTH_MAP, MONTH_ORDER
+
+
+JANELAS_DIAS = (7, 30, 365)
+
+
+class JanelasMoveis:
+    """
+    Totais de incêndios e área queimada por célula em janelas móveis de dias
+
+    Estado: baldes diários em anel (dias x células) para a maior janela e,
+    para cada janela, os totais correntes por célula. Registros mais antigos
+    que a maior janela (em relação ao dia de referência) são ignorados.
+    """
+
+    def __init__(self, janelas: Sequence[int] = JANELAS_DIAS):
+        self.janelas = tuple(sorted(janelas))
+        self._dias = self.janelas[-1]
+        self._referencia: Optional[int] = None
+        self._criar_estado(0, 0)
+
+    def _criar_estado(self, lado_x: int, lado_y: int) -> None:
+        self._baldes_n = np.zeros((self._dias, lado_x, lado_y), dtype=np.int64)
+        self._baldes_area = np.zeros((self._dias, lado_x, lado_y))
+        self._totais_n = {j: np.zeros((lado_x, lado_y), dtype=np.int64) for j in self.janelas}
+        self._totais_area = {j: np.zeros((lado_x, lado_y)) for j in self.janelas}
+
+    def _garantir_celulas(self, lado_x: int, lado_y: int) -> None:
+        """Amplia o grid quando chegam coordenadas maiores que as já vistas"""
+        atual_x, atual_y = self._baldes_n.shape[1:]
+        if lado_x <= atual_x and lado_y <= atual_y:
+            return
+        extra = ((0, max(0, lado_x - atual_x)), (0, max(0, lado_y - atual_y)))
+        self._baldes_n = np.pad(self._baldes_n, ((0, 0),) + extra)
+        self._baldes_area = np.pad(self._baldes_area, ((0, 0),) + extra)
+        for j in self.janelas:
+            self._totais_n[j] = np.pad(self._totais_n[j], extra)
+            self._totais_area[j] = np.pad(self._totais_area[j], extra)
+
+    def _avancar(self, dia: int) -> None:
+        """Move o dia de referência, retirando das janelas os dias que saem delas"""
+        if self._referencia is None or dia - self._referencia >= self._dias:
+            self._baldes_n[:] = 0
+            self._baldes_area[:] = 0
+            for j in self.janelas:
+                self._totais_n[j][:] = 0
+                self._totais_area[j][:] = 0
+        else:
+            for novo in range(self._referencia + 1, dia + 1):
+                for j in self.janelas:
+                    saindo = (novo - j) % self._dias
+                    self._totais_n[j] -= self._baldes_n[saindo]
+                    self._totais_area[j] -= self._baldes_area[saindo]
+                # O balde do novo dia é o do dia que acabou de sair da maior janela
+                self._baldes_n[novo % self._dias] = 0
+                self._baldes_area[novo % self._dias] = 0
+        self._referencia = dia
+
+    def atualizar(self, df: pd.DataFrame) -> 'JanelasMoveis':
+        """
+        Inclui registros datados
+
+        Args:
+            df: Registros com 'x', 'y', 'area' e COLUNA_DATA (datetime); datas
+                ausentes são ignoradas
+
+        Returns:
+            O próprio acumulador
+        """
+        registros = df[df[COLUNA_DATA].notna()]
+        if registros.empty:
+            return self
+
+        dias = registros[COLUNA_DATA].to_numpy().astype('datetime64[D]').astype(np.int64)
+        ultimo = int(dias.max())
+        if self._referencia is None or ultimo > self._referencia:
+            self._avancar(ultimo)
+
+        idade = self._referencia - dias
+        recentes = idade < self._dias
+        idade = idade[recentes]
+        ix = registros['x'].to_numpy()[recentes] - 1
+        iy = registros['y'].to_numpy()[recentes] - 1
+        area = registros['area'].to_numpy(dtype=float)[recentes]
+        if len(ix) == 0:
+            return self
+        self._garantir_celulas(int(ix.max()) + 1, int(iy.max()) + 1)
+
+        balde = dias[recentes] % self._dias
+        np.add.at(self._baldes_n, (balde, ix, iy), 1)
+        np.add.at(self._baldes_area, (balde, ix, iy), area)
+        for j in self.janelas:
+            dentro = idade < j
+            np.add.at(self._totais_n[j], (ix[dentro], iy[dentro]), 1)
+            np.add.at(self._totais_area[j], (ix[dentro], iy[dentro]), area[dentro])
+        return self
+
+    @property
+    def referencia(self) -> Optional[pd.Timestamp]:
+        """Dia de referência (data mais recente recebida)"""
+        if self._referencia is None:
+            return None
+        return pd.Timestamp(np.datetime64(self._referencia, 'D'))
+
+    def totais(self, janela: int) -> pd.DataFrame:
+        """
+        Totais por célula numa janela, em O(células)
+
+        Args:
+            janela: Número de dias (um de self.janelas)
+
+        Returns:
+            DataFrame com 'x', 'y', 'area_count' e 'area_sum' das células com
+            incêndios na janela (mesmas colunas do grid achatado)
+        """
+        ix, iy = np.nonzero(self._totais_n[janela])
+        return pd.DataFrame({
+            'x': ix + 1,
+            'y': iy + 1,
+            'area_count': self._totais_n[janela][ix, iy],
+            'area_sum': self._totais_area[janela][ix, iy].round(2)
+        })
+
+    def resultado(self) -> Dict:
+        """
+        Instantâneo dos totais de todas as janelas (cópias, não mudam depois)
+
+        Returns:
+            Dicionário com 'referencia' (Timestamp) e 'janelas' ({dias: totais})
+        """
+        return {
+            'referencia': self.referencia,
+            'janelas': {j: self.totais(j) for j in self.janelas}
+        }
+
+
+@st.cache_data(max_entries=MAX_ENTRADAS_CACHE)
+def calcular_janelas(_df: pd.DataFrame, versao: str) -> Optional[Dict]:
+    """
+    Janelas móveis de todos os registros datados
+
+    Args:
+        _df: DataFrame de incêndios (excluído do hash do cache)
+        versao: Versão dos dados, usada como chave do cache
+
+    Returns:
+        Saída de JanelasMoveis.resultado, ou None se não houver datas
+    """
+    if COLUNA_DATA not in _df.columns or _df[COLUNA_DATA].isna().all():
+        return None
+    return JanelasMoveis().atualizar(_df).resultado()
+
+
+@st.cache_data(max_entries=MAX_ENTRADAS_CACHE)
+def agregar_por_ano_mes(_df: pd.DataFrame, versao: str) -> Optional[pd.DataFrame]:
+    """
+    Frequência e área queimada por ano e mês, sem misturar os anos
+
+    Args:
+        _df: DataFrame de incêndios (excluído do hash do cache)
+        versao: Versão dos dados, usada como chave do cache
+
+    Returns:
+        DataFrame com 'Ano', 'Mês', 'Frequência' e 'Área Total', em ordem de
+        mês, ou None se não houver datas
+    """
+    if COLUNA_DATA not in _df.columns or _df[COLUNA_DATA].isna().all():
+        return None
+    datados = _df[_df[COLUNA_DATA].notna()]
+    resumo = datados.groupby([datados[COLUNA_DATA].dt.year.rename('Ano'), 'month']).agg(
+        **{'Frequência': ('area', 'size'), 'Área Total': ('area', 'sum')}
+    ).reset_index()
+    resumo['ordem'] = resumo['month'].map(MONTH_ORDER.index)
+    resumo['Mês'] = resumo['month'].map(MONTH_MAP)
+    resumo['Ano'] = resumo['Ano'].astype(str)
+    return resumo.sort_values(['ordem', 'Ano']).drop(columns=['month', 'ordem']).reset_index(drop=True)
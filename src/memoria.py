@@ -0,0 +1,241 @@
+"""
+Contabilidade de memória por sessão e por processo
+
+O painel da barra lateral (exibir_memoria) mostra quanto a sessão retém (o
+DataFrame da página e o st.session_state) e quanto o processo inteiro usa:
+memória residente, pico, e os bytes guardados em cada cache do Streamlit
+(st.cache_data e st.cache_resource), somados por função.
+
+As estatísticas do st.cache_data já vêm em bytes (tamanho serializado). As
+do st.cache_resource só são bytes com server.enableExpensiveMemoryStats;
+sem isso o Streamlit informa a contagem de entradas. Por isso as funções em
+st.cache_resource usam o decorador medir_recurso: o objeto é medido uma
+vez, quando a entrada é criada, e o tamanho fica num registro até o objeto
+ser liberado.
+
+As medições da sessão e do processo só são feitas quando pedidas no painel
+(botão), não a cada rerun.
+
+Os DataFrames de dados são compartilhados entre as sessões (ver
+load_forestfires): o tamanho do quadro exibido é o do objeto comum, não
+uma cópia por sessão.
+"""
+
+import functools
+import sys
+import threading
+import types
+import weakref
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+from streamlit.runtime.caching import get_data_cache_stats_provider
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def tamanho_objeto(obj, _vistos: Optional[set] = None) -> int:
+    """
+    Estimativa dos bytes de um objeto e do que ele referencia
+
+    DataFrames e Series usam memory_usage(deep=True), arrays NumPy usam
+    nbytes, figuras Plotly são medidas pela especificação (dados dos traços,
+    layout e quadros), coleções e atributos de objetos são percorridos;
+    objetos já contados não se repetem.
+
+    Args:
+        obj: Objeto qualquer
+
+    Returns:
+        Tamanho aproximado em bytes
+    """
+    vistos = set() if _vistos is None else _vistos
+    if id(obj) in vistos:
+        return 0
+    vistos.add(id(obj))
+
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(deep=True).sum())
+    if isinstance(obj, pd.Series):
+        return int(obj.memory_usage(deep=True))
+    if isinstance(obj, np.ndarray):
+        return int(obj.nbytes)
+    if isinstance(obj, go.Figure):
+        return tamanho_objeto(obj.to_plotly_json(), vistos)
+    if isinstance(obj, dict):
+        return sys.getsizeof(obj) + sum(tamanho_objeto(k, vistos) + tamanho_objeto(v, vistos)
+                                        for k, v in obj.items())
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return sys.getsizeof(obj) + sum(tamanho_objeto(item, vistos) for item in obj)
+    if hasattr(obj, '__dict__') and not isinstance(obj, (type, types.ModuleType, types.FunctionType)):
+        return sys.getsizeof(obj) + tamanho_objeto(vars(obj), vistos)
+    return sys.getsizeof(obj)
+
+
+def _memoria_residente_mb() -> Optional[float]:
+    """Memória residente atual do processo em MB (Linux; None se indisponível)"""
+    try:
+        with open('/proc/self/statm') as arquivo:
+            paginas = int(arquivo.read().split()[1])
+    except OSError:
+        return None
+    return paginas * resource.getpagesize() / 1024 ** 2 if resource is not None else None
+
+
+def _memoria_pico_mb() -> Optional[float]:
+    """Pico de memória residente do processo em MB (None se indisponível)"""
+    if resource is None:
+        return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss é em KB no Linux e em bytes no macOS
+    return pico / 1024 ** 2 if sys.platform == 'darwin' else pico / 1024
+
+
+# Tamanhos medidos por medir_recurso: {função: {id do objeto: bytes}}
+_tamanhos_recursos: Dict[str, Dict[int, int]] = {}
+_trava_recursos = threading.Lock()
+
+
+def _alvo_referencia_fraca(valor: Any) -> Optional[Any]:
+    """Objeto cuja liberação marca a do valor (o próprio valor ou, num dicionário, um dos seus valores)"""
+    candidatos = [valor] + (list(valor.values()) if isinstance(valor, dict) else [])
+    for candidato in candidatos:
+        try:
+            weakref.ref(candidato)
+        except TypeError:
+            continue
+        return candidato
+    return None
+
+
+def _esquecer_recurso(funcao: str, chave: int) -> None:
+    with _trava_recursos:
+        _tamanhos_recursos.get(funcao, {}).pop(chave, None)
+
+
+def medir_recurso(funcao: Callable) -> Callable:
+    """
+    Decorador que mede, uma vez, cada objeto criado por uma função em st.cache_resource
+
+    Vai abaixo do @st.cache_resource: só roda quando a entrada é criada, não
+    nos acertos do cache. O tamanho (tamanho_objeto) fica registrado até o
+    objeto ser liberado, ao sair do cache sem outras referências.
+
+    Args:
+        funcao: Função decorada
+
+    Returns:
+        Função com a mesma assinatura, que registra o tamanho do resultado
+    """
+    @functools.wraps(funcao)
+    def medida(*args, **kwargs):
+        valor = funcao(*args, **kwargs)
+        alvo = _alvo_referencia_fraca(valor)
+        if alvo is not None:
+            chave = id(alvo)
+            with _trava_recursos:
+                _tamanhos_recursos.setdefault(funcao.__name__, {})[chave] = tamanho_objeto(valor)
+            weakref.finalize(alvo, _esquecer_recurso, funcao.__name__, chave)
+        return valor
+    return medida
+
+
+def memoria_caches() -> pd.DataFrame:
+    """
+    Bytes guardados nos caches do Streamlit, por função
+
+    Os bytes do st.cache_data vêm das estatísticas do Streamlit; os do
+    st.cache_resource, do registro de medir_recurso.
+
+    Returns:
+        DataFrame com 'cache' (st.cache_data ou st.cache_resource), 'funcao'
+        e 'bytes', do maior para o menor
+    """
+    linhas = []
+    estatisticas = get_data_cache_stats_provider().get_stats()
+    if isinstance(estatisticas, dict):
+        estatisticas = [item for familia in estatisticas.values() for item in familia]
+    for estatistica in estatisticas:
+        linhas.append({'cache': 'st.cache_data', 'funcao': estatistica.cache_name.rsplit('.', 1)[-1],
+                       'bytes': estatistica.byte_length})
+    with _trava_recursos:
+        for funcao, tamanhos in _tamanhos_recursos.items():
+            if tamanhos:
+                linhas.append({'cache': 'st.cache_resource', 'funcao': funcao,
+                               'bytes': sum(tamanhos.values())})
+    caches = pd.DataFrame(linhas, columns=['cache', 'funcao', 'bytes'])
+    return (caches.groupby(['cache', 'funcao'], as_index=False)['bytes'].sum()
+            .sort_values('bytes', ascending=False).reset_index(drop=True))
+
+
+def memoria_processo() -> Dict:
+    """
+    Memória do processo do servidor
+
+    Returns:
+        Dicionário com 'residente_mb', 'pico_mb' e 'caches' (ver memoria_caches)
+    """
+    return {
+        'residente_mb': _memoria_residente_mb(),
+        'pico_mb': _memoria_pico_mb(),
+        'caches': memoria_caches()
+    }
+
+
+def memoria_sessao(df: pd.DataFrame) -> Dict:
+    """
+    Memória retida pela sessão atual
+
+    Args:
+        df: DataFrame usado pela página
+
+    Returns:
+        Dicionário com 'quadro_bytes', 'estado_bytes' e 'estado' (bytes por
+        chave de st.session_state)
+    """
+    estado = {chave: tamanho_objeto(valor) for chave, valor in st.session_state.items()}
+    return {
+        'quadro_bytes': int(df.memory_usage(deep=True).sum()),
+        'estado_bytes': sum(estado.values()),
+        'estado': estado
+    }
+
+
+def exibir_memoria(df: pd.DataFrame) -> Optional[Dict]:
+    """
+    Exibe a memória da sessão e do processo na barra lateral, quando pedida
+
+    A medição percorre o st.session_state; ela só roda no rerun em que o
+    botão do painel é clicado.
+
+    Args:
+        df: DataFrame usado pela página
+
+    Returns:
+        Dicionário com 'sessao' (memoria_sessao) e 'processo'
+        (memoria_processo), ou None se a medição não foi pedida
+    """
+    with st.sidebar.expander("🧠 Memória"):
+        if not st.button("Medir memória", key="medir_memoria"):
+            st.caption("Mede o estado desta sessão e os caches do processo.")
+            return None
+        sessao = memoria_sessao(df)
+        processo = memoria_processo()
+        st.caption(f"Sessão: quadro de dados {sessao['quadro_bytes'] / 1024 ** 2:.1f} MB "
+                   f"(compartilhado), estado da sessão {sessao['estado_bytes'] / 1024:.1f} KB")
+        if processo['residente_mb'] is not None:
+            st.caption(f"Processo: {processo['residente_mb']:.0f} MB residentes "
+                       f"(pico {processo['pico_mb']:.0f} MB), "
+                       f"caches {processo['caches']['bytes'].sum() / 1024 ** 2:.1f} MB")
+        if not processo['caches'].empty:
+            tabela = processo['caches'].head(8).assign(MB=lambda c: (c['bytes'] / 1024 ** 2).round(2))
+            st.dataframe(tabela[['funcao', 'cache', 'MB']].rename(columns={'funcao': 'Função', 'cache': 'Cache'}),
+                         hide_index=True, use_container_width=True)
+
+    return {'sessao': sessao, 'processo': processo}
@@ -0,0 +1,602 @@
+"""
+Armazenamento particionado de incêndios de vários parques (estilo Hive)
+
+Os registros ficam em arquivos Parquet, um por parque, ano e mês:
+
+    data/particoes/parque=montesinho/ano=2000/mes=aug/dados.parquet
+
+listar_particoes só lê os nomes dos diretórios; a seleção de parque, anos
+e meses descarta as partições fora do filtro antes de abrir qualquer
+arquivo. Cada partição selecionada é lida e agregada uma única vez (cache
+por caminho e versão do arquivo), e os agregados da seleção são combinados
+a partir das somas parciais de cada partição, sem reagrupar os registros.
+Abrir o dashboard num parque custa tempo proporcional aos dados desse
+parque.
+
+Sem partições gravadas, as páginas continuam usando data/forestfires.csv.
+
+Uso:
+    python -m src.particoes --origem data/forestfires.csv --parque montesinho --ano 2000
+    python -m src.particoes --origem arquivo/2001/*.csv.gz --parque montesinho --ano 2001
+"""
+
+import argparse
+import hashlib
+import os
+import re
+import shutil
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import streamlit as st
+
+from src.utils import (
+    load_forestfires, obter_versao_dados, calcular_agregados, calcular_parciais, combinar_agregados,
+    ler_forestfires_arquivos, remover_duplicatas, converter_datas, COLUNA_DATA, CSV_PATH, MONTH_MAP, MONTH_ORDER
+)
+from src.correlacao import AcumuladorCovariancia, combinar_acumuladores, obter_acumulador_correlacao
+from src.memoria import medir_recurso
+from src.fontes import iniciar_carregamento
+from src.acompanhamento import acompanhador_ativo, dados_instantaneo, exibir_acompanhamento, INTERVALO_REFERENCIA_S
+from src.janelas import calcular_janelas
+from src.anomalias import calcular_anomalias
+from src.piramide import PiramideMapa, calcular_piramide
+
+
+DIRETORIO_PARTICOES = Path(__file__).parent.parent / "data" / "particoes"
+ARQUIVO_PARTICAO = "dados.parquet"
+
+PADRAO_PARQUE = re.compile(r'^[a-z0-9_-]+$')
+
+# Chaves em st.session_state com a seleção atual (compartilhada entre as páginas)
+CHAVE_PARQUE = 'dados_parque'
+CHAVE_ANOS = 'dados_anos'
+CHAVE_MESES = 'dados_meses'
+
+# Seleções (parque, anos, meses) mantidas concatenadas em cache
+MAX_SELECOES_CACHE = 4
+
+# Partições (parque, ano, mês) mantidas em cache, lidas ou resumidas: dez anos
+# de um parque. Menos que uma seleção inteira faria cada leitura expulsar as
+# partições da própria seleção
+MAX_PARTICOES_CACHE = 120
+
+
+# ========== GRAVAÇÃO E DESCOBERTA ==========
+
+def caminho_particao(parque: str, ano: int, mes: str,
+                     destino: Path = DIRETORIO_PARTICOES) -> Path:
+    """Arquivo da partição (parque, ano, mês)"""
+    return Path(destino) / f"parque={parque}" / f"ano={ano}" / f"mes={mes}" / ARQUIVO_PARTICAO
+
+
+def gravar_particoes(df: pd.DataFrame, parque: str, ano: int,
+                     destino: Path = DIRETORIO_PARTICOES) -> List[Path]:
+    """
+    Grava os registros de um parque e ano, um arquivo Parquet por mês
+
+    As partições existentes do mesmo parque, ano e mês são substituídas, e os
+    meses do parque e ano ausentes dos registros novos são removidos: regravar
+    um ano não deixa meses antigos para as seleções. Cada arquivo é gravado
+    num temporário e renomeado, para que uma página lendo a partição nunca
+    veja um arquivo pela metade. Registros repetidos são descartados
+    (remover_duplicatas), como em load_forestfires.
+
+    Args:
+        df: DataFrame no esquema de forestfires.csv
+        parque: Identificador do parque (letras minúsculas, dígitos, '_' ou '-')
+        ano: Ano dos registros
+        destino: Diretório raiz das partições
+
+    Returns:
+        Caminhos dos arquivos gravados
+
+    Raises:
+        ValueError: Identificador do parque inválido
+    """
+    if not PADRAO_PARQUE.match(parque):
+        raise ValueError(f"Parque inválido: {parque} (use letras minúsculas, dígitos, '_' ou '-')")
+
+    gravados = []
+    for mes, registros in remover_duplicatas(df).groupby('month', sort=False):
+        caminho = caminho_particao(parque, int(ano), mes, destino)
+        caminho.parent.mkdir(parents=True, exist_ok=True)
+        temporario = caminho.with_suffix('.tmp')
+        tabela = pa.Table.from_pandas(registros.reset_index(drop=True), preserve_index=False)
+        pq.write_table(tabela, temporario, compression='zstd')
+        os.replace(temporario, caminho)
+        gravados.append(caminho)
+
+    # Meses de uma gravação anterior do mesmo ano que não vieram agora
+    dir_ano = caminho_particao(parque, int(ano), MONTH_ORDER[0], destino).parent.parent
+    atuais = {caminho.parent for caminho in gravados}
+    for dir_mes in dir_ano.glob("mes=*"):
+        if dir_mes not in atuais:
+            shutil.rmtree(dir_mes)
+    return gravados
+
+
+def listar_particoes(destino: Path = DIRETORIO_PARTICOES) -> pd.DataFrame:
+    """
+    Lista as partições existentes a partir dos nomes dos diretórios
+
+    Nenhum arquivo de dados é aberto.
+
+    Args:
+        destino: Diretório raiz das partições
+
+    Returns:
+        DataFrame com 'parque', 'ano', 'mes' e 'caminho', ordenado por parque,
+        ano e mês do ano
+    """
+    linhas = []
+    for caminho in Path(destino).glob(f"parque=*/ano=*/mes=*/{ARQUIVO_PARTICAO}"):
+        dir_mes, dir_ano, dir_parque = caminho.parent, caminho.parent.parent, caminho.parent.parent.parent
+        mes = dir_mes.name.split('=', 1)[1]
+        ano = dir_ano.name.split('=', 1)[1]
+        if mes not in MONTH_ORDER or not ano.isdigit():
+            continue
+        linhas.append({
+            'parque': dir_parque.name.split('=', 1)[1],
+            'ano': int(ano),
+            'mes': mes,
+            'caminho': str(caminho)
+        })
+
+    particoes = pd.DataFrame(linhas, columns=['parque', 'ano', 'mes', 'caminho'])
+    ordem = particoes['mes'].map(MONTH_ORDER.index)
+    return (particoes.assign(ordem=ordem)
+            .sort_values(['parque', 'ano', 'ordem'])
+            .drop(columns='ordem')
+            .reset_index(drop=True))
+
+
+def selecionar_particoes(particoes: pd.DataFrame, parque: Optional[str] = None,
+                         anos: Optional[Sequence[int]] = None,
+                         meses: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """
+    Descarta as partições fora do filtro (poda), sem abrir arquivos
+
+    Args:
+        particoes: Retorno de listar_particoes
+        parque: Parque a manter (None = todos)
+        anos: Anos a manter (None = todos)
+        meses: Meses a manter (None = todos)
+
+    Returns:
+        Partições selecionadas, com a coluna 'versao' de cada arquivo
+    """
+    mascara = pd.Series(True, index=particoes.index)
+    if parque is not None:
+        mascara &= particoes['parque'] == parque
+    if anos is not None:
+        mascara &= particoes['ano'].isin(anos)
+    if meses is not None:
+        mascara &= particoes['mes'].isin(meses)
+
+    selecao = particoes[mascara].copy()
+    selecao['versao'] = [_versao_arquivo(Path(c)) for c in selecao['caminho']]
+    return selecao
+
+
+def _versao_arquivo(caminho: Path) -> str:
+    """Versão de um arquivo (mtime e tamanho), como em obter_versao_dados"""
+    stat = caminho.stat()
+    return f"{stat.st_mtime_ns}-{stat.st_size}"
+
+
+def versao_selecao(selecao: pd.DataFrame) -> str:
+    """
+    Versão de um conjunto de partições, usada como chave de cache das páginas
+
+    Muda quando uma partição entra ou sai da seleção ou quando algum arquivo
+    selecionado é regravado.
+
+    Args:
+        selecao: Retorno de selecionar_particoes
+
+    Returns:
+        String com a versão da seleção
+    """
+    assinatura = '\n'.join(f"{c}:{v}" for c, v in zip(selecao['caminho'], selecao['versao']))
+    return "particoes-" + hashlib.sha1(assinatura.encode('utf-8')).hexdigest()[:16]
+
+
+# ========== LEITURA E AGREGAÇÃO POR PARTIÇÃO ==========
+
+@st.cache_data(max_entries=MAX_PARTICOES_CACHE)
+def carregar_particao(caminho: str, versao: str) -> pd.DataFrame:
+    """
+    Lê uma partição, em cache por caminho e versão do arquivo
+
+    Args:
+        caminho: Arquivo da partição
+        versao: Versão do arquivo (ver selecionar_particoes)
+
+    Returns:
+        DataFrame no esquema de load_forestfires
+    """
+    return pd.read_parquet(caminho)
+
+
+@st.cache_resource(max_entries=MAX_SELECOES_CACHE)
+@medir_recurso
+def load_particoes(_selecao: pd.DataFrame, versao: str) -> pd.DataFrame:
+    """
+    Carrega os registros das partições selecionadas
+
+    Extensão de load_forestfires para o armazenamento particionado: só os
+    arquivos da seleção são lidos, e cada um vem do cache por partição.
+    Como em load_forestfires, o DataFrame é compartilhado (não o modifique).
+    Só as MAX_SELECOES_CACHE seleções mais recentes ficam em cache: cada
+    combinação de parque, anos e meses é uma concatenação própria.
+
+    Args:
+        _selecao: Retorno de selecionar_particoes (não entra na chave do cache)
+        versao: Versão da seleção (ver versao_selecao)
+
+    Returns:
+        DataFrame com dados de incêndios
+    """
+    partes = [carregar_particao(c, v) for c, v in zip(_selecao['caminho'], _selecao['versao'])]
+    if not partes:
+        return load_forestfires(CSV_PATH, obter_versao_dados()).iloc[:0]
+    return pd.concat(partes, ignore_index=True)
+
+
+@st.cache_data(max_entries=MAX_PARTICOES_CACHE)
+def calcular_parciais_particao(caminho: str, versao: str) -> pd.DataFrame:
+    """
+    Somas parciais de uma partição, em cache por caminho e versão do arquivo
+
+    Args:
+        caminho: Arquivo da partição
+        versao: Versão do arquivo
+
+    Returns:
+        Retorno de calcular_parciais para os registros da partição
+    """
+    return calcular_parciais(carregar_particao(caminho, versao))
+
+
+@st.cache_data(max_entries=MAX_SELECOES_CACHE)
+def calcular_agregados_particoes(_selecao: pd.DataFrame, versao: str) -> Dict:
+    """
+    Agregados das partições selecionadas, combinados das parciais em cache
+
+    Trocar a seleção só calcula as parciais das partições ainda não vistas.
+
+    Args:
+        _selecao: Retorno de selecionar_particoes (não entra na chave do cache)
+        versao: Versão da seleção (ver versao_selecao)
+
+    Returns:
+        Dicionário no formato de calcular_agregados
+    """
+    parciais = [calcular_parciais_particao(c, v)
+                for c, v in zip(_selecao['caminho'], _selecao['versao'])]
+    return combinar_agregados(pd.concat(parciais, ignore_index=True))
+
+
+@st.cache_resource(max_entries=MAX_PARTICOES_CACHE)
+@medir_recurso
+def obter_acumulador_particao(caminho: str, versao: str) -> AcumuladorCovariancia:
+    """
+    Acumulador de covariância de uma partição, em cache por caminho e versão
+
+    Args:
+        caminho: Arquivo da partição
+        versao: Versão do arquivo
+
+    Returns:
+        Acumulador com as variáveis de CORRELATION_VARS
+    """
+    return AcumuladorCovariancia().atualizar(carregar_particao(caminho, versao))
+
+
+def obter_acumulador_particoes(selecao: pd.DataFrame) -> AcumuladorCovariancia:
+    """
+    Acumulador de covariância das partições selecionadas
+
+    Equivalente a obter_acumulador_correlacao para o armazenamento
+    particionado: combina os acumuladores em cache de cada partição.
+
+    Args:
+        selecao: Retorno de selecionar_particoes
+
+    Returns:
+        Acumulador com as variáveis de CORRELATION_VARS
+    """
+    return combinar_acumuladores(
+        obter_acumulador_particao(c, v) for c, v in zip(selecao['caminho'], selecao['versao'])
+    )
+
+
+# ========== SELEÇÃO NAS PÁGINAS ==========
+
+def _manter_selecao(anterior: Optional[List], disponiveis: List) -> List:
+    """Mantém a seleção anterior válida; ao trocar de parque sem interseção, seleciona tudo"""
+    mantidos = [v for v in (anterior or []) if v in disponiveis]
+    return mantidos or disponiveis
+
+
+def _carregar_csv() -> Tuple[pd.DataFrame, str]:
+    """Dados e versão de forestfires.csv, do acompanhador quando ativo"""
+    acompanhador = acompanhador_ativo()
+    instantaneo = acompanhador.instantaneo() if acompanhador is not None else None
+    if instantaneo is not None:
+        return dados_instantaneo(instantaneo), instantaneo['versao']
+    # Dispara as fontes antes: a leitura do CSV corre junto com as opcionais e,
+    # com a mesma chave de cache, é feita uma só vez (a página espera por ela)
+    iniciar_carregamento()
+    versao = obter_versao_dados()
+    return load_forestfires(CSV_PATH, versao), versao
+
+
+def selecionar_dados() -> Tuple[pd.DataFrame, str, Optional[pd.DataFrame]]:
+    """
+    Exibe o seletor de parque e período na barra lateral e carrega os dados
+
+    A seleção é guardada em st.session_state e vale para todas as páginas.
+    Sem partições gravadas, nada é exibido e os dados vêm de forestfires.csv
+    (do acompanhamento incremental do arquivo, se estiver ativo). Sem
+    registros (ex: arquivo só com o cabeçalho), a página para com um aviso.
+
+    Returns:
+        Tupla (df, versao, selecao): dados selecionados, versão para as chaves
+        de cache e partições selecionadas (None quando vem do CSV)
+    """
+    particoes = listar_particoes()
+    if particoes.empty:
+        df, versao = _carregar_csv()
+        acompanhador = acompanhador_ativo()
+        if acompanhador is not None:
+            exibir_acompanhamento(versao)
+        if df.empty:
+            if acompanhador is not None:
+                st.info(f"Nenhum registro em {acompanhador.caminho.name} ainda. "
+                        "A página é atualizada quando chegarem registros.")
+            else:
+                st.info(f"Nenhum registro em {CSV_PATH.name}.")
+            st.stop()
+        return df, versao, None
+
+    parques = list(particoes['parque'].unique())
+    with st.sidebar:
+        st.markdown("---")
+        st.subheader("🗂️ Dados")
+        parque_atual = st.session_state.get(CHAVE_PARQUE)
+        parque = st.selectbox(
+            "Parque:", parques,
+            index=parques.index(parque_atual) if parque_atual in parques else 0
+        )
+
+        do_parque = particoes[particoes['parque'] == parque]
+        anos_disponiveis = sorted(do_parque['ano'].unique().tolist())
+        meses_disponiveis = [m for m in MONTH_ORDER if m in set(do_parque['mes'])]
+        anos = st.multiselect(
+            "Anos:", anos_disponiveis,
+            default=_manter_selecao(st.session_state.get(CHAVE_ANOS), anos_disponiveis)
+        )
+        meses = st.multiselect(
+            "Meses:", meses_disponiveis, format_func=MONTH_MAP.get,
+            default=_manter_selecao(st.session_state.get(CHAVE_MESES), meses_disponiveis)
+        )
+
+    st.session_state[CHAVE_PARQUE] = parque
+    st.session_state[CHAVE_ANOS] = anos
+    st.session_state[CHAVE_MESES] = meses
+
+    selecao = selecionar_particoes(particoes, parque, anos, meses)
+    if selecao.empty:
+        st.warning("Nenhum dado para a seleção. Escolha ao menos um ano e um mês na barra lateral.")
+        st.stop()
+
+    versao = versao_selecao(selecao)
+    return load_particoes(selecao, versao), versao, selecao
+
+
+def carregar_dados_padrao() -> Tuple[pd.DataFrame, str, Optional[pd.DataFrame]]:
+    """
+    Dados da seleção inicial das páginas (primeiro parque, todos os anos e meses)
+
+    Usada pelo aquecimento de cache, sem widgets.
+
+    Returns:
+        Tupla (df, versao, selecao) como em selecionar_dados
+    """
+    particoes = listar_particoes()
+    if particoes.empty:
+        return (*_carregar_csv(), None)
+    selecao = selecionar_particoes(particoes, particoes['parque'].iloc[0])
+    versao = versao_selecao(selecao)
+    return load_particoes(selecao, versao), versao, selecao
+
+
+def _do_instantaneo(versao: str, chave: str) -> Optional[Any]:
+    """
+    Item do instantâneo do acompanhador, se ele ainda corresponde à versão
+
+    Args:
+        versao: Versão dos dados usada pela página
+        chave: Chave do instantâneo (ver AcompanhadorCSV.instantaneo)
+
+    Returns:
+        Valor guardado, ou None se não houver acompanhamento ou se os dados
+        já mudaram desde a versão informada
+    """
+    acompanhador = acompanhador_ativo()
+    instantaneo = acompanhador.instantaneo() if acompanhador is not None else None
+    if instantaneo is None or instantaneo['versao'] != versao:
+        return None
+    return instantaneo[chave]
+
+
+def obter_agregados(df: pd.DataFrame, versao: str, selecao: Optional[pd.DataFrame]) -> Dict:
+    """
+    Agregados da seleção atual (ver selecionar_dados)
+
+    Args:
+        df: Dados selecionados
+        versao: Versão dos dados selecionados
+        selecao: Partições selecionadas (None = dados do CSV)
+
+    Returns:
+        Dicionário no formato de calcular_agregados
+    """
+    if selecao is not None:
+        return calcular_agregados_particoes(selecao, versao)
+    return _do_instantaneo(versao, 'agregados') or calcular_agregados(df, versao)
+
+
+def obter_acumulador(versao: str, selecao: Optional[pd.DataFrame]) -> AcumuladorCovariancia:
+    """
+    Acumulador de covariância da seleção atual (ver selecionar_dados)
+
+    Args:
+        versao: Versão dos dados selecionados
+        selecao: Partições selecionadas (None = dados do CSV)
+
+    Returns:
+        Acumulador com as variáveis de CORRELATION_VARS
+    """
+    if selecao is not None:
+        return obter_acumulador_particoes(selecao)
+    return _do_instantaneo(versao, 'acumulador') or obter_acumulador_correlacao(versao)
+
+
+def obter_janelas(df: pd.DataFrame, versao: str, selecao: Optional[pd.DataFrame]) -> Optional[Dict]:
+    """
+    Janelas móveis (últimos 7/30/365 dias) da seleção atual (ver selecionar_dados)
+
+    Args:
+        df: Dados selecionados
+        versao: Versão dos dados selecionados
+        selecao: Partições selecionadas (None = dados do CSV)
+
+    Returns:
+        Dicionário no formato de calcular_janelas, ou None se os dados não têm datas
+    """
+    janelas = _do_instantaneo(versao, 'janelas') if selecao is None else None
+    return janelas if janelas is not None else calcular_janelas(df, versao)
+
+
+def obter_anomalias(df: pd.DataFrame, versao: str, selecao: Optional[pd.DataFrame]) -> Dict:
+    """
+    Alertas de anomalia da seleção atual (ver selecionar_dados)
+
+    Args:
+        df: Dados selecionados
+        versao: Versão dos dados selecionados
+        selecao: Partições selecionadas (None = dados do CSV)
+
+    Returns:
+        Dicionário no formato de calcular_anomalias
+    """
+    anomalias = _do_instantaneo(versao, 'anomalias') if selecao is None else None
+    return anomalias if anomalias is not None else calcular_anomalias(df, versao)
+
+
+def obter_piramide(df: pd.DataFrame, versao: str, selecao: Optional[pd.DataFrame]) -> PiramideMapa:
+    """
+    Pirâmide do mapa de calor da seleção atual (ver selecionar_dados)
+
+    Args:
+        df: Dados selecionados
+        versao: Versão dos dados selecionados
+        selecao: Partições selecionadas (None = dados do CSV)
+
+    Returns:
+        PiramideMapa
+    """
+    piramide = _do_instantaneo(versao, 'piramide') if selecao is None else None
+    return piramide if piramide is not None else calcular_piramide(df, versao)
+
+
+def obter_referencia(df: pd.DataFrame, versao: str,
+                     selecao: Optional[pd.DataFrame]) -> Tuple[pd.DataFrame, str]:
+    """
+    Dados e versão para os cálculos pesados sobre todos os registros
+
+    No acompanhamento (--acompanhar) cada lote anexado gera uma versão nova.
+    O teste de permutação, a densidade KDE, a simulação e o índice de
+    similaridade não têm versão incremental; em vez de refazê-los a cada
+    lote, eles usam a referência do acompanhador, que avança no máximo a
+    cada INTERVALO_REFERENCIA_S. Sem acompanhamento, são os próprios dados.
+
+    Args:
+        df: Dados selecionados
+        versao: Versão dos dados selecionados
+        selecao: Partições selecionadas (None = dados do CSV)
+
+    Returns:
+        Tupla (df, versao) a usar nesses cálculos
+    """
+    referencia = _do_instantaneo(versao, 'referencia') if selecao is None else None
+    if referencia is None:
+        return df, versao
+    return dados_instantaneo(referencia), referencia['versao']
+
+
+def legendar_referencia(df_referencia: pd.DataFrame, versao_referencia: str, versao: str) -> None:
+    """Avisa abaixo de um resultado quando ele vem da referência (ver obter_referencia)"""
+    if versao_referencia != versao:
+        st.caption(f"⏱️ Calculado com {len(df_referencia):,} registros; no acompanhamento, "
+                   f"é refeito a cada {INTERVALO_REFERENCIA_S / 60:.0f} min.")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Grava registros de incêndios no armazenamento particionado (parque/ano/mês)"
+    )
+    parser.add_argument('--origem', type=Path, nargs='+', default=[CSV_PATH],
+                        help="CSV no esquema de forestfires.csv; vários arquivos (ex: um .csv.gz, "
+                             ".csv.bz2 ou .csv.xz por mês) são lidos em paralelo")
+    parser.add_argument('--parque', type=str,
+                        help="Parque dos registros (obrigatório se o CSV não tiver a coluna 'parque')")
+    parser.add_argument('--ano', type=int,
+                        help="Ano dos registros (obrigatório se o CSV não tiver a coluna 'ano' nem datas)")
+    parser.add_argument('--destino', type=Path, default=DIRETORIO_PARTICOES,
+                        help="Diretório raiz das partições")
+    args = parser.parse_args(argv)
+
+    if len(args.origem) == 1:
+        df = pd.read_csv(args.origem[0])
+        df.columns = df.columns.str.lower().str.strip()
+        converter_datas(df)
+    else:
+        # Colunas de forestfires.csv (e a data): parque e ano vêm das opções ou da data
+        df = ler_forestfires_arquivos(args.origem)
+
+    if 'parque' not in df.columns and args.parque is None:
+        parser.error("informe --parque ou inclua a coluna 'parque' no CSV")
+    if 'ano' not in df.columns and args.ano is None:
+        if COLUNA_DATA not in df.columns or df[COLUNA_DATA].isna().any():
+            parser.error(f"informe --ano ou inclua a coluna 'ano' (ou '{COLUNA_DATA}') no CSV")
+        df['ano'] = df[COLUNA_DATA].dt.year
+    if args.parque is not None:
+        df['parque'] = args.parque
+    if args.ano is not None:
+        df['ano'] = args.ano
+
+    total = 0
+    for (parque, ano), registros in df.groupby(['parque', 'ano']):
+        registros = remover_duplicatas(registros.drop(columns=['parque', 'ano']))
+        try:
+            gravados = gravar_particoes(registros, parque, ano, args.destino)
+        except ValueError as erro:
+            print(f"Erro: {erro}", file=sys.stderr)
+            return 1
+        total += len(gravados)
+        print(f"{parque}/{ano}: {len(registros):,} registros em {len(gravados)} partições")
+
+    print(f"{total} partições gravadas em {args.destino}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,249 @@
+"""
+Pirâmide de resoluções do mapa de calor, em tiles
+
+Com grids de coordenadas mais finos (ou vários parques), a matriz do mapa
+de calor em resolução total fica grande demais para enviar ao navegador.
+A PiramideMapa guarda rasters agregados (soma e máximo da área queimada,
+contagem de incêndios) em níveis de resolução sucessivamente reduzidos
+por 2 em cada eixo: no nível k cada célula agrega um bloco 2^k x 2^k de
+células (X, Y). Cada nível é dividido em tiles de TAMANHO_TILE x
+TAMANHO_TILE células, guardados só onde há incêndios. Há só os níveis
+necessários para o grid inteiro caber num tile (n_niveis); registros que
+ampliam o grid acrescentam níveis agregando o mais grosso existente.
+
+O mapa pede apenas o nível e a janela que correspondem ao zoom atual
+(janela): o nível é o mais fino em que a janela cabe em MAX_CELULAS_EIXO
+células por eixo, e só os tiles que a cruzam são lidos. O custo de exibir
+não depende da resolução dos dados.
+
+Registros anexados atualizam a pirâmide incrementalmente (atualizar):
+cada registro soma na sua célula de todos os níveis, e só os tiles tocados
+são copiados. A pirâmide anterior não muda (os demais tiles são
+compartilhados), então pode ser usada por outras sessões sem trava.
+"""
+
+import math
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from src.utils import MAX_ENTRADAS_CACHE
+from src.memoria import medir_recurso
+
+
+TAMANHO_TILE = 64
+# Máximo de células por eixo enviadas num mapa
+MAX_CELULAS_EIXO = 100
+
+# Canais de cada tile
+SOMA, CONTAGEM, MAXIMO = 0, 1, 2
+
+
+def n_niveis(nx: int, ny: int) -> int:
+    """Níveis até o grid (nx, ny) caber num único tile: ceil(log2(max(nx, ny) / TAMANHO_TILE)) + 1"""
+    return max(1, math.ceil(math.log2(max(nx, ny) / TAMANHO_TILE)) + 1)
+
+
+class PiramideMapa:
+    """
+    Pirâmide persistente de rasters de área queimada por célula
+
+    Estado: para cada nível, um dicionário {(tx, ty): tile}, em que o tile é
+    um array (3, TAMANHO_TILE, TAMANHO_TILE) com soma, contagem e máximo da
+    área, e os limites (x, y) dos registros recebidos.
+    """
+
+    def __init__(self):
+        self._niveis = [{}]
+        self.limites: Optional[Tuple[int, int, int, int]] = None
+        self.registros = 0
+
+    def atualizar(self, df: pd.DataFrame) -> 'PiramideMapa':
+        """
+        Pirâmide com os registros novos incluídos
+
+        Args:
+            df: Registros com 'x', 'y' (inteiros a partir de 1) e 'area'
+
+        Returns:
+            Nova pirâmide; a atual não é alterada
+        """
+        nova = PiramideMapa()
+        nova._niveis = [dict(nivel) for nivel in self._niveis]
+        nova.limites = self.limites
+        nova.registros = self.registros + len(df)
+        if df.empty:
+            return nova
+
+        x = df['x'].to_numpy(dtype=np.int64)
+        y = df['y'].to_numpy(dtype=np.int64)
+        area = df['area'].to_numpy(dtype=float)
+        limites = (int(x.min()), int(x.max()), int(y.min()), int(y.max()))
+        if nova.limites is not None:
+            limites = (min(limites[0], nova.limites[0]), max(limites[1], nova.limites[1]),
+                       min(limites[2], nova.limites[2]), max(limites[3], nova.limites[3]))
+        nova.limites = limites
+        while len(nova._niveis) < n_niveis(limites[1], limites[3]):
+            nova._niveis.append(nova._agregar_nivel(nova._niveis[-1]))
+
+        # Reduz os registros às células do nível 0; os demais níveis só
+        # recebem as células tocadas
+        celulas, inversa = np.unique((x - 1) << 32 | (y - 1), return_inverse=True)
+        soma = np.bincount(inversa, weights=area)
+        contagem = np.bincount(inversa).astype(float)
+        maximo = np.zeros(len(celulas))
+        np.maximum.at(maximo, inversa, area)
+        cx, cy = celulas >> 32, celulas & 0xFFFFFFFF
+
+        for k, nivel in enumerate(nova._niveis):
+            nova._somar_nivel(nivel, cx >> k, cy >> k, soma, contagem, maximo)
+        return nova
+
+    @staticmethod
+    def _somar_nivel(nivel: Dict, kx: np.ndarray, ky: np.ndarray, soma: np.ndarray,
+                     contagem: np.ndarray, maximo: np.ndarray) -> None:
+        """Soma células de um nível nos tiles, copiando cada tile tocado"""
+        tiles = (kx // TAMANHO_TILE) << 32 | (ky // TAMANHO_TILE)
+        posicao = (kx % TAMANHO_TILE) * TAMANHO_TILE + ky % TAMANHO_TILE
+        ordem = np.argsort(tiles, kind='stable')
+        ids, inicios = np.unique(tiles[ordem], return_index=True)
+
+        for id_tile, grupo in zip(ids, np.split(ordem, inicios[1:])):
+            chave = (int(id_tile >> 32), int(id_tile & 0xFFFFFFFF))
+            anterior = nivel.get(chave)
+            tile = (np.zeros((3, TAMANHO_TILE, TAMANHO_TILE)) if anterior is None
+                    else anterior.copy())
+            plano = tile.reshape(3, -1)
+            celulas = TAMANHO_TILE * TAMANHO_TILE
+            plano[SOMA] += np.bincount(posicao[grupo], weights=soma[grupo], minlength=celulas)
+            plano[CONTAGEM] += np.bincount(posicao[grupo], weights=contagem[grupo], minlength=celulas)
+            # A área só cresce com registros anexados: o máximo do bloco é o
+            # máximo entre o atual e o dos registros novos
+            np.maximum.at(plano[MAXIMO], posicao[grupo], maximo[grupo])
+            nivel[chave] = tile
+
+    @classmethod
+    def _agregar_nivel(cls, nivel: Dict) -> Dict:
+        """Nível seguinte, com blocos 2 x 2 das células ocupadas do nível dado"""
+        novo: Dict = {}
+        if not nivel:
+            return novo
+        kx, ky, canais = [], [], []
+        for (tx, ty), tile in nivel.items():
+            i, j = np.nonzero(tile[CONTAGEM])
+            kx.append(tx * TAMANHO_TILE + i)
+            ky.append(ty * TAMANHO_TILE + j)
+            canais.append(tile[:, i, j])
+        canais = np.concatenate(canais, axis=1)
+        cls._somar_nivel(novo, np.concatenate(kx) >> 1, np.concatenate(ky) >> 1,
+                         canais[SOMA], canais[CONTAGEM], canais[MAXIMO])
+        return novo
+
+    def escolher_nivel(self, x0: int, x1: int, y0: int, y1: int,
+                       max_celulas: int = MAX_CELULAS_EIXO) -> int:
+        """Nível mais fino em que a janela tem no máximo max_celulas por eixo"""
+        extensao = max(x1 - x0 + 1, y1 - y0 + 1)
+        for k in range(len(self._niveis)):
+            if -(-extensao // 2 ** k) <= max_celulas:
+                return k
+        return len(self._niveis) - 1
+
+    def janela(self, x0: int, x1: int, y0: int, y1: int,
+               max_celulas: int = MAX_CELULAS_EIXO) -> Dict:
+        """
+        Raster da janela no nível adequado, lendo só os tiles que a cruzam
+
+        Args:
+            x0, x1: Faixa de X (coordenadas originais, inclusivas)
+            y0, y1: Faixa de Y (coordenadas originais, inclusivas)
+            max_celulas: Máximo de células por eixo
+
+        Returns:
+            Dicionário com 'nivel', 'fator' (células originais por célula, por
+            eixo), 'x' e 'y' (centros das células em coordenadas originais) e
+            'soma', 'contagem' e 'maximo' (arrays [y, x], como no go.Heatmap)
+        """
+        k = self.escolher_nivel(x0, x1, y0, y1, max_celulas)
+        fator = 2 ** k
+        cx0, cx1 = (x0 - 1) >> k, (x1 - 1) >> k
+        cy0, cy1 = (y0 - 1) >> k, (y1 - 1) >> k
+        raster = np.zeros((3, cx1 - cx0 + 1, cy1 - cy0 + 1))
+
+        nivel = self._niveis[k]
+        for tx in range(cx0 // TAMANHO_TILE, cx1 // TAMANHO_TILE + 1):
+            for ty in range(cy0 // TAMANHO_TILE, cy1 // TAMANHO_TILE + 1):
+                tile = nivel.get((tx, ty))
+                if tile is None:
+                    continue
+                # Interseção do tile com a janela, em células do nível
+                ax0, ax1 = max(cx0, tx * TAMANHO_TILE), min(cx1, (tx + 1) * TAMANHO_TILE - 1)
+                ay0, ay1 = max(cy0, ty * TAMANHO_TILE), min(cy1, (ty + 1) * TAMANHO_TILE - 1)
+                raster[:, ax0 - cx0:ax1 - cx0 + 1, ay0 - cy0:ay1 - cy0 + 1] = tile[
+                    :, ax0 - tx * TAMANHO_TILE:ax1 - tx * TAMANHO_TILE + 1,
+                    ay0 - ty * TAMANHO_TILE:ay1 - ty * TAMANHO_TILE + 1
+                ]
+
+        centro = (fator - 1) / 2 + 1
+        return {
+            'nivel': k,
+            'fator': fator,
+            'x': np.arange(cx0, cx1 + 1) * fator + centro,
+            'y': np.arange(cy0, cy1 + 1) * fator + centro,
+            'soma': raster[SOMA].T,
+            'contagem': raster[CONTAGEM].T,
+            'maximo': raster[MAXIMO].T
+        }
+
+    def n_tiles(self) -> int:
+        """Número de tiles guardados em todos os níveis"""
+        return sum(len(nivel) for nivel in self._niveis)
+
+
+@st.cache_resource(max_entries=MAX_ENTRADAS_CACHE)
+@medir_recurso
+def calcular_piramide(_df: pd.DataFrame, versao: str) -> PiramideMapa:
+    """
+    Pirâmide do mapa de calor de todos os registros
+
+    A pirâmide é compartilhada entre as sessões (st.cache_resource) e não
+    muda depois de criada.
+
+    Args:
+        _df: DataFrame de incêndios (excluído do hash do cache)
+        versao: Versão dos dados, usada como chave do cache
+
+    Returns:
+        PiramideMapa
+    """
+    return PiramideMapa().atualizar(_df)
+
+
+def selecionar_janela(piramide: PiramideMapa, chave: str) -> Tuple[int, int, int, int]:
+    """
+    Controles de zoom e deslocamento do mapa de calor
+
+    Quando o grid inteiro cabe em MAX_CELULAS_EIXO células por eixo, o mapa
+    é exibido inteiro em resolução total e nenhum controle é mostrado.
+
+    Args:
+        piramide: Pirâmide exibida
+        chave: Prefixo das chaves dos widgets (único na página)
+
+    Returns:
+        Faixas (x0, x1, y0, y1) em coordenadas originais
+    """
+    if piramide.limites is None:
+        return 1, 1, 1, 1
+    x_min, x_max, y_min, y_max = piramide.limites
+    if max(x_max - x_min, y_max - y_min) + 1 <= MAX_CELULAS_EIXO:
+        return piramide.limites
+
+    with st.expander("🔍 Zoom do mapa", expanded=False):
+        st.caption("Estreite as faixas para aproximar; o mapa usa o nível de detalhe que cabe na janela.")
+        x0, x1 = st.slider("Faixa de X:", min_value=x_min, max_value=x_max,
+                           value=(x_min, x_max), key=f"{chave}_x")
+        y0, y1 = st.slider("Faixa de Y:", min_value=y_min, max_value=y_max,
+                           value=(y_min, y_max), key=f"{chave}_y")
+    return x0, x1, y0, y1
@@ -0,0 +1,306 @@
+"""
+Gera o dashboard como um pacote HTML estático, sem servidor Streamlit
+
+Reaproveita os agregados e os construtores de gráficos usados pelo app e
+pelas páginas de Contexto e Perguntas: os agregados são calculados uma vez
+e a renderização das figuras é distribuída num pool de processos. O
+resultado (index.html + plotly.min.js, e opcionalmente PNGs) pode ser
+servido por qualquer servidor de arquivos estáticos.
+
+As ferramentas interativas da Sessão 03 (simulação e busca de similares)
+dependem de entradas do analista e não entram no relatório. Os widgets das
+páginas são expandidos: cada critério de ranking e cada variável de
+comparação gera o seu próprio gráfico.
+
+Uso:
+    python -m src.relatorio --saida relatorio [--png] [--processos 4]
+"""
+
+import argparse
+import html
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pandas as pd
+import plotly.io as pio
+import plotly.offline
+
+from src.utils import (
+    load_forestfires, obter_versao_dados, calcular_agregados, calcular_densidade_kde,
+    CRITERIOS_REGIOES, LARGURA_BANDA_PADRAO, CSV_PATH
+)
+from src.correlacao import (
+    calcular_significancia_correlacoes, obter_acumulador_correlacao, CORRELATION_VARS
+)
+from src.graficos import (
+    achatar_colunas, gerar_graficos_resumo, criar_mapa_calor_area, criar_mapa_densidade,
+    criar_dispersao_localizacao, criar_ranking_regioes, criar_barras_frequencia_mensal,
+    criar_barras_area_mensal, criar_serie_comparacao, criar_boxplot_mensal,
+    criar_histograma_fwi, criar_mapa_correlacao, VARIAVEIS_COMPARACAO
+)
+from src.tabelas import formatar_tabela, FORMATO_TABELA_REGIOES, FORMATO_RESUMO_MENSAL
+
+
+# Componentes FWI com histograma na página de Contexto
+COMPONENTES_FWI = ['ffmc', 'dmc', 'dc', 'isi']
+
+# Permutações do teste de significância (valor padrão da página de Contexto)
+PERMUTACOES_RELATORIO = 5000
+
+MODELO_HTML = """<!DOCTYPE html>
+<html lang="pt-BR">
+<head>
+<meta charset="utf-8">
+<title>Dashboard de Incêndios Florestais - Parque Montesinho</title>
+<script src="plotly.min.js"></script>
+<style>
+    body {{ font-family: sans-serif; margin: 2rem auto; max-width: 1200px; color: #262730; }}
+    nav a {{ margin-right: 1rem; }}
+    h2 {{ border-bottom: 2px solid #E63946; padding-bottom: .3rem; margin-top: 3rem; }}
+    table {{ border-collapse: collapse; margin: 1rem 0; font-size: .9rem; }}
+    th, td {{ border: 1px solid #ddd; padding: .3rem .6rem; text-align: right; }}
+    th {{ background: #f0f2f6; }}
+    .rodape {{ color: #808495; font-size: .8rem; margin-top: 3rem; }}
+</style>
+</head>
+<body>
+<h1>🔥 Dashboard de Incêndios Florestais - Parque Montesinho</h1>
+<nav>{navegacao}</nav>
+{conteudo}
+<p class="rodape">Gerado em {gerado_em} a partir de {fonte} (versão {versao}).</p>
+</body>
+</html>
+"""
+
+
+def _tabela_html(df: pd.DataFrame, formato: Optional[Dict] = None, indice: bool = False) -> str:
+    """Converte um DataFrame em tabela HTML com a mesma formatação das páginas"""
+    return formatar_tabela(df, formato or {}).to_html(index=indice, border=0)
+
+
+def montar_secoes(df: pd.DataFrame, versao: str) -> List[Dict]:
+    """
+    Calcula os agregados uma vez e monta todas as figuras e tabelas do relatório
+
+    Args:
+        df: DataFrame com dados de incêndios
+        versao: Versão dos dados (ver obter_versao_dados)
+
+    Returns:
+        Lista de seções, cada uma com 'id', 'titulo' e 'itens'; cada item tem
+        'id', 'titulo' e 'figura' (JSON Plotly) ou 'tabela' (HTML)
+    """
+    agregados = calcular_agregados(df, versao)
+    kpis = agregados['kpis']
+    regioes = agregados['regioes']
+    monthly_data = agregados['resumo_mensal']
+
+    def figura(id_item: str, titulo: str, fig) -> Dict:
+        # JSON é mais barato de enviar aos processos que o objeto Figure
+        return {'id': id_item, 'titulo': titulo, 'figura': fig.to_json()}
+
+    def tabela(id_item: str, titulo: str, conteudo: str) -> Dict:
+        return {'id': id_item, 'titulo': titulo, 'tabela': conteudo}
+
+    # Resumo (app.py)
+    graficos_resumo = gerar_graficos_resumo(agregados, versao)
+    tabela_kpis = pd.DataFrame({
+        'Indicador': ['Total de Incêndios', 'Área Total Queimada (ha)', 'Mês Crítico', 'Região Crítica'],
+        'Valor': [
+            f"{kpis['total_incendios']}",
+            f"{kpis['area_total']:,.0f}",
+            kpis['mes_critico_nome'],
+            f"({kpis['regiao_critica'][0]}, {kpis['regiao_critica'][1]}) - {kpis['area_regiao_critica']:,.0f} ha"
+        ]
+    })
+    resumo = [
+        tabela('kpis', "Indicadores Principais", _tabela_html(tabela_kpis)),
+        figura('area_mensal', "Área Queimada por Mês", graficos_resumo['area_mensal']),
+        figura('frequencia_mensal', "Frequência de Incêndios por Mês", graficos_resumo['frequencia_mensal']),
+        figura('mapa_calor', "Mapa de Calor", graficos_resumo['mapa_calor'])
+    ]
+
+    # Contexto
+    contexto = [
+        figura(f'hist_{componente}', f"Distribuição {componente.upper()}", criar_histograma_fwi(df, componente))
+        for componente in COMPONENTES_FWI
+    ]
+    for metodo in ['pearson', 'spearman']:
+        correlacoes = calcular_significancia_correlacoes(
+            df, versao, tuple(CORRELATION_VARS), metodo, PERMUTACOES_RELATORIO
+        )
+        if metodo == 'pearson':
+            corr_matrix = obter_acumulador_correlacao(versao).correlacao()
+        else:
+            corr_matrix = correlacoes['correlacao']
+        contexto.append(figura(
+            f'correlacao_{metodo}', f"Correlação ({metodo.capitalize()})",
+            criar_mapa_correlacao(corr_matrix, correlacoes['p_valor'])
+        ))
+    estatisticas = df.describe()
+    contexto.append(tabela('estatisticas', "Resumo Estatístico", _tabela_html(estatisticas, {coluna: 2 for coluna in estatisticas.columns}, indice=True)))
+
+    # Perguntas
+    perguntas = [
+        figura('concentracao', "Onde ocorrem? Concentração de incêndios", criar_mapa_calor_area(
+            achatar_colunas(agregados['grid']),
+            titulo="Concentração de Área Queimada por Coordenadas (X, Y)",
+            titulo_barra="Área<br>Queimada (ha)"
+        ))
+    ]
+    densidade = calcular_densidade_kde(df, versao, LARGURA_BANDA_PADRAO)
+    for medida in ["Incêndios", "Área Queimada"]:
+        perguntas.append(figura(
+            f"densidade_{'incendios' if medida == 'Incêndios' else 'area'}",
+            f"Densidade Suavizada de {medida}",
+            criar_mapa_densidade(densidade, medida, LARGURA_BANDA_PADRAO)
+        ))
+    perguntas.append(figura('dispersao', "Localização dos Incêndios", criar_dispersao_localizacao(df)))
+
+    for i, (criterio, coluna) in enumerate(CRITERIOS_REGIOES.items()):
+        grid_sorted = regioes.sort_values(coluna, ascending=False)
+        perguntas.append(tabela(
+            f'top10_{i}', f"Top 10 Regiões Críticas (por {criterio})",
+            _tabela_html(grid_sorted.head(10), FORMATO_TABELA_REGIOES)
+        ))
+        perguntas.append(figura(f'ranking_{i}', f"Ranking - {criterio}", criar_ranking_regioes(grid_sorted, criterio)))
+
+    perguntas.append(figura('barras_frequencia', "Frequência por Mês", criar_barras_frequencia_mensal(monthly_data)))
+    perguntas.append(figura('barras_area', "Área Total por Mês", criar_barras_area_mensal(monthly_data)))
+    for i, variavel in enumerate(VARIAVEIS_COMPARACAO):
+        perguntas.append(figura(
+            f'comparacao_{i}', f"Frequência × {variavel}", criar_serie_comparacao(monthly_data, variavel)
+        ))
+    perguntas.append(figura('boxplot_mensal', "Distribuição de Áreas por Mês", criar_boxplot_mensal(df)))
+
+    monthly_display = monthly_data[['Mês', 'Frequência', 'Área Total', 'Área Média', 'Área Máxima',
+                                    'Temp Média', 'Umidade Média', 'FFMC Médio', 'ISI Médio']]
+    perguntas.append(tabela('resumo_mensal', "Resumo Mensal Detalhado",
+                            _tabela_html(monthly_display, FORMATO_RESUMO_MENSAL)))
+
+    return [
+        {'id': 'resumo', 'titulo': "📊 Resumo", 'itens': resumo},
+        {'id': 'contexto', 'titulo': "🌲 Contexto", 'itens': contexto},
+        {'id': 'perguntas', 'titulo': "❓ Perguntas", 'itens': perguntas}
+    ]
+
+
+def _renderizar_figura(id_item: str, figura_json: str, diretorio_png: Optional[Path]) -> Dict:
+    """
+    Renderiza uma figura em HTML (e PNG, se pedido) num processo do pool
+
+    Returns:
+        Dicionário com 'html' e 'erro_png' (None se o PNG foi gerado ou não pedido)
+    """
+    fig = pio.from_json(figura_json)
+    resultado = {
+        'html': fig.to_html(full_html=False, include_plotlyjs=False, div_id=id_item),
+        'erro_png': None
+    }
+
+    if diretorio_png is not None:
+        try:
+            fig.write_image(diretorio_png / f"{id_item}.png")
+        except Exception as erro:  # kaleido ausente ou sem navegador para exportar
+            resultado['erro_png'] = str(erro).strip().splitlines()[0] or repr(erro)
+
+    return resultado
+
+
+def gerar_relatorio(saida: Path, png: bool = False, n_processos: Optional[int] = None) -> Dict:
+    """
+    Gera o relatório estático completo em um diretório
+
+    Args:
+        saida: Diretório de saída (criado se não existir)
+        png: Exportar também cada figura em PNG (requer kaleido)
+        n_processos: Número de processos (None = CPUs disponíveis, 1 = sem pool)
+
+    Returns:
+        Dicionário com 'figuras', 'tabelas', 'duracao_s' e 'erros_png'
+    """
+    inicio = time.perf_counter()
+    saida.mkdir(parents=True, exist_ok=True)
+    diretorio_png = None
+    if png:
+        diretorio_png = saida / "png"
+        diretorio_png.mkdir(exist_ok=True)
+
+    versao = obter_versao_dados()
+    df = load_forestfires(CSV_PATH, versao)
+    secoes = montar_secoes(df, versao)
+
+    figuras = [item for secao in secoes for item in secao['itens'] if 'figura' in item]
+    ids = [item['id'] for item in figuras]
+    jsons = [item['figura'] for item in figuras]
+
+    if n_processos is None:
+        n_processos = min(os.cpu_count() or 1, len(figuras))
+
+    if n_processos <= 1:
+        renderizadas = [_renderizar_figura(i, j, diretorio_png) for i, j in zip(ids, jsons)]
+    else:
+        with ProcessPoolExecutor(max_workers=n_processos) as executor:
+            renderizadas = list(executor.map(
+                _renderizar_figura, ids, jsons, [diretorio_png] * len(figuras)
+            ))
+    html_figuras = dict(zip(ids, renderizadas))
+
+    blocos = []
+    for secao in secoes:
+        blocos.append(f'<h2 id="{secao["id"]}">{html.escape(secao["titulo"])}</h2>')
+        for item in secao['itens']:
+            blocos.append(f'<h3>{html.escape(item["titulo"])}</h3>')
+            blocos.append(html_figuras[item['id']]['html'] if 'figura' in item else item['tabela'])
+
+    navegacao = " ".join(
+        f'<a href="#{secao["id"]}">{html.escape(secao["titulo"])}</a>' for secao in secoes
+    )
+    (saida / "index.html").write_text(MODELO_HTML.format(
+        navegacao=navegacao,
+        conteudo="\n".join(blocos),
+        gerado_em=time.strftime("%Y-%m-%d %H:%M"),
+        fonte=html.escape(CSV_PATH.name),
+        versao=html.escape(versao)
+    ), encoding='utf-8')
+
+    # Uma única cópia do plotly.js para todas as figuras
+    (saida / "plotly.min.js").write_text(plotly.offline.get_plotlyjs(), encoding='utf-8')
+
+    erros_png = {i: r['erro_png'] for i, r in html_figuras.items() if r['erro_png']}
+    return {
+        'figuras': len(figuras),
+        'tabelas': sum(len(secao['itens']) for secao in secoes) - len(figuras),
+        'duracao_s': time.perf_counter() - inicio,
+        'erros_png': erros_png
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Gera o dashboard como relatório HTML estático")
+    parser.add_argument('--saida', type=Path, default=Path("relatorio"),
+                        help="Diretório de saída")
+    parser.add_argument('--png', action='store_true',
+                        help="Exportar também as figuras em PNG (requer kaleido)")
+    parser.add_argument('--processos', type=int,
+                        help="Número de processos de renderização (padrão: CPUs disponíveis)")
+    args = parser.parse_args(argv)
+
+    resultado = gerar_relatorio(args.saida, args.png, args.processos)
+    print(f"{resultado['figuras']} figuras e {resultado['tabelas']} tabelas em "
+          f"{resultado['duracao_s']:.1f} s -> {args.saida / 'index.html'}")
+
+    if resultado['erros_png']:
+        primeiro = next(iter(resultado['erros_png'].values()))
+        print(f"Falha ao exportar {len(resultado['erros_png'])} PNG(s): {primeiro}", file=sys.stderr)
+        return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
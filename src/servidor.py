@@ -0,0 +1,48 @@
+"""
+Inicia o servidor Streamlit com os caches pré-aquecidos
+
+O aquecimento roda numa thread do mesmo processo do servidor, começando
+assim que o runtime é criado, antes da chegada do primeiro analista.
+
+Com --acompanhar, data/forestfires.csv é acompanhado enquanto o servidor
+roda: registros anexados ao arquivo são incorporados incrementalmente e as
+sessões abertas são recarregadas (ver src.acompanhamento).
+
+Uso:
+    python -m src.servidor [--acompanhar] [opções do streamlit run, ex: --server.port 8502]
+"""
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+from streamlit.web import cli as stcli
+
+from src.aquecimento import iniciar_aquecimento
+from src.acompanhamento import iniciar_acompanhamento, INTERVALO_PADRAO_S
+
+
+APP_PATH = Path(__file__).parent.parent / "app.py"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(levelname)s %(message)s")
+
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument('--acompanhar', action='store_true')
+    parser.add_argument('--intervalo-acompanhamento', type=float, default=INTERVALO_PADRAO_S)
+    args, opcoes_streamlit = parser.parse_known_args(sys.argv[1:] if argv is None else argv)
+
+    # Antes do aquecimento, para que ele use os dados acompanhados
+    if args.acompanhar:
+        iniciar_acompanhamento(intervalo_s=args.intervalo_acompanhamento)
+    iniciar_aquecimento(aguardar_runtime=True)
+
+    sys.argv = ["streamlit", "run", str(APP_PATH), *opcoes_streamlit]
+    return stcli.main()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,199 @@
+"""
+Simulação Monte Carlo de propagação de incêndios no grid do Parque Montesinho
+
+Autômato celular estocástico e vetorizado: cada simulação é uma camada de
+um array (n_simulacoes, ny, nx) e todas avançam juntas a cada passo.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from src.utils import agregar_por_grid, MAX_ENTRADAS_CACHE
+
+
+# Variáveis do perfil histórico que determinam a propagação
+VARIAVEIS_PROPAGACAO = ['ffmc', 'isi', 'wind']
+
+# Tamanho de lote por tarefa enviada ao pool de processos
+SIMULACOES_POR_LOTE = 2500
+
+# Célula de ignição (X, Y) inicial da ferramenta de simulação
+IGNICAO_PADRAO = (7, 4)
+
+
+def ignicao_padrao(df: pd.DataFrame) -> Tuple[int, int]:
+    """
+    IGNICAO_PADRAO trazida para dentro da extensão do grid dos dados
+
+    Seleções de parque, anos ou meses podem não cobrir a célula (7, 4).
+
+    Args:
+        df: DataFrame com dados de incêndios
+
+    Returns:
+        Célula (x, y) mais próxima de IGNICAO_PADRAO dentro do grid
+    """
+    return tuple(int(np.clip(valor, df[eixo].min(), df[eixo].max()))
+                 for valor, eixo in zip(IGNICAO_PADRAO, ('x', 'y')))
+
+
+def calcular_probabilidades_propagacao(df: pd.DataFrame, prob_min: float = 0.05,
+                                       prob_max: float = 0.6) -> Dict:
+    """
+    Calcula a probabilidade de propagação para cada célula do grid
+
+    A probabilidade cresce linearmente com o perfil histórico médio de
+    FFMC, ISI e vento da célula (normalizados entre as células). Células
+    sem histórico recebem prob_min.
+
+    Args:
+        df: DataFrame com dados de incêndios
+        prob_min: Probabilidade para a célula de menor risco
+        prob_max: Probabilidade para a célula de maior risco
+
+    Returns:
+        Dicionário com eixos 'x' e 'y' e matriz (ny, nx) 'probabilidade'
+    """
+    grid_data = agregar_por_grid(df)
+
+    eixo_x = np.arange(df['x'].min(), df['x'].max() + 1)
+    eixo_y = np.arange(df['y'].min(), df['y'].max() + 1)
+
+    # Perfil normalizado de cada variável entre as células
+    scores = []
+    for var in VARIAVEIS_PROPAGACAO:
+        valores = grid_data[(var, 'mean')].to_numpy(dtype=float)
+        amplitude = valores.max() - valores.min()
+        scores.append((valores - valores.min()) / amplitude if amplitude > 0 else np.zeros_like(valores))
+    score = np.mean(scores, axis=0)
+
+    probabilidade = np.full((len(eixo_y), len(eixo_x)), prob_min)
+    iy = grid_data[('y', '')].to_numpy() - eixo_y[0]
+    ix = grid_data[('x', '')].to_numpy() - eixo_x[0]
+    probabilidade[iy, ix] = prob_min + (prob_max - prob_min) * score
+
+    return {'x': eixo_x, 'y': eixo_y, 'probabilidade': probabilidade}
+
+
+def _simular_lote(probabilidade: np.ndarray, ignicao: Tuple[int, int], n_simulacoes: int,
+                  max_passos: int, seed: np.random.SeedSequence) -> np.ndarray:
+    """
+    Executa um lote de simulações empilhadas e conta as queimas por célula
+
+    Args:
+        probabilidade: Matriz (ny, nx) de probabilidade de propagação
+        ignicao: Índices (iy, ix) da célula de ignição
+        n_simulacoes: Número de simulações do lote
+        max_passos: Número máximo de passos de propagação
+        seed: Semente do gerador aleatório do lote
+
+    Returns:
+        Matriz (ny, nx) com o número de simulações em que cada célula queimou
+    """
+    rng = np.random.default_rng(seed)
+    ny, nx = probabilidade.shape
+
+    queimando = np.zeros((n_simulacoes, ny, nx), dtype=bool)
+    queimando[:, ignicao[0], ignicao[1]] = True
+    queimado = queimando.copy()
+
+    # log(1 - p): com k vizinhos queimando, P(ignição) = 1 - (1 - p)^k
+    log_nao_propaga = np.log1p(-probabilidade)
+    vizinhos = np.zeros((n_simulacoes, ny, nx), dtype=np.int8)
+
+    for _ in range(max_passos):
+        if not queimando.any():
+            break
+
+        # Vizinhança de von Neumann (4 vizinhos) por deslocamento de arrays
+        vizinhos[:] = 0
+        vizinhos[:, 1:, :] += queimando[:, :-1, :]
+        vizinhos[:, :-1, :] += queimando[:, 1:, :]
+        vizinhos[:, :, 1:] += queimando[:, :, :-1]
+        vizinhos[:, :, :-1] += queimando[:, :, 1:]
+
+        prob_ignicao = -np.expm1(vizinhos * log_nao_propaga)
+        queimando = ~queimado & (rng.random((n_simulacoes, ny, nx)) < prob_ignicao)
+        queimado |= queimando
+
+    return queimado.sum(axis=0)
+
+
+def simular_propagacao(probabilidade: np.ndarray, ignicao: Tuple[int, int],
+                       n_simulacoes: int = 10000, max_passos: int = 50,
+                       seed: Optional[int] = None, n_processos: Optional[int] = None) -> np.ndarray:
+    """
+    Simula um conjunto de propagações e calcula o mapa de probabilidade de queima
+
+    As simulações são divididas em lotes distribuídos num pool de processos.
+    Cada lote recebe uma semente independente derivada de seed, de modo que o
+    resultado é reprodutível independentemente do número de processos.
+
+    Args:
+        probabilidade: Matriz (ny, nx) de probabilidade de propagação
+        ignicao: Índices (iy, ix) da célula de ignição
+        n_simulacoes: Número total de simulações
+        max_passos: Número máximo de passos de propagação
+        seed: Semente para reprodutibilidade
+        n_processos: Número de processos (None = CPUs disponíveis, 1 = sem pool)
+
+    Returns:
+        Matriz (ny, nx) com a fração de simulações em que cada célula queimou
+    """
+    n_lotes = max(1, int(np.ceil(n_simulacoes / SIMULACOES_POR_LOTE)))
+    tamanhos = [len(lote) for lote in np.array_split(np.arange(n_simulacoes), n_lotes)]
+    seeds = np.random.SeedSequence(seed).spawn(n_lotes)
+
+    if n_processos is None:
+        n_processos = min(os.cpu_count() or 1, n_lotes)
+
+    if n_processos <= 1:
+        contagens = [
+            _simular_lote(probabilidade, ignicao, tamanho, max_passos, s)
+            for tamanho, s in zip(tamanhos, seeds)
+        ]
+    else:
+        with ProcessPoolExecutor(max_workers=n_processos) as executor:
+            contagens = list(executor.map(
+                _simular_lote,
+                [probabilidade] * n_lotes, [ignicao] * n_lotes, tamanhos,
+                [max_passos] * n_lotes, seeds
+            ))
+
+    return np.sum(contagens, axis=0) / n_simulacoes
+
+
+@st.cache_data(max_entries=MAX_ENTRADAS_CACHE)
+def simular_mapa_queima(_df: pd.DataFrame, versao: str, ignicao_xy: Tuple[int, int],
+                        n_simulacoes: int = 10000, max_passos: int = 50,
+                        seed: int = 42) -> Dict:
+    """
+    Simula a propagação a partir de uma célula de ignição (X, Y) do parque
+
+    Args:
+        _df: DataFrame com dados de incêndios (não entra na chave do cache)
+        versao: Versão dos dados (ver obter_versao_dados)
+        ignicao_xy: Coordenadas (X, Y) da célula de ignição
+        n_simulacoes: Número total de simulações
+        max_passos: Número máximo de passos de propagação
+        seed: Semente para reprodutibilidade
+
+    Returns:
+        Dicionário com eixos 'x' e 'y', matrizes 'probabilidade' (propagação) e
+        'probabilidade_queima', e 'celulas_queimadas_media' por simulação
+    """
+    grade = calcular_probabilidades_propagacao(_df)
+    ignicao = (ignicao_xy[1] - grade['y'][0], ignicao_xy[0] - grade['x'][0])
+
+    mapa = simular_propagacao(grade['probabilidade'], ignicao, n_simulacoes, max_passos, seed)
+
+    return {
+        **grade,
+        'probabilidade_queima': mapa,
+        'celulas_queimadas_media': mapa.sum()
+    }
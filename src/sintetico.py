@@ -0,0 +1,278 @@
+"""
+Gerador de registros sintéticos de incêndios no esquema de forestfires.csv
+
+O modelo é ajustado aos dados reais: distribuição de meses, dias e células
+(X, Y), marginais empíricas por mês das variáveis FWI/meteorológicas ligadas
+por uma cópula gaussiana, e área queimada com massa em zero e cauda lognormal.
+Opcionalmente, cada registro recebe uma data (coluna 'date') num intervalo
+de anos, coerente com o mês sorteado; o dia da semana passa a vir da data.
+
+Uso:
+    python -m src.sintetico --linhas 10000000 --saida data/forestfires_sintetico.csv --seed 42
+    python -m src.sintetico --linhas 100000 --saida data/forestfires_datado.csv --anos 2000 2003
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+from scipy.special import ndtr, ndtri
+
+from src.utils import load_forestfires, obter_versao_dados, COLUNA_DATA, CSV_PATH, MONTH_ORDER
+
+
+# Variáveis contínuas geradas pela cópula, com as casas decimais do arquivo original
+VARIAVEIS_COPULA = {
+    'ffmc': 1, 'dmc': 1, 'dc': 1, 'isi': 1, 'temp': 1, 'rh': 0, 'wind': 1, 'rain': 1
+}
+
+DIAS_SEMANA = np.array(['mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun'])
+
+# Meses com menos registros usam a correlação agregada de todos os meses
+MIN_REGISTROS_CORRELACAO = 30
+
+
+def _escores_normais(valores: np.ndarray) -> np.ndarray:
+    """Transforma cada coluna em escores normais a partir dos postos (cópula gaussiana)"""
+    postos = pd.DataFrame(valores).rank(method='average').to_numpy()
+    return ndtri(postos / (len(valores) + 1))
+
+
+def _correlacao_copula(valores: np.ndarray) -> np.ndarray:
+    """Correlação dos escores normais, com as variáveis constantes tratadas como independentes"""
+    with np.errstate(invalid='ignore', divide='ignore'):
+        corr = np.corrcoef(_escores_normais(valores), rowvar=False)
+    corr = np.nan_to_num(corr)
+    np.fill_diagonal(corr, 1.0)
+    return corr
+
+
+def ajustar_modelo_sintetico(df: Optional[pd.DataFrame] = None) -> Dict:
+    """
+    Ajusta o modelo gerador aos dados reais
+
+    Args:
+        df: DataFrame com dados de incêndios (padrão: load_forestfires())
+
+    Returns:
+        Dicionário com os parâmetros do modelo
+    """
+    if df is None:
+        df = load_forestfires(CSV_PATH, obter_versao_dados())
+
+    variaveis = list(VARIAVEIS_COPULA)
+    correlacao_global = _correlacao_copula(df[variaveis].to_numpy(dtype=float))
+
+    meses = [m for m in MONTH_ORDER if m in set(df['month'])]
+    por_mes = {}
+    for mes in meses:
+        dados_mes = df[df['month'] == mes]
+        valores = dados_mes[variaveis].to_numpy(dtype=float)
+        correlacao = (_correlacao_copula(valores) if len(valores) >= MIN_REGISTROS_CORRELACAO
+                      else correlacao_global)
+        # Cholesky de uma matriz levemente regularizada para garantir definição positiva
+        cholesky = np.linalg.cholesky(correlacao + 1e-6 * np.eye(len(variaveis)))
+        por_mes[mes] = {
+            'quantis': np.sort(valores, axis=0),
+            'cholesky': cholesky,
+            'prob_area_zero': float((dados_mes['area'] == 0).mean())
+        }
+
+    frequencia_meses = df['month'].value_counts(normalize=True).reindex(meses)
+    frequencia_dias = df['day'].value_counts(normalize=True)
+    frequencia_celulas = df.groupby(['x', 'y']).size() / len(df)
+
+    # Cauda da área queimada: lognormal ajustada às áreas positivas
+    log_area = np.log(df.loc[df['area'] > 0, 'area'].to_numpy())
+
+    return {
+        'colunas': list(pd.read_csv(CSV_PATH, nrows=0).columns),
+        'variaveis': variaveis,
+        'meses': meses,
+        'prob_meses': frequencia_meses.to_numpy(),
+        'dias': frequencia_dias.index.to_numpy(),
+        'prob_dias': frequencia_dias.to_numpy(),
+        'celulas': np.array(frequencia_celulas.index.tolist()),
+        'prob_celulas': frequencia_celulas.to_numpy(),
+        'por_mes': por_mes,
+        'log_area_media': float(log_area.mean()),
+        'log_area_desvio': float(log_area.std())
+    }
+
+
+def _gerar_datas(meses: np.ndarray, anos: Tuple[int, int], rng: np.random.Generator) -> np.ndarray:
+    """
+    Sorteia uma data em cada mês informado, com ano uniforme no intervalo
+
+    Args:
+        meses: Índices dos meses (0 = jan)
+        anos: Primeiro e último ano (inclusive)
+        rng: Gerador aleatório
+
+    Returns:
+        Vetor datetime64[D]
+    """
+    sorteados = rng.integers(anos[0], anos[1] + 1, size=len(meses))
+    inicio = ((sorteados - 1970) * 12 + meses).astype('datetime64[M]')
+    dias_no_mes = ((inicio + 1).astype('datetime64[D]') - inicio.astype('datetime64[D]')).astype(int)
+    return inicio.astype('datetime64[D]') + (rng.random(len(meses)) * dias_no_mes).astype(int)
+
+
+def _gerar_bloco(modelo: Dict, n_linhas: int, rng: np.random.Generator,
+                 anos: Optional[Tuple[int, int]] = None) -> pd.DataFrame:
+    """
+    Gera um bloco de registros sintéticos de forma vetorizada
+
+    Args:
+        modelo: Modelo retornado por ajustar_modelo_sintetico
+        n_linhas: Número de linhas do bloco
+        rng: Gerador aleatório
+        anos: Intervalo de anos (inclusive) das datas; None = sem coluna de data
+
+    Returns:
+        DataFrame com as colunas do arquivo original (e 'date', se anos for informado)
+    """
+    variaveis = modelo['variaveis']
+
+    idx_mes = rng.choice(len(modelo['meses']), size=n_linhas, p=modelo['prob_meses'])
+    idx_celula = rng.choice(len(modelo['celulas']), size=n_linhas, p=modelo['prob_celulas'])
+
+    continuas = np.empty((n_linhas, len(variaveis)))
+    area = np.zeros(n_linhas)
+
+    for i, mes in enumerate(modelo['meses']):
+        linhas = np.flatnonzero(idx_mes == i)
+        if len(linhas) == 0:
+            continue
+        params = modelo['por_mes'][mes]
+
+        # Cópula gaussiana: normais correlacionadas -> uniformes -> quantis empíricos do mês
+        uniformes = ndtr(rng.standard_normal((len(linhas), len(variaveis))) @ params['cholesky'].T)
+        quantis = params['quantis']
+        grade = np.linspace(0, 1, len(quantis))
+        for j in range(len(variaveis)):
+            continuas[linhas, j] = np.interp(uniformes[:, j], grade, quantis[:, j])
+
+        positivas = linhas[rng.random(len(linhas)) >= params['prob_area_zero']]
+        area[positivas] = rng.lognormal(modelo['log_area_media'], modelo['log_area_desvio'], len(positivas))
+
+    bloco = pd.DataFrame({
+        'x': modelo['celulas'][idx_celula, 0],
+        'y': modelo['celulas'][idx_celula, 1],
+        'month': np.asarray(modelo['meses'])[idx_mes],
+        'day': rng.choice(modelo['dias'], size=n_linhas, p=modelo['prob_dias']),
+    })
+    for j, (var, casas) in enumerate(VARIAVEIS_COPULA.items()):
+        bloco[var] = continuas[:, j].round(casas)
+    bloco['rh'] = bloco['rh'].astype(int)
+    bloco['area'] = area.round(2)
+
+    # Mesmos nomes e ordem de colunas do arquivo original (X, Y, FFMC, ...)
+    bloco = bloco.rename(columns={c.lower(): c for c in modelo['colunas']})[modelo['colunas']]
+
+    if anos is not None:
+        indices_meses = np.array([MONTH_ORDER.index(m) for m in modelo['meses']])[idx_mes]
+        datas = _gerar_datas(indices_meses, anos, rng)
+        # 1970-01-01 foi uma quinta-feira
+        bloco['day'] = DIAS_SEMANA[(datas.astype(np.int64) + 3) % 7]
+        bloco[COLUNA_DATA] = datas
+    return bloco
+
+
+def gerar_incendios_sinteticos(n_linhas: int, seed: Optional[int] = None,
+                               tamanho_bloco: int = 1_000_000,
+                               modelo: Optional[Dict] = None,
+                               anos: Optional[Tuple[int, int]] = None) -> Iterator[pd.DataFrame]:
+    """
+    Gera registros sintéticos de incêndios em blocos
+
+    Cada bloco usa uma semente derivada de seed, de modo que o resultado é
+    reprodutível e não depende de quantos blocos são consumidos por vez.
+
+    Args:
+        n_linhas: Número total de linhas
+        seed: Semente para reprodutibilidade
+        tamanho_bloco: Número de linhas por bloco
+        modelo: Modelo ajustado (padrão: ajustado aos dados reais)
+        anos: Intervalo de anos (inclusive) das datas; None = sem coluna de data
+
+    Yields:
+        DataFrames com as colunas do arquivo original
+    """
+    if modelo is None:
+        modelo = ajustar_modelo_sintetico()
+
+    n_blocos = max(1, int(np.ceil(n_linhas / tamanho_bloco)))
+    seeds = np.random.SeedSequence(seed).spawn(n_blocos)
+
+    for i, semente in enumerate(seeds):
+        tamanho = min(tamanho_bloco, n_linhas - i * tamanho_bloco)
+        yield _gerar_bloco(modelo, tamanho, np.random.default_rng(semente), anos)
+
+
+def salvar_incendios_sinteticos(caminho: Path, n_linhas: int, seed: Optional[int] = None,
+                                tamanho_bloco: int = 1_000_000,
+                                anos: Optional[Tuple[int, int]] = None) -> Path:
+    """
+    Gera registros sintéticos e grava em CSV bloco a bloco
+
+    A escrita usa o writer CSV do Arrow, bem mais rápido que DataFrame.to_csv
+    para dezenas de milhões de linhas.
+
+    Args:
+        caminho: Arquivo CSV de saída
+        n_linhas: Número total de linhas
+        seed: Semente para reprodutibilidade
+        tamanho_bloco: Número de linhas por bloco
+        anos: Intervalo de anos (inclusive) das datas; None = sem coluna de data
+
+    Returns:
+        Caminho do arquivo gerado
+    """
+    caminho = Path(caminho)
+    caminho.parent.mkdir(parents=True, exist_ok=True)
+
+    opcoes = pa_csv.WriteOptions(include_header=False, quoting_style='none')
+
+    with open(caminho, 'wb') as arquivo:
+        for i, bloco in enumerate(gerar_incendios_sinteticos(n_linhas, seed, tamanho_bloco, anos=anos)):
+            if i == 0:
+                arquivo.write((','.join(bloco.columns) + '\n').encode('utf-8'))
+            tabela = pa.Table.from_pandas(bloco, preserve_index=False)
+            if COLUNA_DATA in tabela.column_names:
+                # Só a data (AAAA-MM-DD), sem a hora
+                indice = tabela.column_names.index(COLUNA_DATA)
+                tabela = tabela.set_column(indice, COLUNA_DATA, tabela[COLUNA_DATA].cast(pa.date32()))
+            pa_csv.write_csv(tabela, arquivo, opcoes)
+
+    return caminho
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Gera dados sintéticos de incêndios florestais")
+    parser.add_argument('--linhas', type=int, required=True, help="Número de linhas")
+    parser.add_argument('--saida', type=Path, required=True, help="Arquivo CSV de saída")
+    parser.add_argument('--seed', type=int, default=42, help="Semente para reprodutibilidade")
+    parser.add_argument('--tamanho-bloco', type=int, default=1_000_000, help="Linhas por bloco")
+    parser.add_argument('--anos', type=int, nargs=2, metavar=('INICIO', 'FIM'),
+                        help="Gera a coluna 'date' com datas entre os anos INICIO e FIM")
+    args = parser.parse_args(argv)
+
+    inicio = time.perf_counter()
+    salvar_incendios_sinteticos(args.saida, args.linhas, args.seed, args.tamanho_bloco,
+                                anos=tuple(args.anos) if args.anos else None)
+    duracao = time.perf_counter() - inicio
+    print(f"{args.linhas:,} linhas geradas em {args.saida} ({duracao:.1f} s, "
+          f"{args.linhas / duracao:,.0f} linhas/s)")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
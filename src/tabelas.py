@@ -0,0 +1,127 @@
+"""
+Tabelas formatadas e paginadas do dashboard
+
+formatar_tabela gera o texto no padrão brasileiro vetorizado por coluna
+(ver formatar_numeros), sem formatar célula a célula. No dashboard só a
+página visível é formatada; as colunas de texto Arrow seguem direto para o
+st.dataframe (ver exibir_tabela). As tabelas chegam já na ordem de
+exibição (ex: pelo critério do ranking).
+"""
+
+from typing import Dict, Union
+
+import pandas as pd
+import streamlit as st
+
+from src.diagnostico import exibir_tabela
+from src.utils import formatar_numeros, formatar_moeda_serie, formatar_percentual_serie
+
+
+# Formato por coluna: número de casas decimais, 'moeda' ou 'percentual'
+Formato = Union[int, str]
+
+FORMATO_TABELA_REGIOES: Dict[str, Formato] = {
+    'Área Total (ha)': 2,
+    'Área Média (ha)': 2,
+    'Frequência': 0,
+    'Área Máxima (ha)': 2,
+    'Temp Média': 1,
+    'Umidade Média': 0,
+    'FFMC Médio': 1,
+    'DMC Médio': 1,
+    'DC Médio': 1,
+    'ISI Médio': 1
+}
+
+FORMATO_RESUMO_MENSAL: Dict[str, Formato] = {
+    'Frequência': 0,
+    'Área Total': 2,
+    'Área Média': 2,
+    'Área Máxima': 2,
+    'Temp Média': 1,
+    'Umidade Média': 0,
+    'FFMC Médio': 1,
+    'ISI Médio': 1
+}
+
+OPCOES_LINHAS_POR_PAGINA = [10, 25, 50, 100]
+
+
+def formatar_tabela(df: pd.DataFrame, formatos: Dict[str, Formato]) -> pd.DataFrame:
+    """
+    Formata as colunas numéricas de uma tabela para exibição
+
+    Args:
+        df: DataFrame a formatar
+        formatos: Formato por coluna; colunas ausentes ficam inalteradas
+
+    Returns:
+        Novo DataFrame com as colunas formatadas como texto
+    """
+    colunas = {}
+    for coluna, formato in formatos.items():
+        if coluna not in df.columns:
+            continue
+        if formato == 'moeda':
+            colunas[coluna] = formatar_moeda_serie(df[coluna])
+        elif formato == 'percentual':
+            colunas[coluna] = formatar_percentual_serie(df[coluna])
+        else:
+            colunas[coluna] = formatar_numeros(df[coluna], formato)
+    return df.assign(**colunas)
+
+
+def exibir_tabela_paginada(df: pd.DataFrame, formatos: Dict[str, Formato], chave: str,
+                           linhas_por_pagina: int = 10, mostrar_indice: bool = False) -> pd.DataFrame:
+    """
+    Exibe uma tabela paginada no servidor: só a página atual é formatada e enviada
+
+    A ordenação ao clicar numa coluna vale para a página exibida.
+
+    Args:
+        df: DataFrame completo, já na ordem de exibição
+        formatos: Formato por coluna (ver formatar_tabela)
+        chave: Prefixo das chaves dos widgets de paginação (único na página)
+        linhas_por_pagina: Linhas por página inicial
+        mostrar_indice: Exibir o índice do DataFrame
+
+    Returns:
+        Linhas (não formatadas) da página exibida
+    """
+    n_linhas = len(df)
+
+    if n_linhas > min(OPCOES_LINHAS_POR_PAGINA):
+        col1, col2, _ = st.columns([1, 1, 3])
+        with col1:
+            linhas_por_pagina = st.selectbox(
+                "Linhas por página:",
+                OPCOES_LINHAS_POR_PAGINA,
+                index=OPCOES_LINHAS_POR_PAGINA.index(linhas_por_pagina),
+                key=f"{chave}_linhas"
+            )
+        n_paginas = max(1, -(-n_linhas // linhas_por_pagina))
+        # Mais linhas por página reduzem o número de páginas
+        if st.session_state.get(f"{chave}_pagina", 1) > n_paginas:
+            st.session_state[f"{chave}_pagina"] = n_paginas
+        with col2:
+            pagina = st.number_input(
+                "Página:",
+                min_value=1, max_value=n_paginas, step=1,
+                key=f"{chave}_pagina"
+            )
+    else:
+        pagina = 1
+
+    inicio = (pagina - 1) * linhas_por_pagina
+    pagina_df = df.iloc[inicio:inicio + linhas_por_pagina]
+
+    exibir_tabela(
+        formatar_tabela(pagina_df, formatos), chave,
+        use_container_width=True,
+        hide_index=not mostrar_indice
+    )
+    if n_linhas > len(pagina_df):
+        n_paginas = -(-n_linhas // linhas_por_pagina)
+        st.caption(f"Página {pagina} de {n_paginas} · linhas {inicio + 1}–{inicio + len(pagina_df)} de {n_linhas}")
+
+    return pagina_df
@@ -3,11 +3,20 @@ Módulo utilitário com funções reutilizáveis para a aplicação Streamlit
 Análise de Incêndios Florestais - Parque Montesinho, Portugal
 """
 
+import lzma
+import os
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 import numpy as np
-from typing import Tuple, Dict
+from typing import Tuple, Dict, List, Optional, Iterator, Sequence, Union
 import streamlit as st
 from pathlib import Path
+from scipy.spatial import cKDTree
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+
+from src.memoria import medir_recurso
 
 
 def gerar_dados_exemplo(n_dias: int = 100) -> pd.DataFrame:
@@ -77,25 +86,317 @@ def formatar_percentual(valor: float, casas: int = 2) -> str:
     return f"{valor*100:.{casas}f}%"
 
 
+def formatar_numeros(valores: pd.Series, casas: int = 2) -> pd.Series:
+    """
+    Formata uma coluna numérica no padrão brasileiro (1.234,56), vetorizado
+    
+    Os grupos de milhar e as casas decimais são montados com operações de
+    string do Arrow sobre a coluna inteira, sem formatar valor a valor.
+    
+    Args:
+        valores: Série numérica
+        casas: Casas decimais
+        
+    Returns:
+        Série de strings; valores ausentes viram '-'
+    """
+    arr = pd.to_numeric(valores).to_numpy(dtype=float)
+    ausentes = ~np.isfinite(arr)
+    escala = 10 ** casas
+    unidades = np.round(np.abs(np.where(ausentes, 0, arr)) * escala).astype(np.int64)
+    inteiro = unidades // escala
+    
+    # Parte inteira: acrescenta um grupo de milhar por nível
+    texto = pc.cast(pa.array(inteiro % 1000), pa.string())
+    nivel = 1
+    while (inteiro >= 1000 ** nivel).any():
+        grupo = pc.cast(pa.array((inteiro // 1000 ** nivel) % 1000), pa.string())
+        com_grupo = pc.binary_join_element_wise(grupo, pc.utf8_lpad(texto, 4 * nivel - 1, '0'), '.')
+        texto = pc.if_else(pa.array(inteiro >= 1000 ** nivel), com_grupo, texto)
+        nivel += 1
+    
+    if casas > 0:
+        decimais = pc.utf8_lpad(pc.cast(pa.array(unidades % escala), pa.string()), casas, '0')
+        texto = pc.binary_join_element_wise(texto, decimais, ',')
+    
+    texto = pc.if_else(pa.array((arr < 0) & (unidades > 0)), pc.binary_join_element_wise('-', texto, ''), texto)
+    texto = pc.if_else(pa.array(ausentes), '-', texto)
+    return pd.Series(texto, index=valores.index, dtype=pd.StringDtype('pyarrow'))
+
+
+def formatar_moeda_serie(valores: pd.Series) -> pd.Series:
+    """
+    Versão vetorizada de formatar_moeda para uma coluna inteira
+    
+    Args:
+        valores: Série numérica
+        
+    Returns:
+        Série de strings no formato R$ X.XXX,XX; valores ausentes viram '-'
+    """
+    texto = formatar_numeros(valores, 2)
+    return ('R$ ' + texto).where(texto != '-', '-')
+
+
+def formatar_percentual_serie(valores: pd.Series, casas: int = 2) -> pd.Series:
+    """
+    Versão vetorizada de formatar_percentual para uma coluna inteira
+    
+    Args:
+        valores: Série com valores entre 0 e 1
+        casas: Casas decimais
+        
+    Returns:
+        Série de strings no formato XX,XX%; valores ausentes viram '-'
+    """
+    texto = formatar_numeros(pd.to_numeric(valores) * 100, casas)
+    return (texto + '%').where(texto != '-', '-')
+
+
 # ========== FUNÇÕES PARA ANÁLISE DE INCÊNDIOS FLORESTAIS ==========
 
-@st.cache_data
-def load_forestfires() -> pd.DataFrame:
+CSV_PATH = Path(__file__).parent.parent / "data" / "forestfires.csv"
+
+
+# Tipos das colunas de forestfires.csv (nomes já padronizados)
+ESQUEMA_FORESTFIRES = pa.schema([
+    ('x', pa.int64()), ('y', pa.int64()), ('month', pa.string()), ('day', pa.string()),
+    ('ffmc', pa.float64()), ('dmc', pa.float64()), ('dc', pa.float64()), ('isi', pa.float64()),
+    ('temp', pa.float64()), ('rh', pa.int64()), ('wind', pa.float64()), ('rain', pa.float64()),
+    ('area', pa.float64())
+])
+
+# Coluna opcional com a data do registro (AAAA-MM-DD); o arquivo original só tem mês e dia da semana
+COLUNA_DATA = 'date'
+
+# Compressão por extensão; o Arrow não tem codec xz, que é lido pelo módulo lzma
+COMPRESSOES_ENTRADA = {'.gz': 'gzip', '.bz2': 'bz2', '.xz': 'xz'}
+
+# Texto em pandas continua num buffer Arrow (o 'str' do pandas 3; no pandas 2,
+# o string[pyarrow], em vez de uma coluna object de strings Python)
+try:
+    TIPO_TEXTO = pd.StringDtype('pyarrow', na_value=np.nan)
+except TypeError:  # pandas < 2.3
+    TIPO_TEXTO = pd.StringDtype('pyarrow')
+
+
+@st.cache_resource(max_entries=1)
+@medir_recurso
+def load_forestfires(caminho: Union[Path, Sequence[Path]] = CSV_PATH,
+                     versao: Optional[str] = None) -> pd.DataFrame:
     """
     Carrega e processa dados de incêndios florestais do Parque Montesinho
     
+    O CSV é interpretado pelo leitor do Arrow e convertido para pandas uma
+    única vez (ver tabela_para_pandas): colunas numéricas em arrays NumPy e
+    texto em buffers Arrow, sem passar por objetos Python.
+    
+    O DataFrame fica em st.cache_resource: todas as sessões e reruns recebem
+    o mesmo objeto, sem a cópia que st.cache_data faria a cada chamada. Não
+    o modifique; derive novos objetos (ex: df.assign) quando precisar.
+    
+    Registros repetidos são descartados (remover_duplicatas), como na
+    ingestão e no acompanhamento do arquivo (src.acompanhamento): os dois
+    modos de leitura contam os mesmos registros.
+    
+    O cache guarda uma única entrada, chaveada pela versão do arquivo: quando
+    ele muda (ex: registros anexados por src.ingestao), a versão nova relê
+    os dados e substitui a anterior.
+    
+    Args:
+        caminho: Caminho do CSV no formato de forestfires.csv, ou uma lista de
+            arquivos (comprimidos ou não, ex: um por mês) lidos em paralelo
+            por ler_forestfires_arquivos
+        versao: Versão dos arquivos (ver obter_versao_dados), usada só como
+            chave do cache. Sem ela, mudanças no arquivo não são percebidas:
+            o dashboard sempre a informa
+        
     Returns:
         DataFrame com dados de incêndios
     """
-    csv_path = Path(__file__).parent.parent / "data" / "forestfires.csv"
-    df = pd.read_csv(csv_path)
+    if isinstance(caminho, (str, Path)):
+        caminho = [caminho]
+    return remover_duplicatas(ler_forestfires_arquivos(caminho))
+
+
+def calcular_hashes(df: pd.DataFrame) -> np.ndarray:
+    """
+    Hash de 64 bits de cada registro, vetorizado
+    
+    É a identidade de um registro na ingestão (src.ingestao) e no
+    carregamento: as duas leituras do arquivo descartam as mesmas linhas.
+    
+    Args:
+        df: Registros com as colunas de ESQUEMA_FORESTFIRES (e a COLUNA_DATA, se houver)
+        
+    Returns:
+        Vetor uint64 com um hash por linha
+    """
+    colunas = ESQUEMA_FORESTFIRES.names + ([COLUNA_DATA] if COLUNA_DATA in df.columns else [])
+    return pd.util.hash_pandas_object(df[colunas], index=False).to_numpy()
+
+
+def remover_duplicatas(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Mantém a primeira ocorrência de cada registro (mesmo hash de calcular_hashes)
+    
+    Relatos reenviados pelo sistema de campo repetem linhas inteiras; sem
+    descartá-los, a frequência e a área queimada ficam infladas.
+    
+    Args:
+        df: Registros no esquema de forestfires.csv
+        
+    Returns:
+        O próprio df, se não houver repetidos, ou uma cópia sem eles
+    """
+    repetido = pd.Series(calcular_hashes(df)).duplicated().to_numpy()
+    if not repetido.any():
+        return df
+    return df[~repetido].reset_index(drop=True)
+
+
+def tabela_para_pandas(tabela: pa.Table) -> pd.DataFrame:
+    """
+    Converte uma tabela Arrow para pandas sem passar por objetos Python
     
-    # Padronizar nomes de colunas
-    df.columns = df.columns.str.lower().str.strip()
+    Cada coluna vira um bloco próprio (sem consolidar as numéricas numa
+    matriz, o que copiaria tudo de novo), o texto fica em buffers Arrow
+    (TIPO_TEXTO) e a memória da tabela é liberada durante a conversão.
     
+    Args:
+        tabela: Tabela Arrow (não deve ser usada depois)
+        
+    Returns:
+        DataFrame
+    """
+    tipos = {pa.string(): TIPO_TEXTO, pa.large_string(): TIPO_TEXTO}
+    return tabela.to_pandas(split_blocks=True, self_destruct=True, types_mapper=tipos.get)
+
+
+def converter_datas(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Converte a coluna de data opcional (COLUNA_DATA) para datetime, no próprio DataFrame
+    
+    Args:
+        df: DataFrame com as colunas padronizadas
+        
+    Returns:
+        O mesmo DataFrame; datas inválidas viram NaT
+    """
+    if COLUNA_DATA in df.columns:
+        df[COLUNA_DATA] = pd.to_datetime(df[COLUNA_DATA], errors='coerce')
     return df
 
 
+def ler_forestfires_em_blocos(caminho: Path = CSV_PATH,
+                              tamanho_bloco: int = 100_000) -> Iterator[pd.DataFrame]:
+    """
+    Lê o arquivo de incêndios em blocos, sem carregá-lo inteiro na memória
+    
+    Args:
+        caminho: Caminho do CSV no formato de forestfires.csv
+        tamanho_bloco: Número de linhas por bloco
+        
+    Yields:
+        DataFrames com as colunas padronizadas como em load_forestfires
+    """
+    for bloco in pd.read_csv(caminho, chunksize=tamanho_bloco):
+        bloco.columns = bloco.columns.str.lower().str.strip()
+        yield converter_datas(bloco)
+
+
+def _ler_tabela_csv(caminho: Path, usar_threads: bool = True) -> pa.Table:
+    """
+    Descomprime e interpreta um CSV direto para uma tabela Arrow
+    
+    O conteúdo descomprimido é consumido em blocos pelo leitor CSV do Arrow,
+    sem montar o texto inteiro em memória.
+    
+    Args:
+        caminho: CSV, opcionalmente .gz, .bz2 ou .xz
+        usar_threads: Permitir que o leitor do Arrow use várias threads
+        
+    Returns:
+        Tabela no ESQUEMA_FORESTFIRES, mais a COLUNA_DATA (texto) se houver
+    """
+    caminho = Path(caminho)
+    compressao = COMPRESSOES_ENTRADA.get(caminho.suffix.lower())
+    if compressao == 'xz':
+        fluxo = lzma.open(caminho, 'rb')
+    else:
+        fluxo = pa.input_stream(str(caminho), compression=compressao)
+    
+    with fluxo:
+        tabela = pa_csv.read_csv(fluxo, read_options=pa_csv.ReadOptions(use_threads=usar_threads))
+    
+    tabela = tabela.rename_columns([c.lower().strip() for c in tabela.column_names])
+    esquema = ESQUEMA_FORESTFIRES
+    if COLUNA_DATA in tabela.column_names:
+        # Texto: arquivos diferentes podem ter a data inferida com tipos diferentes
+        esquema = esquema.append(pa.field(COLUNA_DATA, pa.string()))
+    return tabela.select(esquema.names).cast(esquema)
+
+
+def ler_forestfires_arquivos(caminhos: Sequence[Path],
+                             n_threads: Optional[int] = None) -> pd.DataFrame:
+    """
+    Lê vários arquivos de incêndios (ex: um CSV comprimido por mês) em paralelo
+    
+    Cada arquivo é descomprimido e interpretado numa thread do pool (zlib,
+    bz2, lzma e o leitor CSV do Arrow liberam o GIL). As tabelas Arrow são
+    concatenadas sem cópia e convertidas para pandas uma única vez.
+    
+    Args:
+        caminhos: Arquivos CSV, opcionalmente .gz, .bz2 ou .xz, com o
+            cabeçalho de forestfires.csv
+        n_threads: Threads do pool (None = CPUs disponíveis, 1 = sequencial)
+        
+    Returns:
+        DataFrame com dados de incêndios, com os tipos de ESQUEMA_FORESTFIRES
+        (e a COLUNA_DATA, se todos os arquivos a tiverem)
+    """
+    caminhos = list(caminhos)
+    if not caminhos:
+        return tabela_para_pandas(ESQUEMA_FORESTFIRES.empty_table())
+    if n_threads is None:
+        n_threads = min(os.cpu_count() or 1, len(caminhos))
+    
+    if n_threads <= 1:
+        tabelas = [_ler_tabela_csv(c) for c in caminhos]
+    else:
+        # Um arquivo por thread; o leitor de cada arquivo fica sequencial
+        with ThreadPoolExecutor(max_workers=n_threads) as executor:
+            tabelas = list(executor.map(lambda c: _ler_tabela_csv(c, usar_threads=False), caminhos))
+    
+    if len({t.schema for t in tabelas}) > 1:
+        # Só alguns arquivos têm data: ficam as colunas comuns
+        tabelas = [t.select(ESQUEMA_FORESTFIRES.names) for t in tabelas]
+    return converter_datas(tabela_para_pandas(pa.concat_tables(tabelas)))
+
+
+def obter_versao_dados(caminho: Path = CSV_PATH) -> str:
+    """
+    Identifica a versão atual dos dados a partir do arquivo de origem
+    
+    Usada como chave de cache dos cálculos derivados: muda sempre que o
+    arquivo é modificado.
+    
+    Args:
+        caminho: Arquivo de dados
+        
+    Returns:
+        String com a versão dos dados (mtime e tamanho do arquivo)
+    """
+    stat = Path(caminho).stat()
+    return f"{stat.st_mtime_ns}-{stat.st_size}"
+
+
+# Entradas mantidas em cada cache chaveado pela versão dos dados. No
+# acompanhamento (--acompanhar) cada lote anexado gera uma versão nova; sem
+# limite, os resultados das versões antigas ficariam em cache para sempre
+MAX_ENTRADAS_CACHE = 8
+
+
 # Dicionário explicativo dos componentes FWI
 FWI_DESCRIPTIONS = {
     "FFMC": {
@@ -178,7 +479,8 @@ def calcular_kpis_incendios(df: pd.DataFrame) -> Dict:
     area_max = df['area'].max()
     
     # Mês crítico
-    mes_mais_incendios = df['month'].value_counts().idxmax()
+    contagem_meses = df['month'].value_counts()
+    mes_mais_incendios = contagem_meses.idxmax()
     mes_critico_nome = MONTH_MAP.get(mes_mais_incendios, mes_mais_incendios)
     
     # Região crítica (coordenadas com mais área queimada)
@@ -192,6 +494,7 @@ def calcular_kpis_incendios(df: pd.DataFrame) -> Dict:
         'area_max': area_max,
         'mes_critico': mes_mais_incendios,
         'mes_critico_nome': mes_critico_nome,
+        'incendios_mes_critico': int(contagem_meses.max()),
         'regiao_critica': regiao_critica,
         'area_regiao_critica': area_regiao_critica
     }
@@ -245,3 +548,400 @@ def agregar_por_mes(df: pd.DataFrame) -> pd.DataFrame:
     agg_data = agg_data.sort_values('month_order').drop('month_order', axis=1)
     
     return agg_data
+
+
+# Critérios de ordenação das regiões críticas e coluna correspondente
+CRITERIOS_REGIOES = {
+    "Área Total Queimada": 'Área Total (ha)',
+    "Frequência de Incêndios": 'Frequência',
+    "Área Máxima em um Incêndio": 'Área Máxima (ha)'
+}
+
+
+def agregar_regioes_criticas(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Agrega indicadores por célula de grid para o ranking de regiões críticas
+    
+    Args:
+        df: DataFrame com dados de incêndios
+        
+    Returns:
+        DataFrame com uma linha por (x, y), ordenado por área total
+    """
+    grid_data = df.groupby(['x', 'y']).agg({
+        'area': ['sum', 'mean', 'count', 'max'],
+        'temp': 'mean',
+        'rh': 'mean',
+        'ffmc': 'mean',
+        'dmc': 'mean',
+        'dc': 'mean',
+        'isi': 'mean'
+    }).round(2)
+    
+    grid_data.columns = ['Área Total (ha)', 'Área Média (ha)', 'Frequência', 'Área Máxima (ha)',
+                         'Temp Média', 'Umidade Média', 'FFMC Médio', 'DMC Médio', 'DC Médio', 'ISI Médio']
+    return grid_data.sort_values('Área Total (ha)', ascending=False).reset_index()
+
+
+def agregar_resumo_mensal(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Agrega indicadores por mês para a análise de sazonalidade
+    
+    Args:
+        df: DataFrame com dados de incêndios
+        
+    Returns:
+        DataFrame indexado por mês (na ordem do ano) com a coluna 'Mês' por extenso
+    """
+    monthly_data = df.groupby('month').agg({
+        'area': ['sum', 'mean', 'count', 'max', 'std'],
+        'temp': 'mean',
+        'rh': 'mean',
+        'ffmc': 'mean',
+        'dmc': 'mean',
+        'dc': 'mean',
+        'isi': 'mean'
+    }).round(2)
+    
+    monthly_data.columns = ['Área Total', 'Área Média', 'Frequência', 'Área Máxima', 'Desvio Área',
+                           'Temp Média', 'Umidade Média', 'FFMC Médio', 'DMC Médio', 'DC Médio', 'ISI Médio']
+    
+    # Ordenar por ordem de meses
+    monthly_data = monthly_data.reindex([m for m in MONTH_ORDER if m in monthly_data.index])
+    monthly_data['Mês'] = monthly_data.index.map(MONTH_MAP)
+    
+    return monthly_data
+
+
+@st.cache_data(max_entries=MAX_ENTRADAS_CACHE)
+def calcular_agregados(_df: pd.DataFrame, versao: str) -> Dict:
+    """
+    Calcula KPIs e agregados por grid e por mês, em cache por versão dos dados
+    
+    Args:
+        _df: DataFrame com dados de incêndios (não entra na chave do cache)
+        versao: Versão dos dados (ver obter_versao_dados)
+        
+    Returns:
+        Dicionário com 'kpis' (calcular_kpis_incendios), 'grid' (agregar_por_grid),
+        'mes' (agregar_por_mes), 'regioes' (agregar_regioes_criticas) e
+        'resumo_mensal' (agregar_resumo_mensal)
+    """
+    return {
+        'kpis': calcular_kpis_incendios(_df),
+        'grid': agregar_por_grid(_df),
+        'mes': agregar_por_mes(_df),
+        'regioes': agregar_regioes_criticas(_df),
+        'resumo_mensal': agregar_resumo_mensal(_df)
+    }
+
+
+# Variáveis cujas médias aparecem nos agregados (ver agregar_por_grid/agregar_resumo_mensal)
+VARIAVEIS_MEDIAS = ['temp', 'rh', 'wind', 'ffmc', 'dmc', 'dc', 'isi']
+
+
+def calcular_parciais(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Somas parciais por célula (X, Y) e mês, combináveis entre partições ou blocos
+    
+    Args:
+        df: DataFrame com dados de incêndios
+    
+    Returns:
+        DataFrame com 'x', 'y', 'month', 'n', somas e máximo da área, soma dos
+        quadrados da área e, por variável, soma ('<var>_soma') e contagem
+        de valores não nulos ('<var>_n')
+    """
+    grupos = df.assign(area_quad=df['area'] ** 2).groupby(['x', 'y', 'month'])
+    somas = grupos[['area', 'area_quad'] + VARIAVEIS_MEDIAS].sum()
+    contagens = grupos[VARIAVEIS_MEDIAS].count()
+    return pd.concat([
+        grupos.size().rename('n'),
+        somas['area'].rename('area_soma'),
+        somas['area_quad'],
+        grupos['area'].max().rename('area_max'),
+        somas[VARIAVEIS_MEDIAS].add_suffix('_soma'),
+        contagens.add_suffix('_n')
+    ], axis=1).reset_index()
+
+
+def reduzir_parciais(parciais: pd.DataFrame) -> pd.DataFrame:
+    """
+    Consolida somas parciais concatenadas em uma linha por célula (X, Y) e mês
+    
+    Mantém o tamanho das parciais limitado ao número de células e meses,
+    por mais blocos que sejam incorporados.
+    
+    Args:
+        parciais: Retornos de calcular_parciais, concatenados
+    
+    Returns:
+        Somas parciais no mesmo formato de calcular_parciais
+    """
+    grupos = parciais.groupby(['x', 'y', 'month'])
+    reduzido = grupos.sum()
+    reduzido['area_max'] = grupos['area_max'].max()
+    return reduzido.reset_index()
+
+
+def _combinar(parciais: pd.DataFrame, chaves: List[str]) -> pd.DataFrame:
+    """Soma as parciais por chave, com o máximo da área e as médias das variáveis"""
+    colunas_soma = ['n', 'area_soma', 'area_quad'] + [
+        f"{v}_{s}" for v in VARIAVEIS_MEDIAS for s in ('soma', 'n')
+    ]
+    grupos = parciais.groupby(chaves)
+    combinado = grupos[colunas_soma].sum()
+    combinado['area_max'] = grupos['area_max'].max()
+    combinado['area_media'] = combinado['area_soma'] / combinado['n']
+    # Desvio padrão amostral a partir da soma dos quadrados
+    variancia = ((combinado['area_quad'] - combinado['area_soma'] ** 2 / combinado['n'])
+                 / (combinado['n'] - 1)).clip(lower=0)
+    combinado['area_desvio'] = (variancia ** 0.5).where(combinado['n'] > 1)
+    for v in VARIAVEIS_MEDIAS:
+        combinado[f"{v}_media"] = combinado[f"{v}_soma"] / combinado[f"{v}_n"]
+    return combinado
+
+
+def _tabela_agregada(combinado: pd.DataFrame) -> pd.DataFrame:
+    """Formato de agregar_por_grid/agregar_por_mes (colunas em dois níveis)"""
+    colunas = {
+        ('area', 'sum'): combinado['area_soma'],
+        ('area', 'mean'): combinado['area_media'],
+        ('area', 'count'): combinado['n']
+    }
+    for v in VARIAVEIS_MEDIAS:
+        colunas[(v, 'mean')] = combinado[f"{v}_media"]
+    tabela = pd.DataFrame(colunas)
+    tabela.columns = pd.MultiIndex.from_tuples(tabela.columns)
+    return tabela.reset_index(col_level=0)
+
+
+def combinar_agregados(parciais: pd.DataFrame) -> Dict:
+    """
+    Monta os agregados das páginas a partir das somas parciais
+    
+    Args:
+        parciais: Somas parciais (calcular_parciais) de uma ou mais partições,
+            concatenadas
+    
+    Returns:
+        Dicionário no formato de calcular_agregados
+    """
+    por_grid = _combinar(parciais, ['x', 'y'])
+    por_mes = _combinar(parciais, ['month'])
+    
+    # KPIs
+    contagem_meses = por_mes['n'].reindex([m for m in MONTH_ORDER if m in por_mes.index])
+    mes_critico = contagem_meses.idxmax()
+    total = int(por_mes['n'].sum())
+    area_total = por_grid['area_soma'].sum()
+    kpis = {
+        'total_incendios': total,
+        'area_total': area_total,
+        'area_media': area_total / total,
+        'area_max': por_grid['area_max'].max(),
+        'mes_critico': mes_critico,
+        'mes_critico_nome': MONTH_MAP.get(mes_critico, mes_critico),
+        'incendios_mes_critico': int(contagem_meses.max()),
+        'regiao_critica': por_grid['area_soma'].idxmax(),
+        'area_regiao_critica': por_grid['area_soma'].max()
+    }
+    
+    # Agregados por mês, na ordem do ano
+    mes = _tabela_agregada(por_mes)
+    mes = mes.iloc[mes[('month', '')].map(MONTH_ORDER.index).argsort(kind='stable')]
+    
+    # Ranking de regiões críticas
+    regioes = pd.DataFrame({
+        'Área Total (ha)': por_grid['area_soma'],
+        'Área Média (ha)': por_grid['area_media'],
+        'Frequência': por_grid['n'],
+        'Área Máxima (ha)': por_grid['area_max'],
+        'Temp Média': por_grid['temp_media'],
+        'Umidade Média': por_grid['rh_media'],
+        'FFMC Médio': por_grid['ffmc_media'],
+        'DMC Médio': por_grid['dmc_media'],
+        'DC Médio': por_grid['dc_media'],
+        'ISI Médio': por_grid['isi_media']
+    }).round(2)
+    regioes = regioes.sort_values('Área Total (ha)', ascending=False).reset_index()
+    
+    # Resumo mensal
+    resumo = pd.DataFrame({
+        'Área Total': por_mes['area_soma'],
+        'Área Média': por_mes['area_media'],
+        'Frequência': por_mes['n'],
+        'Área Máxima': por_mes['area_max'],
+        'Desvio Área': por_mes['area_desvio'],
+        'Temp Média': por_mes['temp_media'],
+        'Umidade Média': por_mes['rh_media'],
+        'FFMC Médio': por_mes['ffmc_media'],
+        'DMC Médio': por_mes['dmc_media'],
+        'DC Médio': por_mes['dc_media'],
+        'ISI Médio': por_mes['isi_media']
+    }).round(2)
+    resumo = resumo.reindex([m for m in MONTH_ORDER if m in resumo.index])
+    resumo['Mês'] = resumo.index.map(MONTH_MAP)
+    
+    return {
+        'kpis': kpis,
+        'grid': _tabela_agregada(por_grid),
+        'mes': mes,
+        'regioes': regioes,
+        'resumo_mensal': resumo
+    }
+
+
+def _convolucao_fft(grade: np.ndarray, kernel: np.ndarray) -> np.ndarray:
+    """
+    Convolução linear 2D via FFT, recortada ao tamanho da grade original
+    
+    Args:
+        grade: Matriz (ny, nx) com os valores binados
+        kernel: Matriz (2r+1, 2r+1) centrada
+        
+    Returns:
+        Matriz (ny, nx) convoluída
+    """
+    ny, nx = grade.shape
+    raio_y, raio_x = kernel.shape[0] // 2, kernel.shape[1] // 2
+    shape = (ny + 2 * raio_y, nx + 2 * raio_x)
+    espectro = np.fft.rfft2(grade, s=shape) * np.fft.rfft2(kernel, s=shape)
+    conv = np.fft.irfft2(espectro, s=shape)[raio_y:raio_y + ny, raio_x:raio_x + nx]
+    # Ruído numérico da FFT pode gerar valores levemente negativos
+    return np.maximum(conv, 0)
+
+
+# Largura de banda inicial do kernel da superfície de densidade
+LARGURA_BANDA_PADRAO = 0.8
+
+# Máximo de células por eixo da grade fina da densidade (grids de coordenadas
+# muito extensos usam menos células por unidade)
+MAX_CELULAS_KDE = 150
+
+
+@st.cache_data(max_entries=MAX_ENTRADAS_CACHE)
+def calcular_densidade_kde(_df: pd.DataFrame, versao: str, largura_banda: float = 1.0,
+                           celulas_por_unidade: int = 10) -> Dict:
+    """
+    Calcula superfícies suavizadas de densidade de incêndios e de área queimada
+    
+    Os pontos são binados numa grade fina e convoluídos com um kernel
+    gaussiano via FFT, com custo O(G log G) no tamanho G da grade.
+    O cache é indexado pela versão dos dados e pelos parâmetros.
+    
+    Args:
+        _df: DataFrame com dados de incêndios (não entra na chave do cache)
+        versao: Versão dos dados (ver obter_versao_dados)
+        largura_banda: Desvio padrão do kernel gaussiano, em unidades do grid X/Y
+        celulas_por_unidade: Resolução da grade fina por unidade de coordenada,
+            reduzida se a grade passar de MAX_CELULAS_KDE células por eixo
+        
+    Returns:
+        Dicionário com eixos 'x' e 'y' e matrizes (ny, nx) 'densidade_incendios'
+        (incêndios por unidade²) e 'densidade_area' (ha por unidade²)
+    """
+    x = _df['x'].to_numpy(dtype=float)
+    y = _df['y'].to_numpy(dtype=float)
+    
+    # Extensão da grade: cada coordenada inteira ocupa uma célula unitária
+    x_min, x_max = x.min() - 0.5, x.max() + 0.5
+    y_min, y_max = y.min() - 0.5, y.max() + 0.5
+    celulas_por_unidade = min(celulas_por_unidade, MAX_CELULAS_KDE / max(x_max - x_min, y_max - y_min))
+    nx = int(round((x_max - x_min) * celulas_por_unidade))
+    ny = int(round((y_max - y_min) * celulas_por_unidade))
+    
+    # Binagem O(n) com bincount
+    ix = np.clip(((x - x_min) * celulas_por_unidade).astype(int), 0, nx - 1)
+    iy = np.clip(((y - y_min) * celulas_por_unidade).astype(int), 0, ny - 1)
+    indice = iy * nx + ix
+    contagem = np.bincount(indice, minlength=nx * ny).reshape(ny, nx).astype(float)
+    area = np.bincount(indice, weights=_df['area'].to_numpy(dtype=float),
+                       minlength=nx * ny).reshape(ny, nx)
+    
+    # Kernel gaussiano separável, normalizado para densidade por unidade²
+    sigma = max(largura_banda * celulas_por_unidade, 1e-6)
+    raio = max(int(np.ceil(3 * sigma)), 1)
+    passos = np.arange(-raio, raio + 1)
+    g = np.exp(-0.5 * (passos / sigma) ** 2)
+    kernel = np.outer(g, g)
+    kernel *= celulas_por_unidade ** 2 / kernel.sum()
+    
+    passo = 1 / celulas_por_unidade
+    return {
+        'x': x_min + passo * (np.arange(nx) + 0.5),
+        'y': y_min + passo * (np.arange(ny) + 0.5),
+        'densidade_incendios': _convolucao_fft(contagem, kernel),
+        'densidade_area': _convolucao_fft(area, kernel)
+    }
+
+
+# Variáveis meteorológicas e FWI usadas na busca por similaridade
+VARIAVEIS_SIMILARIDADE = ['ffmc', 'dmc', 'dc', 'isi', 'temp', 'rh', 'wind', 'rain']
+
+
+@st.cache_resource(max_entries=MAX_ENTRADAS_CACHE)
+@medir_recurso
+def construir_indice_similaridade(_df: pd.DataFrame, versao: str,
+                                  pesos: Optional[Dict[str, float]] = None) -> Dict:
+    """
+    Constrói um índice KD-tree sobre as variáveis meteorológicas/FWI padronizadas
+    
+    Cada variável é padronizada (z-score) e multiplicada pela raiz do seu peso,
+    de modo que a distância euclidiana no índice é a distância ponderada
+    sqrt(sum(peso * dz²)). O índice é construído uma vez por versão dos dados
+    e conjunto de pesos.
+    
+    Args:
+        _df: DataFrame com dados de incêndios (não entra na chave do cache)
+        versao: Versão dos dados (ver obter_versao_dados)
+        pesos: Peso por variável de VARIAVEIS_SIMILARIDADE (padrão 1.0)
+        
+    Returns:
+        Dicionário com a árvore ('arvore'), parâmetros de padronização e o
+        DataFrame de referência ('historico')
+    """
+    pesos = pesos or {}
+    valores = _df[VARIAVEIS_SIMILARIDADE].to_numpy(dtype=float)
+    
+    media = valores.mean(axis=0)
+    desvio = valores.std(axis=0)
+    desvio[desvio == 0] = 1.0
+    escala = np.sqrt([pesos.get(var, 1.0) for var in VARIAVEIS_SIMILARIDADE]) / desvio
+    
+    return {
+        'arvore': cKDTree((valores - media) * escala),
+        'media': media,
+        'escala': escala,
+        'historico': _df.reset_index(drop=True)
+    }
+
+
+def buscar_incendios_similares(indice: Dict, consultas: pd.DataFrame, k: int = 5) -> pd.DataFrame:
+    """
+    Busca os k incêndios históricos mais similares para um lote de consultas
+    
+    Args:
+        indice: Índice retornado por construir_indice_similaridade
+        consultas: DataFrame com as colunas de VARIAVEIS_SIMILARIDADE, uma
+            linha por ignição consultada
+        k: Número de vizinhos por consulta
+        
+    Returns:
+        DataFrame com uma linha por (consulta, vizinho), contendo 'consulta',
+        'posicao', 'distancia' e as colunas do registro histórico (inclusive 'area')
+    """
+    historico = indice['historico']
+    k = min(k, len(historico))
+    
+    pontos = (consultas[VARIAVEIS_SIMILARIDADE].to_numpy(dtype=float) - indice['media']) * indice['escala']
+    distancias, vizinhos = indice['arvore'].query(pontos, k=k)
+    distancias = np.asarray(distancias).reshape(len(consultas), k)
+    vizinhos = np.asarray(vizinhos).reshape(len(consultas), k)
+    
+    resultado = historico.iloc[vizinhos.ravel()].reset_index(drop=True)
+    resultado.insert(0, 'consulta', np.repeat(np.arange(len(consultas)), k))
+    resultado.insert(1, 'posicao', np.tile(np.arange(1, k + 1), len(consultas)))
+    resultado.insert(2, 'distancia', distancias.ravel())
+    
+    return resultado
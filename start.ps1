@@ -21,9 +21,9 @@ Write-Host "📦 Ativando virtual environment..." -ForegroundColor Yellow
 Write-Host "✅ Virtual environment ativado" -ForegroundColor Green
 Write-Host ""
 
-# Iniciar Streamlit
+# Iniciar Streamlit (com caches pré-aquecidos)
 Write-Host "🎨 Iniciando aplicação Streamlit..." -ForegroundColor Yellow
 Write-Host "📱 Acessar em: http://localhost:8501" -ForegroundColor Cyan
 Write-Host ""
 
-streamlit run app.py
+python -m src.servidor
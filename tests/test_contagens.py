@@ -0,0 +1,38 @@
+"""Os dois modos de leitura de forestfires.csv contam os mesmos registros"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.acompanhamento import AcompanhadorCSV, dados_instantaneo
+from src.correlacao import obter_acumulador_correlacao
+from src.utils import load_forestfires, obter_versao_dados, calcular_agregados, CSV_PATH
+
+
+def test_carregamento_e_acompanhamento_contam_igual():
+    df = load_forestfires(CSV_PATH, obter_versao_dados())
+    instantaneo = AcompanhadorCSV(CSV_PATH).instantaneo()
+
+    assert len(df) == len(dados_instantaneo(instantaneo)) == instantaneo['n_registros']
+    kpis = calcular_agregados(df, obter_versao_dados())['kpis']
+    acompanhados = instantaneo['agregados']['kpis']
+    assert kpis.keys() == acompanhados.keys()
+    for chave, valor in kpis.items():
+        # Somas parciais acumuladas em outra ordem: diferem só no arredondamento
+        assert acompanhados[chave] == (pytest.approx(valor) if isinstance(valor, float) else valor), chave
+
+
+def test_sem_registros_repetidos():
+    df = load_forestfires(CSV_PATH, obter_versao_dados())
+    assert not df.duplicated().any()
+
+
+def test_acumulador_cobre_os_registros_carregados():
+    versao = obter_versao_dados()
+    df = load_forestfires(CSV_PATH, versao)
+    instantaneo = AcompanhadorCSV(CSV_PATH).instantaneo()
+
+    assert obter_acumulador_correlacao(versao).n == instantaneo['acumulador'].n == len(df)